@@ -1,32 +1,60 @@
-import uvicorn
-from fastapi import FastAPI, Request, status
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from src.conf import messages
-from src.api import contacts, utils, auth, users
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
-from starlette.responses import JSONResponse
+from src.api import contacts, utils, auth, users, metrics, admin
 from fastapi.middleware.cors import CORSMiddleware
+from src.services.limiter import RateLimitExceeded, rate_limit_handler
 from src.services.redis_cache import redis_cache
-from src.services.auth import Hash
+from src.services.slow_queries import slow_query_log
+from src.services.loop_watchdog import loop_watchdog
+from src.services.warmup import readiness
+from src.database.db import sessionmanager
+from src.services.instrumentation import ServerTimingMiddleware
+from src.services.admission import AdmissionMiddleware
+from src.services.compression import CompressionMiddleware
+from src.services.email_templates import email_templates
+from src.services.profiling import ProfilingMiddleware
+from src.services.memory import MemorySamplingMiddleware, memory_profiler
+from src.conf.config import settings
+from src.services.metrics import MetricsMiddleware, mark_process_dead
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Запуск і зупинка застосунку.
+
+    Усі підключення та фонові задачі створюються тут, а не під час імпорту
+    модулів, щоб імпорт ``main`` був швидким і не мав побічних ефектів.
+    Інстанс стає готовим (``/api/readiness``) лише після прогріву пулів.
+    """
+    await redis_cache.connect()
+    slow_query_log.start(sessionmanager.engine)
+    email_templates.load()
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+    if settings.MEMORY_TRACING_ENABLED:
+        memory_profiler.start()
+    if settings.WARMUP_ENABLED:
+        await readiness.warm_up(sessionmanager.engine, redis_cache.redis)
+    else:
+        readiness.ready = True
+    yield
+    await readiness.stop()
+    await redis_cache.close()
+    await slow_query_log.stop()
+    await loop_watchdog.stop()
+    await sessionmanager.close()
+    mark_process_dead()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 origins = [
     "*",
 ]
 
-hashed_pwd = Hash.hash_password("password123")
-
-
-@app.on_event("startup")
-async def startup():
-    await redis_cache.connect()
-
-
-@app.on_event("shutdown")
-async def shutdown():
-    await redis_cache.close()
-
 
 app.add_middleware(
     CORSMiddleware,
@@ -35,19 +63,23 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(MemorySamplingMiddleware)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(utils.router, prefix="/api")
 app.include_router(contacts.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
+app.include_router(metrics.router)
 
-
-@app.exception_handler(RateLimitExceeded)
-async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
-    return JSONResponse(
-        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-        content={"error": "Перевищено ліміт запитів. Спробуйте пізніше."},
-    )
+app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
 
 
 @app.get("/")
@@ -56,4 +88,6 @@ async def root():
 
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, workers=4)
@@ -0,0 +1,268 @@
+"""
+Цей модуль містить діагностичні API-ендпоінти для адміністраторів.
+
+Функціональність:
+- Перегляд журналу повільних SQL-запитів.
+- Видача токенів профілювання, перегляд і завантаження профілів запитів.
+- Діагностика пам'яті: знімки, їх порівняння, місця виділення за модулями та
+  пікове виділення пам'яті за маршрутами.
+- Частка влучань кожного рівня кешу.
+- Стан контролю допуску.
+- Стан черги листів і повторне відправлення недоставлених листів.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from src.conf import messages
+from src.database.db import get_db
+from src.database.models import User
+from src.services.admission import admission
+from src.services.instrumentation import InstrumentedRoute
+from src.services.memory import memory_profiler
+from src.services.outbox import dead_letters, outbox_stats, retry_dead_letter
+from src.services.permissions import is_admin
+from src.services.profiling import PROFILE_HEADER, create_profile_token, profile_store
+from src.services.redis_cache import redis_cache
+from src.services.slow_queries import slow_query_log
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(is_admin)],
+    route_class=InstrumentedRoute,
+)
+
+
+@router.get("/slow-queries")
+async def slow_queries(limit: int = Query(50, ge=1, le=1000)):
+    """
+    Повертає останні повільні SQL-запити (тільки для адміністраторів).
+
+    Кожен запис містить текст запиту, замасковані параметри, тривалість,
+    метод репозиторію та план виконання, якщо його вже знято.
+
+    :param limit: Максимальна кількість записів.
+    :return: Список записів журналу, новіші — першими.
+    """
+    return slow_query_log.recent(limit)
+
+
+@router.post("/profiles/token")
+async def profile_token(
+    ttl: int | None = Query(None, ge=1, le=86400),
+    admin: User = Depends(is_admin),
+):
+    """
+    Видає токен для профілювання запитів (тільки для адміністраторів).
+
+    Запит із заголовком ``X-Profile: <token>`` буде профільовано, а назву
+    профілю повернуто в заголовку ``X-Profile-Id``.
+
+    :param ttl: Термін дії токена в секундах.
+    :param admin: Адміністратор, що запросив токен.
+    :return: Назва заголовка, токен і час завершення його дії.
+    """
+    token, expires_at = create_profile_token(admin.email, ttl)
+    return {"header": PROFILE_HEADER, "token": token, "expires_at": expires_at}
+
+
+@router.get("/profiles")
+async def profiles():
+    """
+    Повертає метадані збережених профілів запитів, новіші — першими.
+
+    :return: Список профілів із маршрутом, тривалістю та кількістю вибірок.
+    """
+    return profile_store.list()
+
+
+@router.get("/profiles/{name}")
+async def download_profile(name: str):
+    """
+    Завантажує профіль запиту у форматі collapsed stacks.
+
+    Файл можна відкрити в speedscope або перетворити на flamegraph
+    за допомогою ``flamegraph.pl``.
+
+    :param name: Назва профілю.
+    :return: Файл профілю.
+    """
+    path = profile_store.path(name)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=messages.PROFILE_NOT_FOUND
+        )
+    return FileResponse(path, media_type="text/plain", filename=name)
+
+
+def _require_tracing():
+    if not memory_profiler.tracing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=messages.MEMORY_TRACING_DISABLED,
+        )
+
+
+@router.get("/memory")
+async def memory_status():
+    """
+    Повертає стан відстеження пам'яті та обсяг відстежуваних виділень.
+
+    :return: Стан ``tracemalloc``.
+    """
+    return memory_profiler.status()
+
+
+@router.post("/memory/tracing")
+async def start_memory_tracing(frames: int | None = Query(None, ge=1, le=100)):
+    """
+    Вмикає відстеження виділень пам'яті.
+
+    Відстеження сповільнює кожне виділення пам'яті, тому його варто вмикати
+    лише на час діагностики.
+
+    :param frames: Глибина трасування кожного виділення.
+    :return: Стан ``tracemalloc``.
+    """
+    return memory_profiler.start(frames)
+
+
+@router.delete("/memory/tracing")
+async def stop_memory_tracing():
+    """
+    Вимикає відстеження виділень пам'яті та видаляє знімки.
+
+    :return: Стан ``tracemalloc``.
+    """
+    return memory_profiler.stop()
+
+
+@router.get("/memory/top")
+async def memory_top(limit: int = Query(20, ge=1, le=200)):
+    """
+    Повертає найбільші місця виділення пам'яті, згруповані за модулями.
+
+    :param limit: Кількість груп і місць виділення.
+    :return: Групи модулів і місця виділення.
+    """
+    _require_tracing()
+    return await run_in_threadpool(memory_profiler.top, limit)
+
+
+@router.post("/memory/snapshots", status_code=status.HTTP_201_CREATED)
+async def take_memory_snapshot():
+    """
+    Знімає знімок пам'яті для подальшого порівняння.
+
+    :return: Ідентифікатор, час і обсяг відстежуваної пам'яті.
+    """
+    _require_tracing()
+    return await run_in_threadpool(memory_profiler.take_snapshot)
+
+
+@router.get("/memory/snapshots")
+async def memory_snapshots():
+    """
+    Повертає збережені знімки пам'яті.
+
+    :return: Список знімків.
+    """
+    return memory_profiler.list_snapshots()
+
+
+@router.get("/memory/snapshots/{snapshot_id}/diff")
+async def memory_diff(
+    snapshot_id: int,
+    base: int | None = Query(
+        None, description="Базовий знімок (за замовчуванням попередній)"
+    ),
+    limit: int = Query(20, ge=1, le=200),
+):
+    """
+    Порівнює знімок пам'яті з базовим.
+
+    :param snapshot_id: Ідентифікатор знімка.
+    :param base: Ідентифікатор базового знімка.
+    :param limit: Кількість груп і місць виділення.
+    :return: Зміни за групами модулів і місцями виділення.
+    """
+    diff = await run_in_threadpool(memory_profiler.diff, snapshot_id, base, limit)
+    if diff is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=messages.SNAPSHOT_NOT_FOUND
+        )
+    return diff
+
+
+@router.get("/memory/routes")
+async def memory_routes():
+    """
+    Повертає пікове виділення пам'яті під час запитів за маршрутами.
+
+    :return: Кількість вимірів, середній, максимальний та останній пік.
+    """
+    return memory_profiler.route_stats()
+
+
+@router.get("/cache")
+async def cache_stats():
+    """
+    Повертає влучання, промахи та частку влучань кожного рівня кешу.
+
+    Статистика стосується воркера, що обробив запит; сумарні значення
+    доступні в ``/metrics`` (``cache_tier_requests_total``).
+
+    :return: Статистика локального рівня та Redis.
+    """
+    return redis_cache.tier_stats()
+
+
+@router.get("/admission")
+async def admission_stats():
+    """
+    Повертає поточні ліміти, зайнятість і черги контролю допуску.
+
+    Стан стосується воркера, що обробив запит.
+
+    :return: Стан кожного класу маршрутів.
+    """
+    return admission.stats()
+
+
+@router.get("/outbox")
+async def outbox(
+    limit: int = Query(50, ge=1, le=1000), db: AsyncSession = Depends(get_db)
+):
+    """
+    Повертає стан черги листів і останні недоставлені листи.
+
+    :param limit: Максимальна кількість недоставлених листів.
+    :param db: Сесія бази даних.
+    :return: Кількість листів у кожному стані та список недоставлених.
+    """
+    return {
+        "stats": await outbox_stats(db),
+        "dead_letters": await dead_letters(db, limit),
+    }
+
+
+@router.post("/outbox/{entry_id}/retry")
+async def retry_outbox_entry(entry_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Повертає недоставлений лист у чергу відправлення.
+
+    :param entry_id: Ідентифікатор листа в черзі.
+    :param db: Сесія бази даних.
+    :return: Ідентифікатор листа.
+    :raises HTTPException: 404, якщо недоставленого листа з таким
+        ідентифікатором немає.
+    """
+    if not await retry_dead_letter(db, entry_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=messages.OUTBOX_ENTRY_NOT_FOUND,
+        )
+    return {"id": entry_id}
@@ -14,7 +14,6 @@ from fastapi import (
     HTTPException,
     Depends,
     status,
-    BackgroundTasks,
     Request,
     UploadFile,
     File,
@@ -22,6 +21,7 @@ from fastapi import (
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 
 from src.schemas.users import UserCreate, Token, User, RequestEmail, UserResponse
 from src.services.auth import (
@@ -33,15 +33,22 @@ from src.services.auth import (
     verify_reset_token,
 )
 from src.services.users import UserService
+from src.services.limiter import client_ip
+from src.services.login_throttle import login_throttle
+from src.services.negative_cache import missing_users
+from src.services.outbox import stage_email
+from src.services.quotas import QuotaUsage, quotas
+from src.services.repository_cache import uncached
 from src.services.upload_file import UploadFileService
 from src.database.db import get_db
-from src.services.email import send_email, send_reset_email
+from src.services.email import reset_email, verification_email
+from src.services.instrumentation import InstrumentedRoute
 from src.conf.config import settings
 from src.conf import messages
 from pydantic import BaseModel, EmailStr
 from src.database.models import User
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=InstrumentedRoute)
 
 
 class ResetPasswordRequest(BaseModel):
@@ -53,21 +60,19 @@ class ResetPasswordConfirm(BaseModel):
     new_password: str
 
 
-router.post("/request-password-reset")
-
-
+@router.post("/request-password-reset")
 async def request_password_reset(
     data: ResetPasswordRequest, db: AsyncSession = Depends(get_db)
 ):
     """Обробка запиту на скидання пароля"""
-    user = await db.execute(User.select().where(User.email == data.email))
-    user = user.scalars().first()
+    user = await UserService(db).get_user_by_email(data.email)
 
     if not user:
         raise HTTPException(status_code=404, detail="Користувач не знайдений")
 
     token = create_reset_token(user.email)
-    await send_reset_email(user.email, token)
+    stage_email(db, reset_email(user.email, token), "reset")
+    await db.commit()
 
     return {"message": "Лист для скидання пароля відправлено"}
 
@@ -83,14 +88,16 @@ async def reset_password(
             status_code=400, detail="Недійсний або протермінований токен"
         )
 
-    user = await db.execute(User.select().where(User.email == email))
-    user = user.scalars().first()
+    user_service = UserService(db)
+    # Хеш пароля не зберігається в кеші репозиторію.
+    with uncached():
+        user = await user_service.get_user_by_email(email)
 
     if not user:
         raise HTTPException(status_code=404, detail="Користувач не знайдений")
 
-    user.hashed_password = Hash.hash_password(data.new_password)
-    await db.commit()
+    hashed_password = await Hash.hash_password_async(data.new_password)
+    await user_service.update_password(user, hashed_password)
 
     return {"message": "Пароль успішно змінено"}
 
@@ -100,7 +107,6 @@ async def reset_password(
 )
 async def register_user(
     user_data: UserCreate,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: Session = Depends(get_db),
 ):
@@ -108,10 +114,10 @@ async def register_user(
     Реєстрація нового користувача.
 
     Перевіряє, чи існує користувач із таким email або username.
-    Якщо користувач не існує, створює нового і відправляє email з підтвердженням.
+    Якщо користувач не існує, створює нового і ставить у чергу email з
+    підтвердженням (в одній транзакції з користувачем).
 
     :param user_data: Данні нового користувача.
-    :param background_tasks: Фонова задача для відправлення email.
     :param request: Об'єкт запиту для отримання базового URL.
     :param db: Сесія бази даних.
     :return: Створений користувач.
@@ -132,18 +138,21 @@ async def register_user(
             detail=messages.USERNAME_ALREADY_EXIST,
         )
 
-    user_data.password = Hash().get_password_hash(user_data.password)
-    new_user = await user_service.create_user(user_data)
-
-    background_tasks.add_task(
-        send_email, new_user.email, new_user.username, request.base_url
+    user_data.password = await Hash.hash_password_async(user_data.password)
+    message = verification_email(
+        user_data.email, user_data.username, str(request.base_url)
     )
+    # Лист фіксується тим самим commit, що й користувач.
+    stage_email(db, message, "verify")
+    new_user = await user_service.create_user(user_data)
+    await missing_users.discard(new_user.id)
 
     return new_user
 
 
 @router.post("/login", response_model=Token)
 async def login_user(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
 ):
@@ -151,13 +160,20 @@ async def login_user(
     Вхід користувача в систему.
 
     Перевіряє правильність email та пароля, а також чи підтверджений email.
+    Спроби понад ліміти :mod:`src.services.login_throttle` відхиляються з
+    кодом 429 до звернення до бази даних.
 
+    :param request: Об'єкт запиту (для IP-адреси клієнта).
     :param form_data: Данні для авторизації (email та пароль).
     :param db: Сесія бази даних.
     :return: Токен доступу.
     """
+    await login_throttle.check(form_data.username, client_ip(request))
+
     user_service = UserService(db)
-    user = await user_service.get_user_by_username(form_data.username)
+    # Хеш пароля не зберігається в кеші репозиторію.
+    with uncached():
+        user = await user_service.get_user_by_username(form_data.username)
 
     if user and not user.confirmed:
         raise HTTPException(
@@ -165,7 +181,10 @@ async def login_user(
             detail=messages.USER_NOT_AUTHENTICATED,
         )
 
-    if not user or not Hash().verify_password(form_data.password, user.hashed_password):
+    if not user or not await Hash.verify_password_async(
+        form_data.password, user.hashed_password
+    ):
+        await login_throttle.failure(form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=messages.WRONG_PASSWORD,
@@ -178,6 +197,7 @@ async def login_user(
             detail=messages.USER_EMAIL_NOT_CONFIRMED,
         )
 
+    await login_throttle.success(form_data.username)
     access_token = await create_access_token(data={"sub": user.username})
 
     return {"access_token": access_token, "token_type": "bearer"}
@@ -186,7 +206,6 @@ async def login_user(
 @router.post("/request_email", response_model=UserResponse)
 async def request_email(
     body: RequestEmail,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: Session = Depends(get_db),
 ):
@@ -194,7 +213,6 @@ async def request_email(
     Запит на повторне підтвердження email.
 
     :param body: Данні запиту (email).
-    :param background_tasks: Фонова задача для відправки email.
     :param request: Об'єкт запиту для отримання базового URL.
     :param db: Сесія бази даних.
     :return: Повідомлення про підтвердження email.
@@ -206,9 +224,9 @@ async def request_email(
         return {"message": "Ваша електронна пошта вже підтверджена"}
 
     if user:
-        background_tasks.add_task(
-            send_email, user.email, user.username, request.base_url
-        )
+        message = verification_email(user.email, user.username, str(request.base_url))
+        stage_email(db, message, "verify")
+        await db.commit()
 
     return {"message": "Перевірте свою електронну пошту для підтвердження"}
 
@@ -247,18 +265,25 @@ async def update_avatar_user(
     file: UploadFile = File(),
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    quota: QuotaUsage = Depends(quotas.charge(20)),
 ):
     """
     Оновлення аватару користувача.
 
+    Вартість у квоті: 20 одиниць плюс одиниця за кожні 100 КБ файлу.
+
     :param file: Завантажений файл.
     :param user: Поточний користувач.
     :param db: Сесія бази даних.
     :return: Оновлений користувач.
     """
-    avatar_url = UploadFileService(
+    upload_service = UploadFileService(
         settings.CLD_NAME, settings.CLD_API_KEY, settings.CLD_API_SECRET
-    ).upload_file(file, user.username)
+    )
+    avatar_url = await run_in_threadpool(
+        upload_service.upload_file, file, user.username
+    )
+    await quota.add((file.size or 0) // 100_000)
 
     user_service = UserService(db)
     user = await user_service.update_avatar_url(user.email, avatar_url)
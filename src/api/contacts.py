@@ -13,7 +13,9 @@
 
 from typing import List
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
@@ -23,12 +25,31 @@ from src.services.contacts import ContactService
 from src.services.auth import get_current_user
 from src.conf import messages
 from src.services.permissions import is_admin
-
-router = APIRouter(prefix="/contacts", tags=["contacts"])
-
-
-@router.get("/", response_model=List[ContactResponse], status_code=status.HTTP_200_OK)
+from src.services.instrumentation import InstrumentedRoute, query_budget
+from src.services.negative_cache import missing_contacts
+from src.services.quotas import QuotaUsage, quotas
+from src.services.response_cache import contact_pages
+from src.services.serialization import (
+    MSGPACK_RESPONSES,
+    negotiate,
+    render,
+    wants_msgpack,
+)
+
+router = APIRouter(prefix="/contacts", tags=["contacts"], route_class=InstrumentedRoute)
+
+contact_list = TypeAdapter(List[ContactResponse])
+
+
+@router.get(
+    "/",
+    response_model=List[ContactResponse],
+    status_code=status.HTTP_200_OK,
+    responses=MSGPACK_RESPONSES,
+)
+@query_budget(2)
 async def read_contacts(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
@@ -37,18 +58,42 @@ async def read_contacts(
     """
     Отримання списку контактів.
 
+    З ``Accept: application/msgpack`` відповідь повертається у форматі
+    MessagePack. Готові сторінки зберігаються в кеші відповідей уже
+    стисненими.
+
     :param skip: Кількість контактів, які потрібно пропустити.
     :param limit: Максимальна кількість контактів у відповіді.
     :param db: Сесія бази даних.
     :param user: Поточний користувач.
     :return: Список контактів.
     """
+    page = f"{'msgpack' if wants_msgpack(request) else 'json'}:{skip}:{limit}"
+    cached, generation = await contact_pages.get(user.id, page, request)
+    if cached is not None:
+        return cached
     contact_service = ContactService(db)
     contacts = await contact_service.get_contacts(skip, limit, user)
+    response = render(request, contact_list, contacts)
+    await contact_pages.set(user.id, page, response, generation)
+    return response
+
+
+@router.get("/all", response_model=List[ContactResponse])
+async def get_all_contacts(
+    db: AsyncSession = Depends(get_db),
+    admin: User = Depends(is_admin),
+    quota: QuotaUsage = Depends(quotas.charge(50)),
+):
+    """Дозволяє лише адміністратору отримати всі контакти"""
+    contacts = await db.execute(select(Contact))
+    contacts = contacts.scalars().all()
+    await quota.add(len(contacts) // 10)
     return contacts
 
 
 @router.get("/{contact_id}", response_model=ContactResponse)
+@query_budget(2)
 async def read_contact(
     contact_id: int,
     db: AsyncSession = Depends(get_db),
@@ -62,9 +107,15 @@ async def read_contact(
     :param user: Поточний користувач.
     :return: Контакт або помилка 404, якщо контакт не знайдено.
     """
+    missing_key = f"{user.id}:{contact_id}"
+    if await missing_contacts.contains(missing_key):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=messages.CONTACT_NOT_FOUND
+        )
     contact_service = ContactService(db)
     contact = await contact_service.get_contact(contact_id, user)
     if contact is None:
+        await missing_contacts.add(missing_key)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=messages.CONTACT_NOT_FOUND
         )
@@ -72,6 +123,7 @@ async def read_contact(
 
 
 @router.post("/", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(4)
 async def create_contact(
     body: ContactBase,
     db: AsyncSession = Depends(get_db),
@@ -86,10 +138,14 @@ async def create_contact(
     :return: Створений контакт.
     """
     contact_service = ContactService(db)
-    return await contact_service.create_contact(body, user)
+    contact = await contact_service.create_contact(body, user)
+    await contact_pages.invalidate(user.id)
+    await missing_contacts.discard(f"{user.id}:{contact.id}")
+    return contact
 
 
 @router.put("/{contact_id}", response_model=ContactResponse)
+@query_budget(4)
 async def update_contact(
     body: ContactBase,
     contact_id: int,
@@ -111,10 +167,12 @@ async def update_contact(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=messages.CONTACT_NOT_FOUND
         )
+    await contact_pages.invalidate(user.id)
     return contact
 
 
 @router.delete("/{contact_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(4)
 async def remove_contact(
     contact_id: int,
     db: AsyncSession = Depends(get_db),
@@ -134,20 +192,31 @@ async def remove_contact(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=messages.CONTACT_NOT_FOUND
         )
+    await contact_pages.invalidate(user.id)
     return
 
 
-@router.get("/search/", response_model=List[ContactResponse])
+@router.get(
+    "/search/", response_model=List[ContactResponse], responses=MSGPACK_RESPONSES
+)
+@query_budget(2)
 async def search_contacts(
+    request: Request,
+    response: Response,
     text: str,
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
+    quota: QuotaUsage = Depends(quotas.charge(10)),
 ):
     """
     Пошук контактів за ім'ям, email або іншими полями.
 
+    З ``Accept: application/msgpack`` відповідь повертається у форматі
+    MessagePack. Вартість у квоті: 10 одиниць плюс одиниця за кожні 10
+    знайдених контактів.
+
     :param text: Текст для пошуку.
     :param skip: Кількість контактів, які потрібно пропустити.
     :param limit: Максимальна кількість контактів у відповіді.
@@ -157,18 +226,23 @@ async def search_contacts(
     """
     contact_service = ContactService(db)
     contacts = await contact_service.search_contacts(text, skip, limit, user)
-    return contacts
+    await quota.add(len(contacts) // 10)
+    return negotiate(request, response, contact_list, contacts)
 
 
 @router.post("/upcoming-birthdays", response_model=List[ContactResponse])
+@query_budget(2)
 async def upcoming_birthdays(
     body: ContactBirthdayRequest,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
+    quota: QuotaUsage = Depends(quotas.charge(5)),
 ):
     """
     Отримання списку контактів з найближчими днями народження.
 
+    Вартість у квоті: 5 одиниць плюс одиниця за кожні 10 контактів.
+
     :param body: Кількість днів для пошуку найближчих днів народження.
     :param db: Сесія бази даних.
     :param user: Поточний користувач.
@@ -176,13 +250,5 @@ async def upcoming_birthdays(
     """
     contact_service = ContactService(db)
     contacts = await contact_service.upcoming_birthdays(body.days, user)
+    await quota.add(len(contacts) // 10)
     return contacts
-
-
-@router.get("/all")
-async def get_all_contacts(
-    db: AsyncSession = Depends(get_db), admin: User = Depends(is_admin)
-):
-    """Дозволяє лише адміністратору отримати всі контакти"""
-    contacts = await db.execute(Contact.select())
-    return contacts.scalars().all()
@@ -0,0 +1,22 @@
+"""
+Цей модуль містить ендпоінт для збору метрик Prometheus.
+"""
+
+from fastapi import APIRouter, Response
+
+from src.services.metrics import CONTENT_TYPE_LATEST, render_latest
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Повертає метрики застосунку у текстовому форматі Prometheus.
+
+    Якщо задано ``PROMETHEUS_MULTIPROC_DIR``, значення агрегуються
+    з усіх воркерів.
+
+    :return: Відповідь із метриками.
+    """
+    return Response(render_latest(), media_type=CONTENT_TYPE_LATEST)
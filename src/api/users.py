@@ -4,22 +4,28 @@
 Функціональність:
 - Отримання інформації про поточного користувача.
 - Зміна ролі користувача (тільки для адміністраторів).
-- Отримання, оновлення та видалення користувача за ідентифікатором.
+- Отримання користувача за ідентифікатором.
+- Оновлення та видалення користувача (тільки для адміністраторів).
 """
 
-from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from src.conf import messages
 from src.services.limiter import limiter
 from src.schemas.users import User, UserRead
 from src.services.auth import get_current_user
-from src.services.redis_cache import redis_cache
+from src.services.email import verification_email
+from src.services.negative_cache import missing_users
+from src.services.outbox import stage_email
+from src.services.repository_cache import uncached
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.db import get_db
 from src.database.models import User, UserRole
 from src.repository.users import UserRepository
 from src.services.permissions import is_admin
+from src.services.instrumentation import InstrumentedRoute
 from pydantic import BaseModel, EmailStr
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], route_class=InstrumentedRoute)
 
 
 class RoleUpdateRequest(BaseModel):
@@ -54,27 +60,23 @@ async def change_user_role(
     :raises HTTPException: Якщо користувач не знайдений.
     :return: Повідомлення про успішну зміну ролі.
     """
-    user = await db.execute(User.select().where(User.email == request.email))
-    user = user.scalars().first()
-
+    user = await UserRepository(db).update_user_role(request.email, request.new_role)
     if not user:
         raise HTTPException(status_code=404, detail="Користувач не знайдений")
-
-    user.role = request.new_role
-    await db.commit()
     return {"message": f"Роль користувача {user.email} змінено на {user.role}"}
 
 
-@router.get("/me", response_model=UserRead)
-@limiter.limit("10/minute")
-async def me(request: Request, user: User = Depends(get_current_user)):
+@router.get(
+    "/me",
+    response_model=UserRead,
+    dependencies=[Depends(limiter.limit("10/minute", per="user"))],
+)
+async def me(user: User = Depends(get_current_user)):
     """
     Отримання інформації про поточного користувача.
 
-    **Обмеження запитів:** 10 запитів на хвилину.
+    **Обмеження запитів:** 10 запитів на хвилину для кожного користувача.
 
-    :param request: Об'єкт HTTP-запиту.
-    :type request: Request
     :param user: Поточний користувач (авторизований).
     :type user: User
     :return: Об'єкт користувача.
@@ -82,7 +84,7 @@ async def me(request: Request, user: User = Depends(get_current_user)):
     return user
 
 
-@router.get("/users/{user_id}")
+@router.get("/users/{user_id}", response_model=UserRead)
 async def get_user(user_id: int, db: AsyncSession = Depends(get_db)):
     """
     Отримання інформації про користувача за його ідентифікатором.
@@ -94,62 +96,99 @@ async def get_user(user_id: int, db: AsyncSession = Depends(get_db)):
     :raises HTTPException: Якщо користувач не знайдений.
     :return: Об'єкт користувача.
     """
-    cache_key = f"user:{user_id}"
-    cached_user = await redis_cache.get(cache_key)
+    if await missing_users.contains(user_id):
+        raise HTTPException(status_code=404, detail="User not found")
 
-    if cached_user:
-        return cached_user
     user = await UserRepository(db).get_user_by_id(user_id)
     if not user:
+        await missing_users.add(user_id)
         raise HTTPException(status_code=404, detail="User not found")
-
-    await redis_cache.set(cache_key, user.dict(), expire=600)
     return user
 
 
-@router.put("/users/{user_id}")
+@router.put("/users/{user_id}", response_model=UserRead)
 async def update_user(
-    user_id: int, update_data: dict, db: AsyncSession = Depends(get_db)
+    user_id: int,
+    update_data: dict,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    admin: User = Depends(is_admin),
 ):
     """
-    Оновлення даних користувача.
+    Оновлення даних користувача (тільки для адміністраторів).
+
+    Новий email чи ім'я не можуть належати іншому користувачу. Після зміни
+    email обліковий запис знову потребує підтвердження, і на нову адресу
+    ставиться в чергу лист підтвердження.
 
     :param user_id: Ідентифікатор користувача.
     :type user_id: int
     :param update_data: Дані для оновлення.
     :type update_data: dict
+    :param request: Об'єкт запиту для отримання базового URL.
+    :type request: Request
     :param db: Сесія бази даних.
     :type db: AsyncSession
-    :raises HTTPException: Якщо користувач не знайдений.
+    :param admin: Адміністратор, що виконує запит.
+    :type admin: User
+    :raises HTTPException: Якщо користувач не знайдений або email чи ім'я
+        зайняті.
     :return: Оновлений об'єкт користувача.
     """
-    user = await UserRepository(db).update_user(user_id, update_data)
+    users = UserRepository(db)
+    user = await users.get_user_by_id(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    cache_key = f"user:{user_id}"
-    await redis_cache.set(cache_key, user.dict(), expire=600)
-
+    email = update_data.get("email")
+    if email is not None and email != user.email:
+        other = await users.get_user_by_email(email)
+        if other is not None and other.id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=messages.USER_ALREADY_EXIST,
+            )
+    username = update_data.get("username")
+    if username is not None and username != user.username:
+        with uncached():
+            other = await users.get_user_by_username(username)
+        if other is not None and other.id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=messages.USERNAME_ALREADY_EXIST,
+            )
+
+    if email is not None and email != user.email:
+        message = verification_email(
+            email, username or user.username, str(request.base_url)
+        )
+        # Лист фіксується тим самим commit, що й новий email.
+        stage_email(db, message, "verify")
+    user = await users.update_user(user_id, update_data)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
     return user
 
 
 @router.delete("/users/{user_id}")
-async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
+async def delete_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_db),
+    admin: User = Depends(is_admin),
+):
     """
-    Видалення користувача за його ідентифікатором.
+    Видалення користувача за його ідентифікатором (тільки для адміністраторів).
 
     :param user_id: Ідентифікатор користувача.
     :type user_id: int
     :param db: Сесія бази даних.
     :type db: AsyncSession
+    :param admin: Адміністратор, що виконує запит.
+    :type admin: User
     :raises HTTPException: Якщо користувач не знайдений.
     :return: Повідомлення про успішне видалення.
     """
     success = await UserRepository(db).delete_user(user_id)
     if not success:
         raise HTTPException(status_code=404, detail="User not found")
-
-    cache_key = f"user:{user_id}"
-    await redis_cache.delete(cache_key)
-
     return {"message": "User deleted"}
@@ -3,16 +3,23 @@
 
 Функціональність:
 - Перевірка стану бази даних.
+- Перевірка готовності інстансу до прийому трафіку.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 from src.database.db import get_db
 from src.conf import messages
+from src.services.instrumentation import InstrumentedRoute
+from src.services.warmup import readiness
+
+logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=["utils"])
+router = APIRouter(tags=["utils"], route_class=InstrumentedRoute)
 
 
 @router.get("/healthchecker")
@@ -40,8 +47,24 @@ async def healthchecker(db: AsyncSession = Depends(get_db)):
             )
         return {"message": messages.APP_IS_HEALTHY}
     except Exception as e:
-        print(e)
+        logger.error("Health check failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error connecting to the database",
         )
+
+
+@router.get("/readiness")
+async def readiness_check(response: Response):
+    """
+    Перевіряє, чи інстанс прогрітий і готовий приймати трафік.
+
+    Балансувальник навантаження має спрямовувати запити лише на інстанси,
+    що відповідають 200.
+
+    :return: Стан готовності та результати прогріву.
+    :raises 503: Якщо прогрів ще не завершився або не вдався.
+    """
+    if not readiness.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"ready": readiness.ready, **readiness.details}
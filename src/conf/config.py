@@ -3,6 +3,7 @@ from pydantic_settings import BaseSettings
 from pathlib import Path
 from dotenv import load_dotenv
 import os
+import tempfile
 
 # Завантаження змінних оточення з файлу .env
 load_dotenv()
@@ -50,6 +51,178 @@ class Settings(BaseSettings):
     :type CLD_API_KEY: int
     :param CLD_API_SECRET: Секретний ключ API для Cloudinary.
     :type CLD_API_SECRET: str
+    :param QUERY_BUDGET_DEFAULT: Бюджет SQL-запитів для ендпоінтів без власного бюджету.
+    :type QUERY_BUDGET_DEFAULT: int, default=10
+    :param QUERY_BUDGET_STRICT: Чи кидати виняток при перевищенні бюджету (для тестів).
+    :type QUERY_BUDGET_STRICT: bool, default=False
+    :param QUERY_REPEAT_THRESHOLD: Кількість однакових запитів, що вважається ознакою N+1.
+    :type QUERY_REPEAT_THRESHOLD: int, default=3
+    :param SLOW_QUERY_THRESHOLD_MS: Поріг, після якого запит вважається повільним.
+    :type SLOW_QUERY_THRESHOLD_MS: float, default=200
+    :param SLOW_QUERY_SAMPLE_RATE: Частка повільних запитів, що потрапляють у журнал.
+    :type SLOW_QUERY_SAMPLE_RATE: float, default=1.0
+    :param SLOW_QUERY_MAX_PER_SECOND: Максимальна кількість записів журналу на секунду.
+    :type SLOW_QUERY_MAX_PER_SECOND: float, default=5
+    :param SLOW_QUERY_LOG_SIZE: Кількість останніх повільних запитів, що зберігаються.
+    :type SLOW_QUERY_LOG_SIZE: int, default=100
+    :param SLOW_QUERY_EXPLAIN_ANALYZE: Чи знімати план через ``EXPLAIN ANALYZE``.
+    :type SLOW_QUERY_EXPLAIN_ANALYZE: bool, default=False
+    :param PROFILING_ENABLED: Чи підключати проміжний шар профілювання запитів.
+    :type PROFILING_ENABLED: bool, default=True
+    :param PROFILING_SAMPLE_RATE: Частка запитів, що профілюються без заголовка ``X-Profile``.
+    :type PROFILING_SAMPLE_RATE: float, default=0.0
+    :param PROFILING_INTERVAL_MS: Інтервал семплювання стеку в мілісекундах.
+    :type PROFILING_INTERVAL_MS: float, default=5
+    :param PROFILING_DIR: Каталог кільцевого буфера профілів.
+    :type PROFILING_DIR: Path
+    :param PROFILING_MAX_FILES: Кількість профілів, що зберігаються.
+    :type PROFILING_MAX_FILES: int, default=50
+    :param PROFILING_TOKEN_TTL: Термін дії токена ``X-Profile`` у секундах.
+    :type PROFILING_TOKEN_TTL: int, default=3600
+    :param LOOP_WATCHDOG_ENABLED: Чи запускати сторож блокувань циклу подій.
+    :type LOOP_WATCHDOG_ENABLED: bool, default=True
+    :param LOOP_WATCHDOG_INTERVAL_MS: Інтервал пульсу циклу подій у мілісекундах.
+    :type LOOP_WATCHDOG_INTERVAL_MS: float, default=50
+    :param LOOP_BLOCK_THRESHOLD_MS: Тривалість блокування, після якої знімається стек.
+    :type LOOP_BLOCK_THRESHOLD_MS: float, default=100
+    :param MEMORY_TRACING_ENABLED: Чи вмикати ``tracemalloc`` під час запуску.
+    :type MEMORY_TRACING_ENABLED: bool, default=False
+    :param MEMORY_TRACE_FRAMES: Глибина трасування кожного виділення пам'яті.
+    :type MEMORY_TRACE_FRAMES: int, default=10
+    :param MEMORY_MAX_SNAPSHOTS: Кількість знімків пам'яті, що зберігаються.
+    :type MEMORY_MAX_SNAPSHOTS: int, default=10
+    :param MEMORY_ROUTE_SAMPLE_RATE: Частка запитів, для яких міряється пік пам'яті.
+    :type MEMORY_ROUTE_SAMPLE_RATE: float, default=1.0
+    :param WARMUP_ENABLED: Чи прогрівати пули з'єднань перед прийомом трафіку.
+    :type WARMUP_ENABLED: bool, default=True
+    :param WARMUP_DB_CONNECTIONS: Кількість з'єднань із базою даних для прогріву.
+    :type WARMUP_DB_CONNECTIONS: int, default=5
+    :param WARMUP_REDIS_CONNECTIONS: Кількість з'єднань із Redis для прогріву.
+    :type WARMUP_REDIS_CONNECTIONS: int, default=2
+    :param WARMUP_TIMEOUT: Максимальна тривалість спроби прогріву в секундах.
+    :type WARMUP_TIMEOUT: float, default=10
+    :param WARMUP_RETRY_INTERVAL: Інтервал між повторними спробами прогріву в секундах.
+    :type WARMUP_RETRY_INTERVAL: float, default=5
+    :param COMPRESSION_ENABLED: Чи стискати відповіді за ``Accept-Encoding``.
+    :type COMPRESSION_ENABLED: bool, default=True
+    :param COMPRESSION_MIN_SIZE: Мінімальний розмір тіла відповіді для стиснення в байтах.
+    :type COMPRESSION_MIN_SIZE: int, default=1024
+    :param COMPRESSION_GZIP_LEVEL: Рівень стиснення gzip.
+    :type COMPRESSION_GZIP_LEVEL: int, default=6
+    :param COMPRESSION_BROTLI_QUALITY: Якість стиснення brotli.
+    :type COMPRESSION_BROTLI_QUALITY: int, default=5
+    :param COMPRESSION_ZSTD_LEVEL: Рівень стиснення zstd.
+    :type COMPRESSION_ZSTD_LEVEL: int, default=3
+    :param RESPONSE_CACHE_ENABLED: Чи кешувати готові відповіді в Redis.
+    :type RESPONSE_CACHE_ENABLED: bool, default=True
+    :param RESPONSE_CACHE_TTL: Час життя записів кешу відповідей у секундах.
+    :type RESPONSE_CACHE_TTL: int, default=300
+    :param REDIS_MAX_CONNECTIONS: Розмір пулу з'єднань Redis.
+    :type REDIS_MAX_CONNECTIONS: int, default=50
+    :param REDIS_POOL_TIMEOUT: Скільки секунд чекати на вільне з'єднання з пулу.
+    :type REDIS_POOL_TIMEOUT: float, default=2
+    :param REDIS_SOCKET_TIMEOUT: Тайм-аут читання/запису сокета Redis у секундах.
+    :type REDIS_SOCKET_TIMEOUT: float, default=1
+    :param REDIS_CONNECT_TIMEOUT: Тайм-аут встановлення з'єднання з Redis у секундах.
+    :type REDIS_CONNECT_TIMEOUT: float, default=1
+    :param REDIS_HEALTH_CHECK_INTERVAL: Інтервал перевірки простою з'єднань у секундах.
+    :type REDIS_HEALTH_CHECK_INTERVAL: int, default=30
+    :param CACHE_LOCAL_ENABLED: Чи тримати локальний LRU-кеш у кожному воркері перед Redis.
+    :type CACHE_LOCAL_ENABLED: bool, default=False
+    :param CACHE_LOCAL_MAX_ENTRIES: Максимальна кількість записів локального кешу.
+    :type CACHE_LOCAL_MAX_ENTRIES: int, default=10000
+    :param CACHE_LOCAL_TTL: Час життя записів локального кешу в секундах.
+    :type CACHE_LOCAL_TTL: float, default=30
+    :param CACHE_INVALIDATION_CHANNEL: Канал Redis pub/sub для інвалідації локальних кешів.
+    :type CACHE_INVALIDATION_CHANNEL: str, default="cache:invalidate"
+    :param CACHE_STALE_TTL: Скільки секунд після завершення свіжості віддавати застаріле значення.
+    :type CACHE_STALE_TTL: int, default=60
+    :param CACHE_EARLY_EXPIRY_BETA: Коефіцієнт ймовірнісного дострокового оновлення (0 — вимкнено).
+    :type CACHE_EARLY_EXPIRY_BETA: float, default=1.0
+    :param CACHE_LOCK_TIMEOUT: Час життя блокування обчислення значення в секундах.
+    :type CACHE_LOCK_TIMEOUT: float, default=5
+    :param NEGATIVE_CACHE_ENABLED: Чи запам'ятовувати ідентифікатори, яких немає в базі даних.
+    :type NEGATIVE_CACHE_ENABLED: bool, default=True
+    :param NEGATIVE_CACHE_TTL: Час дії запису негативного кешу в секундах.
+    :type NEGATIVE_CACHE_TTL: int, default=30
+    :param NEGATIVE_CACHE_MAX_ENTRIES: Максимальна кількість записів негативного кешу кожного типу.
+    :type NEGATIVE_CACHE_MAX_ENTRIES: int, default=10000
+    :param REPOSITORY_CACHE_ENABLED: Чи кешувати результати методів читання репозиторіїв.
+    :type REPOSITORY_CACHE_ENABLED: bool, default=True
+    :param REPOSITORY_CACHE_TTL: Час життя записів кешу репозиторіїв за замовчуванням у секундах.
+    :type REPOSITORY_CACHE_TTL: int, default=300
+    :param RATE_LIMIT_ENABLED: Чи обмежувати частоту запитів.
+    :type RATE_LIMIT_ENABLED: bool, default=True
+    :param RATE_LIMITS: Ліміти, що замінюють задані в коді: шаблон шляху маршруту або ім'я ліміту -> ``N/період``.
+    :type RATE_LIMITS: dict[str, str], default={}
+    :param LOGIN_THROTTLE_ENABLED: Чи обмежувати спроби входу до перевірки пароля.
+    :type LOGIN_THROTTLE_ENABLED: bool, default=True
+    :param LOGIN_RATE_PER_IP: Ліміт спроб входу з однієї IP-адреси.
+    :type LOGIN_RATE_PER_IP: str, default="20/minute"
+    :param LOGIN_FAILURE_WINDOW: Скільки секунд пам'ятати невдалі спроби входу для імені користувача.
+    :type LOGIN_FAILURE_WINDOW: int, default=900
+    :param LOGIN_DELAY_AFTER: Кількість невдач, після якої вмикається затримка між спробами.
+    :type LOGIN_DELAY_AFTER: int, default=3
+    :param LOGIN_DELAY_BASE: Початкова затримка між спробами в секундах (подвоюється з кожною невдачею).
+    :type LOGIN_DELAY_BASE: float, default=1
+    :param LOGIN_DELAY_MAX: Максимальна затримка між спробами в секундах.
+    :type LOGIN_DELAY_MAX: float, default=60
+    :param LOGIN_LOCKOUT_THRESHOLD: Кількість невдач, після якої ім'я користувача блокується.
+    :type LOGIN_LOCKOUT_THRESHOLD: int, default=10
+    :param LOGIN_LOCKOUT_SECONDS: Тривалість блокування в секундах.
+    :type LOGIN_LOCKOUT_SECONDS: int, default=900
+    :param ADMISSION_ENABLED: Чи обмежувати кількість одночасних запитів за класами маршрутів.
+    :type ADMISSION_ENABLED: bool, default=True
+    :param ADMISSION_LIMITS: Максимальна кількість одночасних запитів кожного класу у воркері.
+    :type ADMISSION_LIMITS: dict[str, int], default={"auth": 8, "reads": 64, "search": 8, "writes": 32, "uploads": 4}
+    :param ADMISSION_TARGET_LATENCY_MS: Цільова тривалість обробки запитів кожного класу в мілісекундах.
+    :type ADMISSION_TARGET_LATENCY_MS: dict[str, float], default={"auth": 1000, "reads": 200, "search": 500, "writes": 300, "uploads": 3000}
+    :param ADMISSION_MIN_LIMIT: Мінімальний ліміт одночасних запитів класу.
+    :type ADMISSION_MIN_LIMIT: int, default=1
+    :param ADMISSION_DECREASE_FACTOR: Множник ліміту, коли тривалість обробки перевищує цільову.
+    :type ADMISSION_DECREASE_FACTOR: float, default=0.9
+    :param ADMISSION_QUEUE_SIZE: Максимальна довжина черги кожного класу.
+    :type ADMISSION_QUEUE_SIZE: int, default=100
+    :param ADMISSION_QUEUE_TIMEOUT: Максимальний час очікування в черзі в секундах.
+    :type ADMISSION_QUEUE_TIMEOUT: float, default=2
+    :param ADMISSION_RETRY_AFTER: Значення ``Retry-After`` відповіді 503 у секундах.
+    :type ADMISSION_RETRY_AFTER: int, default=1
+    :param QUOTA_ENABLED: Чи обмежувати витрати користувачів на дорогі ендпоінти.
+    :type QUOTA_ENABLED: bool, default=True
+    :param QUOTA_BUDGET: Бюджет користувача на ковзне вікно в умовних одиницях.
+    :type QUOTA_BUDGET: int, default=2000
+    :param QUOTA_WINDOW: Тривалість ковзного вікна квоти в секундах.
+    :type QUOTA_WINDOW: int, default=3600
+    :param QUOTA_BUCKETS: Кількість інтервалів, на які ділиться вікно квоти.
+    :type QUOTA_BUCKETS: int, default=60
+    :param MAIL_POOL_SIZE: Кількість постійних з'єднань із поштовим сервером у воркері.
+    :type MAIL_POOL_SIZE: int, default=2
+    :param MAIL_BATCH_SIZE: Максимальна кількість листів, що відправляються одним з'єднанням підряд.
+    :type MAIL_BATCH_SIZE: int, default=20
+    :param MAIL_QUEUE_SIZE: Максимальна довжина черги відправлення листів.
+    :type MAIL_QUEUE_SIZE: int, default=1000
+    :param MAIL_RETRY_ATTEMPTS: Кількість спроб відправлення листа.
+    :type MAIL_RETRY_ATTEMPTS: int, default=3
+    :param MAIL_RETRY_BACKOFF: Затримка перед повторною спробою в секундах (подвоюється з кожною спробою).
+    :type MAIL_RETRY_BACKOFF: float, default=1
+    :param MAIL_TIMEOUT: Тайм-аут операцій SMTP у секундах.
+    :type MAIL_TIMEOUT: float, default=10
+    :param MAIL_IDLE_TIMEOUT: Скільки секунд простою з'єднання, після яких воно перевіряється командою ``NOOP``.
+    :type MAIL_IDLE_TIMEOUT: float, default=30
+    :param MAIL_DRAIN_TIMEOUT: Скільки секунд під час зупинки чекати на відправлення листів із черги.
+    :type MAIL_DRAIN_TIMEOUT: float, default=10
+    :param OUTBOX_BATCH_SIZE: Кількість листів, що воркер черги листів забирає за раз.
+    :type OUTBOX_BATCH_SIZE: int, default=50
+    :param OUTBOX_POLL_INTERVAL: Пауза між перевірками порожньої черги листів у секундах.
+    :type OUTBOX_POLL_INTERVAL: float, default=1
+    :param OUTBOX_MAX_ATTEMPTS: Кількість спроб, після якої лист позначається як недоставлений.
+    :type OUTBOX_MAX_ATTEMPTS: int, default=8
+    :param OUTBOX_RETRY_BACKOFF: Затримка перед повторною спробою в секундах (подвоюється з кожною спробою).
+    :type OUTBOX_RETRY_BACKOFF: float, default=30
+    :param OUTBOX_RETRY_MAX: Максимальна затримка перед повторною спробою в секундах.
+    :type OUTBOX_RETRY_MAX: float, default=3600
+    :param OUTBOX_LEASE_SECONDS: Скільки секунд лист закріплений за воркером, що його забрав.
+    :type OUTBOX_LEASE_SECONDS: float, default=300
     """
 
     DB_URL: str
@@ -87,6 +260,122 @@ class Settings(BaseSettings):
     CLD_API_KEY: int = 326488457974591
     CLD_API_SECRET: str = "secret"
 
+    QUERY_BUDGET_DEFAULT: int = 10
+    QUERY_BUDGET_STRICT: bool = False
+    QUERY_REPEAT_THRESHOLD: int = 3
+
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+    SLOW_QUERY_SAMPLE_RATE: float = 1.0
+    SLOW_QUERY_MAX_PER_SECOND: float = 5
+    SLOW_QUERY_LOG_SIZE: int = 100
+    SLOW_QUERY_EXPLAIN_ANALYZE: bool = False
+
+    PROFILING_ENABLED: bool = True
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_MS: float = 5
+    PROFILING_DIR: Path = Path(tempfile.gettempdir()) / "contacts-api-profiles"
+    PROFILING_MAX_FILES: int = 50
+    PROFILING_TOKEN_TTL: int = 3600
+
+    LOOP_WATCHDOG_ENABLED: bool = True
+    LOOP_WATCHDOG_INTERVAL_MS: float = 50
+    LOOP_BLOCK_THRESHOLD_MS: float = 100
+
+    MEMORY_TRACING_ENABLED: bool = False
+    MEMORY_TRACE_FRAMES: int = 10
+    MEMORY_MAX_SNAPSHOTS: int = 10
+    MEMORY_ROUTE_SAMPLE_RATE: float = 1.0
+
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 5
+    WARMUP_REDIS_CONNECTIONS: int = 2
+    WARMUP_TIMEOUT: float = 10
+    WARMUP_RETRY_INTERVAL: float = 5
+
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL: int = 300
+
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 2
+    REDIS_SOCKET_TIMEOUT: float = 1
+    REDIS_CONNECT_TIMEOUT: float = 1
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+
+    CACHE_LOCAL_ENABLED: bool = False
+    CACHE_LOCAL_MAX_ENTRIES: int = 10000
+    CACHE_LOCAL_TTL: float = 30
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    CACHE_STALE_TTL: int = 60
+    CACHE_EARLY_EXPIRY_BETA: float = 1.0
+    CACHE_LOCK_TIMEOUT: float = 5
+
+    NEGATIVE_CACHE_ENABLED: bool = True
+    NEGATIVE_CACHE_TTL: int = 30
+    NEGATIVE_CACHE_MAX_ENTRIES: int = 10000
+
+    REPOSITORY_CACHE_ENABLED: bool = True
+    REPOSITORY_CACHE_TTL: int = 300
+
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: dict[str, str] = {}
+
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_RATE_PER_IP: str = "20/minute"
+    LOGIN_FAILURE_WINDOW: int = 900
+    LOGIN_DELAY_AFTER: int = 3
+    LOGIN_DELAY_BASE: float = 1
+    LOGIN_DELAY_MAX: float = 60
+    LOGIN_LOCKOUT_THRESHOLD: int = 10
+    LOGIN_LOCKOUT_SECONDS: int = 900
+
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_LIMITS: dict[str, int] = {
+        "auth": 8,
+        "reads": 64,
+        "search": 8,
+        "writes": 32,
+        "uploads": 4,
+    }
+    ADMISSION_TARGET_LATENCY_MS: dict[str, float] = {
+        "auth": 1000,
+        "reads": 200,
+        "search": 500,
+        "writes": 300,
+        "uploads": 3000,
+    }
+    ADMISSION_MIN_LIMIT: int = 1
+    ADMISSION_DECREASE_FACTOR: float = 0.9
+    ADMISSION_QUEUE_SIZE: int = 100
+    ADMISSION_QUEUE_TIMEOUT: float = 2
+    ADMISSION_RETRY_AFTER: int = 1
+
+    QUOTA_ENABLED: bool = True
+    QUOTA_BUDGET: int = 2000
+    QUOTA_WINDOW: int = 3600
+    QUOTA_BUCKETS: int = 60
+
+    MAIL_POOL_SIZE: int = 2
+    MAIL_BATCH_SIZE: int = 20
+    MAIL_QUEUE_SIZE: int = 1000
+    MAIL_RETRY_ATTEMPTS: int = 3
+    MAIL_RETRY_BACKOFF: float = 1
+    MAIL_TIMEOUT: float = 10
+    MAIL_IDLE_TIMEOUT: float = 30
+    MAIL_DRAIN_TIMEOUT: float = 10
+
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_POLL_INTERVAL: float = 1
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_RETRY_BACKOFF: float = 30
+    OUTBOX_RETRY_MAX: float = 3600
+    OUTBOX_LEASE_SECONDS: float = 300
+
     model_config = ConfigDict(
         extra="ignore", env_file=".env", env_file_encoding="utf-8", case_sensitive=True
     )
@@ -14,6 +14,9 @@ APP_IS_HEALTHY = "Application is healthy"
 USER_ALREADY_EXIST = "User already exists"
 """Повідомлення про те, що користувач вже зареєстрований."""
 
+USERNAME_ALREADY_EXIST = "Username already exists"
+"""Повідомлення про те, що ім'я користувача вже зайняте."""
+
 USER_EMAIL_NOT_CONFIRMED = "Email is not confirmed"
 """Помилка входу: користувач не підтвердив свою електронну пошту."""
 
@@ -22,3 +25,27 @@ USER_NOT_AUTHENTICATED = "User is not authenticated"
 
 WRONG_PASSWORD = "Wrong password or email"
 """Помилка входу: неправильний пароль або email."""
+
+PROFILE_NOT_FOUND = "Profile not found"
+"""Повідомлення про відсутність профілю запиту в кільцевому буфері."""
+
+SNAPSHOT_NOT_FOUND = "Memory snapshot not found"
+"""Повідомлення про відсутність знімка пам'яті (або базового знімка для порівняння)."""
+
+MEMORY_TRACING_DISABLED = "Memory tracing is disabled"
+"""Повідомлення про те, що відстеження виділень пам'яті не ввімкнене."""
+
+RATE_LIMIT_EXCEEDED = "Перевищено ліміт запитів. Спробуйте пізніше."
+"""Відповідь 429: клієнт вичерпав ліміт запитів."""
+
+LOGIN_THROTTLED = "Too many login attempts. Try again later."
+"""Відповідь 429: забагато спроб входу для імені користувача або IP-адреси."""
+
+SERVICE_OVERLOADED = "Service is overloaded. Try again later."
+"""Відповідь 503: контроль допуску відхилив запит під перевантаженням."""
+
+QUOTA_EXCEEDED = "Usage quota exceeded. Try again later."
+"""Відповідь 429: користувач вичерпав бюджет дорогих запитів."""
+
+OUTBOX_ENTRY_NOT_FOUND = "Undelivered email not found"
+"""Відповідь 404: у черзі листів немає недоставленого листа з таким ідентифікатором."""
@@ -1,5 +1,4 @@
 import contextlib
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -9,19 +8,20 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from src.conf.config import settings
+from src.services.instrumentation import install_query_listeners
+from src.services.metrics import instrument_pool
+from src.services.slow_queries import slow_query_log
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_async_engine(DATABASE_URL, future=True, echo=True)
-SessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=engine, class_=AsyncSession
-)
-
 
 class DatabaseSessionManager:
     """
     Менеджер сесій бази даних для роботи з SQLAlchemy у асинхронному режимі.
 
+    Рушій створюється під час першого звернення, тому імпорт модуля не
+    завантажує драйвер бази даних.
+
     :param url: URL підключення до бази даних.
     :type url: str
     """
@@ -33,23 +33,48 @@ class DatabaseSessionManager:
         :param url: URL підключення до бази даних.
         :type url: str
         """
-        self._engine: AsyncEngine | None = create_async_engine(url)
-        self._session_maker: async_sessionmaker = async_sessionmaker(
+        self._url = url
+        self._engine: AsyncEngine | None = None
+        self._session_maker: async_sessionmaker | None = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """
+        Асинхронний рушій бази даних, яким керує менеджер.
+
+        :rtype: AsyncEngine
+        """
+        if self._engine is None:
+            self._initialize()
+        return self._engine
+
+    def _initialize(self) -> None:
+        self._engine = create_async_engine(self._url)
+        install_query_listeners(self._engine)
+        instrument_pool(self._engine)
+        slow_query_log.install(self._engine)
+        self._session_maker = async_sessionmaker(
             autoflush=False, autocommit=False, bind=self._engine
         )
 
+    async def close(self) -> None:
+        """
+        Закриває всі з'єднання пулу, якщо рушій уже створено.
+        """
+        if self._engine is not None:
+            await self._engine.dispose()
+
     @contextlib.asynccontextmanager
     async def session(self):
         """
         Контекстний менеджер для створення та керування сесією бази даних.
 
-        :raises Exception: Якщо сесія не ініціалізована.
         :raises SQLAlchemyError: Якщо під час виконання виникає помилка SQLAlchemy.
         :yield: Об'єкт асинхронної сесії бази даних.
         :rtype: AsyncSession
         """
         if self._session_maker is None:
-            raise Exception("Database session is not initialized")
+            self._initialize()
         session = self._session_maker()
         try:
             yield session
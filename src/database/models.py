@@ -1,6 +1,6 @@
 from datetime import datetime, date
 
-from sqlalchemy import Column, Integer, String, Boolean, func, Table, Enum
+from sqlalchemy import Column, Integer, String, Boolean, func, Table, Enum, Text, Index
 from sqlalchemy.orm import relationship, mapped_column, Mapped, DeclarativeBase
 from sqlalchemy.sql.schema import ForeignKey
 from sqlalchemy.sql.sqltypes import Date, DateTime
@@ -15,6 +15,12 @@ class UserRole(str, enum.Enum):
     ADMIN = "admin"
 
 
+class OutboxStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    DEAD = "dead"
+
+
 class Base(DeclarativeBase):
     """
     Базовий клас для моделей SQLAlchemy.
@@ -128,3 +134,65 @@ class User(Base):
     is_active = Column(Boolean, default=True)
 
     role = Column(Enum(UserRole), default=UserRole.USER)
+
+
+class EmailOutbox(Base):
+    """
+    Лист, що чекає на відправлення окремим процесом.
+
+    Запис додається в ту саму транзакцію, що й зміна, яка спричинила лист,
+    тому лист не губиться, якщо воркер застосунку перезапуститься.
+
+    :param id: Унікальний ідентифікатор запису.
+    :type id: int
+    :param kind: Тип листа (``verify``, ``reset``).
+    :type kind: str
+    :param recipient: Email-адреса отримувача.
+    :type recipient: str
+    :param message: Лист у форматі RFC 5322.
+    :type message: str
+    :param status: Стан відправлення.
+    :type status: OutboxStatus
+    :param attempts: Кількість спроб відправлення.
+    :type attempts: int
+    :param next_attempt_at: Час (UTC), не раніше якого лист можна відправляти.
+    :type next_attempt_at: datetime
+    :param last_error: Остання помилка відправлення.
+    :type last_error: str, optional
+    :param sent_at: Час (UTC) відправлення.
+    :type sent_at: datetime, optional
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    """Унікальний ідентифікатор запису."""
+
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    """Тип листа."""
+
+    recipient: Mapped[str] = mapped_column(String(255), nullable=False)
+    """Email-адреса отримувача."""
+
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    """Лист у форматі RFC 5322."""
+
+    status: Mapped[OutboxStatus] = mapped_column(
+        Enum(OutboxStatus), default=OutboxStatus.PENDING, nullable=False
+    )
+    """Стан відправлення."""
+
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    """Кількість спроб відправлення."""
+
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    """Час (UTC), не раніше якого лист можна відправляти."""
+
+    last_error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    """Остання помилка відправлення."""
+
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    """Час (UTC) відправлення."""
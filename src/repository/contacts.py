@@ -2,11 +2,14 @@ from typing import List
 from sqlalchemy import select, or_, func, extract, and_, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from datetime import timedelta
+from datetime import date, timedelta
 from src.database.models import Contact, User
 from src.schemas.contacts import ContactBase, ContactResponse
+from src.services.repository_cache import cached, invalidates
+from src.services.slow_queries import track_repository
 
 
+@track_repository
 class ContactRepository:
     """
     Репозиторій для управління контактами користувача.
@@ -25,6 +28,9 @@ class ContactRepository:
         result = await self.db.execute(stmt)
         return result.scalars().first()
 
+    @cached(
+        Contact, "contacts:{user.id}:list:{skip}:{limit}", tags=["contacts:{user.id}"]
+    )
     async def get_contacts(self, skip: int, limit: int, user: User) -> List[Contact]:
         """
         Отримати список контактів користувача.
@@ -36,8 +42,9 @@ class ContactRepository:
         """
         stmt = select(Contact).filter_by(user=user).offset(skip).limit(limit)
         contacts = await self.db.execute(stmt)
-        return (await contacts.scalars()).all()
+        return contacts.scalars().all()
 
+    @cached(Contact, "contact:{user.id}:{contact_id}", tags=["contacts:{user.id}"])
     async def get_contact_by_id(self, contact_id: int, user: User) -> Contact | None:
         """
         Отримати контакт за його ID.
@@ -50,6 +57,7 @@ class ContactRepository:
         contact = await self.db.execute(stmt)
         return contact.scalar_one_or_none()
 
+    @invalidates("contacts:{user.id}")
     async def create_contact(
         self, body: ContactBase, user: User, tags: List[str]
     ) -> Contact:
@@ -67,6 +75,7 @@ class ContactRepository:
         await self.db.refresh(contact)
         return contact
 
+    @invalidates("contacts:{user.id}")
     async def remove_contact(self, contact_id: int, user: User) -> Contact | None:
         """
         Видалити контакт за його ID.
@@ -81,6 +90,7 @@ class ContactRepository:
             await self.db.commit()
         return contact
 
+    @invalidates("contacts:{user.id}")
     async def update_contact(
         self, contact_id: int, data: dict, user: User
     ) -> Contact | None:
@@ -99,6 +109,7 @@ class ContactRepository:
         for key, value in data.items():
             setattr(contact, key, value)
         await self.db.commit()
+        await self.db.refresh(contact)
         return contact
 
     async def search_contacts(
@@ -116,11 +127,13 @@ class ContactRepository:
         stmt = (
             select(Contact)
             .filter(
-                or_(Contact.first_name, Contact.last_name).ilike(f"%{search}%"),
-                Contact.email.ilike(f"%{search}%"),
-                Contact.phone_number.ilike(f"%{search}%"),
-                Contact.birthday.ilike(f"%{search}%"),
-                Contact.additional_data.ilike(f"%{search}%"),
+                or_(
+                    Contact.first_name.ilike(f"%{search}%"),
+                    Contact.last_name.ilike(f"%{search}%"),
+                    Contact.email.ilike(f"%{search}%"),
+                    Contact.phone_number.ilike(f"%{search}%"),
+                    Contact.additional_data.ilike(f"%{search}%"),
+                )
             )
             .filter_by(user=user)
             .offset(skip)
@@ -128,3 +141,32 @@ class ContactRepository:
         )
         contacts = await self.db.execute(stmt)
         return contacts.scalars().all()
+
+    async def upcoming_birthdays(self, days: int, user: User) -> List[Contact]:
+        """
+        Отримати контакти, чий день народження настає протягом ``days`` днів.
+
+        Порівнюються лише місяць і день, тому враховується перехід через
+        кінець року.
+
+        :param days: Кількість днів наперед, починаючи з сьогодні.
+        :param user: Об'єкт користувача, для якого виконується пошук.
+        :return: Список контактів із найближчими днями народження.
+        """
+        today = date.today()
+        end = today + timedelta(days=days)
+        month_day = extract("month", Contact.birthday) * 100 + extract(
+            "day", Contact.birthday
+        )
+        start_key = today.month * 100 + today.day
+        end_key = end.month * 100 + end.day
+
+        stmt = select(Contact).filter_by(user=user)
+        # За рік і більше підходять усі дні народження.
+        if days < 365:
+            if start_key <= end_key:
+                stmt = stmt.filter(month_day.between(start_key, end_key))
+            else:
+                stmt = stmt.filter(or_(month_day >= start_key, month_day <= end_key))
+        contacts = await self.db.execute(stmt)
+        return contacts.scalars().all()
@@ -1,10 +1,16 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.models import User
+from src.database.models import User, UserRole
 from src.schemas.users import UserCreate
+from src.services.repository_cache import cached, invalidates
+from src.services.slow_queries import track_repository
 
+UPDATABLE_FIELDS = {"username", "email", "avatar"}
+"""Поля, які можна змінити через ``update_user``."""
 
+
+@track_repository
 class UserRepository:
     """
     Репозиторій для управління користувачами.
@@ -18,6 +24,9 @@ class UserRepository:
         """
         self.db = session
 
+    @cached(
+        User, "user:{user_id}", tags=["user:{user_id}"], exclude=["hashed_password"]
+    )
     async def get_user_by_id(self, user_id: int) -> User | None:
         """
         Отримати користувача за його ID.
@@ -29,6 +38,12 @@ class UserRepository:
         user = await self.db.execute(stmt)
         return user.scalar_one_or_none()
 
+    @cached(
+        User,
+        "user:username:{username}",
+        tags=["user:{result.id}"],
+        exclude=["hashed_password"],
+    )
     async def get_user_by_username(self, username: str) -> User | None:
         """
         Отримати користувача за його ім'ям.
@@ -69,16 +84,21 @@ class UserRepository:
         await self.db.refresh(user)
         return user
 
-    async def confirmed_email(self, email: str) -> None:
+    @invalidates("user:{result.id}")
+    async def confirmed_email(self, email: str) -> User:
         """
         Підтвердити email користувача.
 
         :param email: Email користувача.
+        :return: Оновлений об'єкт User.
         """
         user = await self.get_user_by_email(email)
         user.confirmed = True
         await self.db.commit()
+        await self.db.refresh(user)
+        return user
 
+    @invalidates("user:{result.id}")
     async def update_avatar_url(self, email: str, url: str) -> User:
         """
         Оновити URL аватару користувача.
@@ -92,3 +112,75 @@ class UserRepository:
         await self.db.commit()
         await self.db.refresh(user)
         return user
+
+    @invalidates("user:{result.id}")
+    async def update_password(self, user: User, hashed_password: str) -> User:
+        """
+        Замінити хеш пароля користувача.
+
+        :param user: Об'єкт User, завантажений з бази даних.
+        :param hashed_password: Новий хеш пароля.
+        :return: Оновлений об'єкт User.
+        """
+        user.hashed_password = hashed_password
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    @invalidates("user:{result.id}")
+    async def update_user_role(self, email: str, role: UserRole) -> User | None:
+        """
+        Змінити роль користувача.
+
+        :param email: Email користувача.
+        :param role: Нова роль.
+        :return: Оновлений об'єкт User або None, якщо користувача не знайдено.
+        """
+        user = await self.get_user_by_email(email)
+        if user is None:
+            return None
+        user.role = role
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    @invalidates("user:{user_id}")
+    async def update_user(self, user_id: int, data: dict) -> User | None:
+        """
+        Оновити дані користувача.
+
+        Змінюються лише поля з :data:`UPDATABLE_FIELDS`, решта ігнорується.
+        Після зміни email обліковий запис знову потребує підтвердження.
+
+        :param user_id: Ідентифікатор користувача.
+        :param data: Нові значення полів.
+        :return: Оновлений об'єкт User або None, якщо користувача не знайдено.
+        """
+        stmt = select(User).filter_by(id=user_id)
+        user = (await self.db.execute(stmt)).scalar_one_or_none()
+        if user is None:
+            return None
+        if "email" in data and data["email"] != user.email:
+            user.confirmed = False
+        for key, value in data.items():
+            if key in UPDATABLE_FIELDS:
+                setattr(user, key, value)
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    @invalidates("user:{user_id}")
+    async def delete_user(self, user_id: int) -> bool:
+        """
+        Видалити користувача.
+
+        :param user_id: Ідентифікатор користувача.
+        :return: True, якщо користувача видалено, False, якщо його не знайдено.
+        """
+        stmt = select(User).filter_by(id=user_id)
+        user = (await self.db.execute(stmt)).scalar_one_or_none()
+        if user is None:
+            return False
+        await self.db.delete(user)
+        await self.db.commit()
+        return True
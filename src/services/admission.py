@@ -0,0 +1,284 @@
+"""
+Адаптивний контроль допуску запитів і скидання навантаження.
+
+Без обмежень uvicorn приймає будь-яку кількість одночасних запитів, і під
+перевантаженням повільнішають усі ендпоінти разом. ``AdmissionMiddleware``
+ділить запити на класи (``auth``, ``reads``, ``search``, ``writes``,
+``uploads``) і для кожного класу обмежує кількість запитів, що
+обробляються одночасно:
+
+- запит понад ліміт чекає в черзі класу не довше ``ADMISSION_QUEUE_TIMEOUT``
+  секунд;
+- якщо черга заповнена (``ADMISSION_QUEUE_SIZE``) або час очікування
+  минув, запит отримує 503 із ``Retry-After``.
+
+Ліміт кожного класу змінюється за правилом AIMD відповідно до тривалості
+обробки: якщо вона не перевищує цільову (``ADMISSION_TARGET_LATENCY_MS``),
+ліміт зростає приблизно на одиницю за кожні «ліміт» завершених запитів, а
+якщо перевищує — множиться на ``ADMISSION_DECREASE_FACTOR`` (не частіше
+одного разу за цільову тривалість). Ліміт не виходить за межі
+``ADMISSION_MIN_LIMIT``..``ADMISSION_LIMITS``. Отже, коли пошук чи
+bcrypt-логіни насичують воркер, їхній клас звужується, а дешеві читання
+лишаються швидкими.
+
+Службові маршрути (``/metrics``, перевірки стану, ``/api/admin``) не
+обмежуються. Стан ведеться окремо в кожному воркері й доступний у
+``/api/admin/admission``; ``ADMISSION_ENABLED`` вимикає контроль.
+"""
+
+import asyncio
+import time
+from collections import deque
+
+from fastapi.responses import ORJSONResponse
+
+from src.conf import messages
+from src.conf.config import settings
+from src.services.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_LIMIT,
+    ADMISSION_QUEUE_WAIT,
+    ADMISSION_REJECTIONS,
+)
+
+EXEMPT_PATHS = ("/metrics", "/api/healthchecker", "/api/readiness", "/api/admin")
+"""Префікси шляхів, що не обмежуються."""
+
+SEARCH_PATHS = (
+    "/api/contacts/search",
+    "/api/contacts/upcoming-birthdays",
+    "/api/contacts/all",
+)
+"""Префікси шляхів із дорогими запитами до бази даних."""
+
+UPLOAD_PATHS = ("/api/auth/avatar",)
+"""Префікси шляхів із завантаженням файлів."""
+
+
+def route_class(method: str, path: str) -> str | None:
+    """
+    Визначає клас запиту за методом і шляхом.
+
+    Проміжний шар працює до маршрутизації, тому клас визначається за
+    префіксом шляху, а не за маршрутом FastAPI.
+
+    :param method: HTTP-метод.
+    :param path: Шлях запиту.
+    :return: Назва класу або None для службових маршрутів.
+    """
+    if path.startswith(EXEMPT_PATHS):
+        return None
+    if path.startswith(UPLOAD_PATHS):
+        return "uploads"
+    if path.startswith(SEARCH_PATHS):
+        return "search"
+    if path.startswith("/api/auth"):
+        return "auth"
+    if method in ("GET", "HEAD", "OPTIONS"):
+        return "reads"
+    return "writes"
+
+
+class Overloaded(Exception):
+    """
+    Запит не допущено: черга класу заповнена або час очікування минув.
+    """
+
+
+class AdaptiveLimiter:
+    """
+    Ліміт одночасних запитів одного класу з чергою та AIMD-адаптацією.
+
+    :param name: Назва класу (для метрик).
+    :param max_limit: Максимальний (і початковий) ліміт.
+    :param min_limit: Мінімальний ліміт.
+    :param target_latency: Цільова тривалість обробки в секундах.
+    :param queue_size: Максимальна довжина черги.
+    :param decrease_factor: Множник ліміту при перевищенні цільової тривалості.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int,
+        min_limit: int = settings.ADMISSION_MIN_LIMIT,
+        target_latency: float = 0.5,
+        queue_size: int = settings.ADMISSION_QUEUE_SIZE,
+        decrease_factor: float = settings.ADMISSION_DECREASE_FACTOR,
+    ):
+        self.name = name
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.target_latency = target_latency
+        self.queue_size = queue_size
+        self.decrease_factor = decrease_factor
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        ADMISSION_LIMIT.labels(name).set(self.limit)
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        ADMISSION_IN_FLIGHT.labels(self.name).inc()
+
+    async def acquire(self, timeout: float) -> None:
+        """
+        Чекає на місце для запиту.
+
+        :param timeout: Максимальний час очікування в черзі в секундах.
+        :raises Overloaded: Якщо черга заповнена або час очікування минув.
+        """
+        if self._has_capacity() and not self._waiters:
+            self._admit()
+            return
+        if len(self._waiters) >= self.queue_size:
+            ADMISSION_REJECTIONS.labels(self.name, "queue_full").inc()
+            raise Overloaded(self.name)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            ADMISSION_REJECTIONS.labels(self.name, "timeout").inc()
+            raise Overloaded(self.name) from None
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Місце вже видане, але клієнт пішов: повертаємо його.
+                self.release(None)
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            ADMISSION_QUEUE_WAIT.labels(self.name).observe(time.perf_counter() - start)
+
+    def release(self, latency: float | None) -> None:
+        """
+        Звільняє місце й адаптує ліміт.
+
+        :param latency: Тривалість обробки запиту в секундах або None, якщо
+            запит не оброблявся.
+        """
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.labels(self.name).dec()
+        if latency is not None:
+            self._adapt(latency)
+        while self._waiters and self._has_capacity():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._admit()
+                waiter.set_result(None)
+
+    def _adapt(self, latency: float) -> None:
+        if latency <= self.target_latency:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        else:
+            now = time.monotonic()
+            if now - self._last_decrease < self.target_latency:
+                return
+            self._last_decrease = now
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        ADMISSION_LIMIT.labels(self.name).set(self.limit)
+
+    def stats(self) -> dict:
+        """
+        Поточний стан ліміту.
+        """
+        return {
+            "limit": round(self.limit, 2),
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+        }
+
+
+class AdmissionController:
+    """
+    Ліміти всіх класів маршрутів воркера.
+
+    :param limits: Максимальний ліміт одночасних запитів для кожного класу.
+    :param target_latency_ms: Цільова тривалість обробки для кожного класу в мс.
+    :param queue_timeout: Максимальний час очікування в черзі в секундах.
+    :param retry_after: Значення ``Retry-After`` відповіді 503 у секундах.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, int] = settings.ADMISSION_LIMITS,
+        target_latency_ms: dict[str, float] = settings.ADMISSION_TARGET_LATENCY_MS,
+        queue_timeout: float = settings.ADMISSION_QUEUE_TIMEOUT,
+        retry_after: int = settings.ADMISSION_RETRY_AFTER,
+    ):
+        self.enabled = settings.ADMISSION_ENABLED
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.limiters = {
+            name: AdaptiveLimiter(
+                name, limit, target_latency=target_latency_ms.get(name, 500) / 1000
+            )
+            for name, limit in limits.items()
+        }
+
+    def limiter_for(self, scope) -> AdaptiveLimiter | None:
+        """
+        Повертає ліміт класу запиту.
+
+        :param scope: ASGI scope запиту.
+        :return: Ліміт або None, якщо запит не обмежується.
+        """
+        if not self.enabled:
+            return None
+        return self.limiters.get(route_class(scope["method"], scope["path"]))
+
+    def stats(self) -> dict:
+        """
+        Стан лімітів усіх класів.
+        """
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+
+admission = AdmissionController()
+"""Контроль допуску воркера."""
+
+
+class AdmissionMiddleware:
+    """
+    ASGI-проміжний шар контролю допуску.
+
+    :param app: ASGI-застосунок.
+    :param controller: Ліміти класів маршрутів.
+    """
+
+    def __init__(self, app, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        limiter = self.controller.limiter_for(scope)
+        if limiter is None:
+            return await self.app(scope, receive, send)
+
+        try:
+            await limiter.acquire(self.controller.queue_timeout)
+        except Overloaded:
+            response = ORJSONResponse(
+                {"error": messages.SERVICE_OVERLOADED},
+                status_code=503,
+                headers={"Retry-After": str(self.controller.retry_after)},
+            )
+            return await response(scope, receive, send)
+
+        start = time.perf_counter()
+        latency = None
+        try:
+            await self.app(scope, receive, send)
+            latency = time.perf_counter() - start
+        finally:
+            limiter.release(latency)
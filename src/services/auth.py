@@ -6,10 +6,13 @@ from passlib.context import CryptContext
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
+from starlette.concurrency import run_in_threadpool
 
 from src.database.db import get_db
 from src.conf.config import settings
 from src.services.users import UserService
+from src.services.instrumentation import timed
+from src.services.metrics import PASSWORD_HASH_IN_PROGRESS
 
 
 class Hash:
@@ -29,6 +32,22 @@ class Hash:
         """Перевіряє, чи збігається введений пароль із хешованим"""
         return Hash.pwd_context.verify(plain_password, hashed_password)
 
+    @classmethod
+    async def hash_password_async(cls, password: str) -> str:
+        """Генерує хеш пароля в пулі потоків, не блокуючи цикл подій"""
+        with PASSWORD_HASH_IN_PROGRESS.track_inprogress():
+            return await run_in_threadpool(cls.hash_password, password)
+
+    @classmethod
+    async def verify_password_async(
+        cls, plain_password: str, hashed_password: str
+    ) -> bool:
+        """Перевіряє пароль у пулі потоків, не блокуючи цикл подій"""
+        with PASSWORD_HASH_IN_PROGRESS.track_inprogress():
+            return await run_in_threadpool(
+                cls.verify_password, plain_password, hashed_password
+            )
+
 
 oauth2_scheme = HTTPBearer()
 
@@ -71,21 +90,24 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        payload = jwt.decode(
-            token.credentials, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
-        )
-        username = payload.get("sub")
-        if username is None:
+    with timed("auth"):
+        try:
+            payload = jwt.decode(
+                token.credentials,
+                settings.JWT_SECRET,
+                algorithms=[settings.JWT_ALGORITHM],
+            )
+            username = payload.get("sub")
+            if username is None:
+                raise credentials_exception
+        except JWTError:
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
 
-    user_service = UserService(db)
-    user = await user_service.get_user_by_username(username)
-    if user is None:
-        raise credentials_exception
-    return user
+        user_service = UserService(db)
+        user = await user_service.get_user_by_username(username)
+        if user is None:
+            raise credentials_exception
+        return user
 
 
 def create_email_token(data: dict) -> str:
@@ -127,6 +149,10 @@ async def get_email_from_token(token: str) -> str:
         )
 
 
+RESET_TOKEN_SCOPE = "reset_password"
+"""Призначення токена скидання пароля."""
+
+
 def create_reset_token(email: str) -> str:
     """
     Генерує токен для скидання пароля (дійсний 1 годину)
@@ -135,7 +161,7 @@ def create_reset_token(email: str) -> str:
     :return: JWT-токен для скидання пароля.
     """
     expiration = datetime.now(UTC) + timedelta(hours=1)
-    to_encode = {"sub": email, "exp": expiration}
+    to_encode = {"sub": email, "exp": expiration, "scope": RESET_TOKEN_SCOPE}
     return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
 
@@ -150,6 +176,9 @@ def verify_reset_token(token: str) -> Optional[str]:
         payload = jwt.decode(
             token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
         )
-        return payload.get("sub")
     except JWTError:
         return None
+    # Токен підтвердження email має той самий ``sub`` і не скидає пароль.
+    if payload.get("scope") != RESET_TOKEN_SCOPE:
+        return None
+    return payload.get("sub")
@@ -1,5 +0,0 @@
-from redis import asyncio as aioredis
-
-from src.conf.config import settings
-
-redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
@@ -0,0 +1,132 @@
+"""
+Бінарний формат записів ``RedisCache``.
+
+Запис — це MessagePack-масив ``[схема, версія, дані]``:
+
+- ``схема`` — ім'я зареєстрованої Pydantic-моделі або ``""`` для простих
+  значень (словників, списків, рядків, чисел);
+- ``версія`` — версія схеми на момент запису;
+- ``дані`` — JSON-сумісний дамп моделі (дати — рядки ISO 8601).
+
+Записи ``RedisCache.get_or_compute`` мають ще два елементи: логічний час
+завершення свіжості (Unix-час) і тривалість обчислення значення в секундах
+(для ймовірнісного дострокового оновлення).
+
+Під час читання дані знову валідуються моделлю, тож із кешу повертається той
+самий тип, що й був записаний. ORM-об'єкти перед записом перетворюються на
+модель через ``from_attributes``. Якщо версію схеми підвищено (змінилися
+поля), старі записи вважаються промахом, а не ламають обробник.
+"""
+
+import msgpack
+from pydantic import BaseModel, ValidationError
+
+PLAIN = ""
+
+
+class StaleEntry(Exception):
+    """
+    Запис кешу не можна прочитати поточною версією схеми.
+    """
+
+
+class CacheCodec:
+    """
+    Реєстр схем кешу та їхні версії.
+    """
+
+    def __init__(self):
+        self._schemas: dict[str, tuple[type[BaseModel], int]] = {}
+        self._names: dict[type[BaseModel], str] = {}
+
+    def register(
+        self, schema: type[BaseModel], version: int = 1, name: str | None = None
+    ) -> type[BaseModel]:
+        """
+        Реєструє модель, яку можна зберігати в кеші.
+
+        Підвищуйте ``version`` щоразу, коли змінюються поля моделі.
+
+        :param schema: Pydantic-модель.
+        :param version: Версія схеми.
+        :param name: Ім'я схеми в записах; за замовчуванням — ім'я класу.
+        :return: Та сама модель (можна використовувати як декоратор).
+        """
+        name = name or schema.__name__
+        self._schemas[name] = (schema, version)
+        self._names[schema] = name
+        return schema
+
+    def dumps(
+        self,
+        value,
+        schema: type[BaseModel] | None = None,
+        fresh_until: float | None = None,
+        delta: float = 0.0,
+    ) -> bytes:
+        """
+        Серіалізує значення.
+
+        :param value: Модель, ORM-об'єкт або просте значення.
+        :param schema: Модель, до якої слід привести ``value``; обов'язкова
+            для ORM-об'єктів.
+        :param fresh_until: Unix-час, до якого значення вважається свіжим.
+        :param delta: Тривалість обчислення значення в секундах.
+        :return: Байти для запису в Redis.
+        :raises KeyError: Якщо модель не зареєстрована.
+        """
+        if schema is None and isinstance(value, BaseModel):
+            schema = type(value)
+        if schema is None:
+            record = [PLAIN, 0, value]
+        else:
+            name = self._names[schema]
+            if not isinstance(value, schema):
+                value = schema.model_validate(value, from_attributes=True)
+            version = self._schemas[name][1]
+            record = [name, version, value.model_dump(mode="json")]
+        if fresh_until is not None:
+            record += [fresh_until, delta]
+        return msgpack.packb(record)
+
+    def loads(self, data: bytes):
+        """
+        Десеріалізує значення.
+
+        :param data: Байти з Redis.
+        :return: Екземпляр моделі або просте значення.
+        :raises StaleEntry: Якщо запис має невідому схему, застарілу версію
+            або пошкоджений.
+        """
+        return self.loads_entry(data)[0]
+
+    def loads_entry(self, data: bytes) -> tuple:
+        """
+        Десеріалізує значення разом із часом свіжості.
+
+        :param data: Байти з Redis.
+        :return: ``(значення, fresh_until, delta)``; для записів без часу
+            свіжості ``fresh_until`` дорівнює None.
+        :raises StaleEntry: Якщо запис має невідому схему, застарілу версію
+            або пошкоджений.
+        """
+        try:
+            name, version, payload, *timing = msgpack.unpackb(data)
+            fresh_until, delta = timing or (None, 0.0)
+        except (ValueError, TypeError, msgpack.UnpackException) as e:
+            raise StaleEntry(f"Unreadable cache entry: {e}") from e
+        return self._load(name, version, payload), fresh_until, delta
+
+    def _load(self, name: str, version: int, payload):
+        if name == PLAIN:
+            return payload
+        schema, current = self._schemas.get(name, (None, None))
+        if schema is None or version != current:
+            raise StaleEntry(f"{name} v{version} is not readable (current v{current})")
+        try:
+            return schema.model_validate(payload)
+        except ValidationError as e:
+            raise StaleEntry(f"{name} v{version} does not match its schema") from e
+
+
+codec = CacheCodec()
@@ -0,0 +1,252 @@
+"""
+Стиснення HTTP-відповідей.
+
+``CompressionMiddleware`` обирає кодування за заголовком ``Accept-Encoding``
+(``zstd``, ``br`` або ``gzip``) і стискає лише відповіді зі стисливим типом
+вмісту, більші за ``COMPRESSION_MIN_SIZE`` байтів. Відповіді, що надходять
+частинами (``StreamingResponse``), стискаються потоково: кожна частина
+відправляється клієнту одразу після стиснення.
+
+Відповіді, що вже мають ``Content-Encoding`` (наприклад, попередньо стиснені
+записи кешу відповідей), передаються без змін.
+"""
+
+import zlib
+
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+
+from src.conf.config import settings
+
+ENCODINGS = ("zstd", "br", "gzip")
+"""Підтримувані кодування в порядку переваги сервера."""
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/msgpack",
+    "application/x-msgpack",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def default_levels() -> dict[str, int]:
+    """
+    Рівні стиснення з налаштувань.
+
+    :return: Словник ``кодування -> рівень``.
+    """
+    return {
+        "gzip": settings.COMPRESSION_GZIP_LEVEL,
+        "br": settings.COMPRESSION_BROTLI_QUALITY,
+        "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+    }
+
+
+def choose_encoding(accept_encoding: str, available=ENCODINGS) -> str | None:
+    """
+    Обирає кодування відповіді за заголовком ``Accept-Encoding``.
+
+    Перевага надається кодуванню з найбільшим ``q``; за однакових ``q`` —
+    порядку ``available``. Кодування з ``q=0`` не використовуються.
+
+    :param accept_encoding: Значення заголовка ``Accept-Encoding``.
+    :param available: Кодування, які підтримує сервер.
+    :return: Назва кодування або None, якщо відповідь не стискається.
+    """
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name.strip()] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    """
+    Перевіряє, чи варто стискати вміст такого типу.
+
+    :param content_type: Значення заголовка ``Content-Type``.
+    :return: True для текстових і JSON/MessagePack відповідей.
+    """
+    content_type = content_type.lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+def compress(data: bytes, encoding: str, level: int | None = None) -> bytes:
+    """
+    Стискає дані повністю.
+
+    :param data: Дані для стиснення.
+    :param encoding: ``gzip``, ``br`` або ``zstd``.
+    :param level: Рівень стиснення; за замовчуванням — з налаштувань.
+    :return: Стиснені дані.
+    """
+    compressor = StreamCompressor(encoding, level)
+    return compressor.compress(data, flush=False) + compressor.finish()
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    """
+    Розпаковує дані, стиснені :func:`compress`.
+
+    :param data: Стиснені дані.
+    :param encoding: ``gzip``, ``br`` або ``zstd``.
+    :return: Вихідні дані.
+    """
+    if encoding == "gzip":
+        return zlib.decompress(data, wbits=31)
+    if encoding == "br":
+        return brotli.decompress(data)
+    if encoding == "zstd":
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class StreamCompressor:
+    """
+    Потоковий компресор для одного тіла відповіді.
+
+    :param encoding: ``gzip``, ``br`` або ``zstd``.
+    :param level: Рівень стиснення; за замовчуванням — з налаштувань.
+    """
+
+    def __init__(self, encoding: str, level: int | None = None):
+        if level is None:
+            level = default_levels()[encoding]
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress(self, chunk: bytes, flush: bool = True) -> bytes:
+        """
+        Стискає частину тіла.
+
+        :param chunk: Частина тіла відповіді.
+        :param flush: Чи віддати все стиснене одразу, щоб клієнт міг
+            розпакувати частину, не чекаючи кінця потоку.
+        :return: Стиснені байти, готові до відправлення.
+        """
+        if self.encoding == "br":
+            data = self._compressor.process(chunk)
+            return data + self._compressor.flush() if flush else data
+        data = self._compressor.compress(chunk)
+        if not flush:
+            return data
+        if self.encoding == "gzip":
+            return data + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return data + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        """
+        Завершує потік стиснення.
+
+        :return: Останні стиснені байти.
+        """
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware, що стискає відповіді за ``Accept-Encoding``.
+
+    :param app: ASGI-застосунок.
+    :param minimum_size: Мінімальний розмір тіла в байтах для стиснення.
+    :param levels: Рівні стиснення для кожного кодування.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = settings.COMPRESSION_MIN_SIZE,
+        levels: dict[str, int] | None = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = levels or default_levels()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), tuple(self.levels)
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: StreamCompressor | None = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                if "content-encoding" in headers or not is_compressible(
+                    headers.get("content-type", "")
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=list(start_message.get("headers", [])))
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send({**start_message, "headers": headers.raw})
+                    await send(message)
+                    return
+                compressor = StreamCompressor(encoding, self.levels[encoding])
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    del headers["Content-Length"]
+                    body = compressor.compress(body)
+                else:
+                    body = compressor.compress(body, flush=False) + compressor.finish()
+                    headers["Content-Length"] = str(len(body))
+                await send({**start_message, "headers": headers.raw})
+                await send({**message, "body": body})
+                return
+
+            body = compressor.compress(body)
+            if not more_body:
+                body += compressor.finish()
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_wrapper)
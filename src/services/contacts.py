@@ -60,7 +60,9 @@ class ContactService:
         :param user: Користувач, якому належить контакт.
         :return: Оновлений об'єкт контакту або None, якщо не знайдено.
         """
-        return await self.contact_repository.update_contact(contact_id, body, user)
+        return await self.contact_repository.update_contact(
+            contact_id, body.model_dump(exclude_unset=True), user
+        )
 
     async def remove_contact(self, contact_id: int, user: User):
         """
@@ -0,0 +1,123 @@
+"""
+Попередньо скомпільовані шаблони листів.
+
+``fastapi_mail`` створював нове середовище Jinja для кожного листа, тож
+кожен лист заново читав і компілював шаблон. ``EmailTemplates`` компілює
+всі шаблони з ``TEMPLATE_FOLDER`` один раз під час запуску застосунку і
+далі лише виконує скомпільований код:
+
+- середовище не перевіряє час зміни файлів (``auto_reload=False``), а
+  скомпільовані шаблони зберігаються без обмеження кількості;
+- шаблони без змінних (і без ``include``/``extends``) рендеряться під час
+  завантаження, і далі повертається готовий текст;
+- ``render_many`` рендерить пакет листів одного шаблону зі спільними
+  змінними кампанії, отримуючи шаблон один раз::
+
+    bodies = email_templates.render_many(
+        "verify_email.html",
+        ({"username": u.username, "token": t} for u, t in batch),
+        host=host,
+    )
+
+HTML-шаблони рендеряться з автоматичним екрануванням, тож ім'я користувача
+не може вставити розмітку в лист. Щоб підхопити змінені шаблони, викличте
+``load()`` повторно.
+"""
+
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from src.conf.config import settings
+
+
+class EmailTemplates:
+    """
+    Кеш скомпільованих шаблонів листів.
+
+    :param folder: Каталог шаблонів.
+    """
+
+    def __init__(self, folder: Path = settings.TEMPLATE_FOLDER):
+        self.folder = folder
+        self._env = None
+        self._templates = {}
+        self._static: dict[str, str] = {}
+
+    def load(self) -> int:
+        """
+        Компілює всі шаблони каталогу та рендерить шаблони без змінних.
+
+        ``jinja2`` імпортується лише тут, щоб не сповільнювати імпорт
+        застосунку.
+
+        :return: Кількість скомпільованих шаблонів.
+        """
+        from jinja2 import Environment, FileSystemLoader, meta, select_autoescape
+
+        env = Environment(
+            loader=FileSystemLoader(self.folder),
+            autoescape=select_autoescape(["html", "htm", "xml"]),
+            auto_reload=False,
+            cache_size=-1,
+        )
+        templates, static = {}, {}
+        for name in env.list_templates():
+            template = templates[name] = env.get_template(name)
+            ast = env.parse(env.loader.get_source(env, name)[0])
+            if not meta.find_undeclared_variables(ast) and not list(
+                meta.find_referenced_templates(ast)
+            ):
+                static[name] = template.render()
+        self._env, self._templates, self._static = env, templates, static
+        return len(templates)
+
+    def get(self, name: str):
+        """
+        Повертає скомпільований шаблон.
+
+        :param name: Ім'я файлу шаблону відносно каталогу.
+        :return: Об'єкт ``jinja2.Template``.
+        :raises jinja2.TemplateNotFound: Якщо шаблону немає.
+        """
+        if self._env is None:
+            self.load()
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self._env.get_template(name)
+        return template
+
+    def render(self, name: str, **context) -> str:
+        """
+        Рендерить шаблон.
+
+        :param name: Ім'я файлу шаблону.
+        :param context: Змінні шаблону.
+        :return: Текст листа.
+        """
+        static = self._static.get(name)
+        if static is not None:
+            return static
+        return self.get(name).render(context)
+
+    def render_many(
+        self, name: str, contexts: Iterable[dict], **common
+    ) -> Iterator[str]:
+        """
+        Рендерить шаблон для кожного отримувача пакета.
+
+        :param name: Ім'я файлу шаблону.
+        :param contexts: Змінні кожного листа.
+        :param common: Змінні, спільні для всіх листів пакета.
+        :return: Тексти листів у порядку ``contexts``.
+        """
+        static = self._static.get(name)
+        if static is not None:
+            return (static for _ in contexts)
+        render = self.get(name).render
+        if not common:
+            return (render(context) for context in contexts)
+        return (render({**common, **context}) for context in contexts)
+
+
+email_templates = EmailTemplates()
+"""Шаблони листів застосунку."""
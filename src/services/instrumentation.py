@@ -0,0 +1,300 @@
+"""
+Інструментування запитів до API.
+
+Для кожного HTTP-запиту збирає:
+- кількість SQL-запитів і сумарний час роботи з базою даних;
+- повторювані однакові SQL-запити (ознака проблеми N+1);
+- час роботи з кешем, автентифікації та серіалізації відповіді.
+
+Результати віддаються у заголовку ``Server-Timing`` та пишуться в debug-лог.
+У строгому режимі (``QUERY_BUDGET_STRICT``) перевищення бюджету запитів
+ендпоінту спричиняє виняток :class:`QueryBudgetExceeded`, що валить тест.
+"""
+
+import contextlib
+import contextvars
+import functools
+import inspect
+import logging
+import time
+from collections import Counter
+from typing import Callable, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.conf.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_metrics: contextvars.ContextVar[Optional["RequestMetrics"]] = (
+    contextvars.ContextVar("request_metrics", default=None)
+)
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Виникає у строгому режимі, коли ендпоінт виконав більше SQL-запитів,
+    ніж дозволяє його бюджет.
+    """
+
+
+class RequestMetrics:
+    """
+    Метрики одного запиту: SQL-запити, час БД та інші етапи обробки.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements: Counter[str] = Counter()
+        self.timings: dict[str, float] = {}
+        self.endpoint_finished: float | None = None
+
+    def record_query(self, statement: str, duration: float) -> None:
+        """
+        Реєструє виконаний SQL-запит.
+
+        :param statement: Текст SQL-запиту.
+        :param duration: Тривалість виконання у секундах.
+        """
+        self.queries += 1
+        self.db_time += duration
+        self.statements[statement] += 1
+
+    def add_timing(self, name: str, duration: float) -> None:
+        """
+        Додає тривалість етапу обробки запиту.
+
+        :param name: Назва етапу (``cache``, ``auth``, ``serialize``).
+        :param duration: Тривалість у секундах.
+        """
+        self.timings[name] = self.timings.get(name, 0.0) + duration
+
+    def repeated_statements(self, threshold: int | None = None) -> dict[str, int]:
+        """
+        Повертає SQL-запити, що виконувались щонайменше ``threshold`` разів.
+
+        :param threshold: Поріг повторів (за замовчуванням ``QUERY_REPEAT_THRESHOLD``).
+        :return: Словник ``запит -> кількість повторів``.
+        """
+        threshold = threshold or settings.QUERY_REPEAT_THRESHOLD
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= threshold
+        }
+
+    def server_timing(self) -> str:
+        """
+        Формує значення заголовка ``Server-Timing``.
+
+        :return: Рядок у форматі ``db;dur=1.2;desc="3 queries", cache;dur=0.4``.
+        """
+        parts = [f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"']
+        for name in ("cache", "auth", "serialize"):
+            if name in self.timings:
+                parts.append(f"{name};dur={self.timings[name] * 1000:.2f}")
+        return ", ".join(parts)
+
+
+def current_metrics() -> RequestMetrics | None:
+    """
+    Повертає метрики поточного запиту або None, якщо збір не ведеться.
+    """
+    return _current_metrics.get()
+
+
+@contextlib.contextmanager
+def track_queries():
+    """
+    Контекстний менеджер, що збирає метрики для блоку коду.
+
+    Використовується middleware та тестами::
+
+        with track_queries() as metrics:
+            await repository.get_contacts(0, 10, user)
+        assert metrics.queries == 1
+
+    :yield: Об'єкт :class:`RequestMetrics`.
+    """
+    metrics = RequestMetrics()
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+@contextlib.contextmanager
+def timed(name: str):
+    """
+    Вимірює тривалість блоку коду як етап ``name`` поточного запиту.
+
+    Якщо метрики не збираються, нічого не робить.
+
+    :param name: Назва етапу.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_timing(name, time.perf_counter() - start)
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Декоратор, що задає бюджет SQL-запитів для ендпоінту.
+
+    :param max_queries: Максимальна кількість запитів на один виклик.
+    :return: Декоратор, що повертає ту саму функцію з позначкою бюджету.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        func.__query_budget__ = max_queries
+        return func
+
+    return decorator
+
+
+# Час початку зберігається в контексті виконання, а не в ``conn.info``:
+# для запиту, що завершився помилкою, ``after_cursor_execute`` не
+# викликається, і значення зникає разом із контекстом.
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = context._query_start_time
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.record_query(statement, time.perf_counter() - start)
+
+
+def install_query_listeners(engine: AsyncEngine) -> None:
+    """
+    Підключає обробники подій SQLAlchemy для підрахунку запитів.
+
+    :param engine: Асинхронний рушій бази даних.
+    """
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    Маршрут, що вимірює час серіалізації відповіді.
+
+    Час серіалізації — проміжок між поверненням значення з ендпоінту та
+    готовністю об'єкта відповіді.
+    """
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if call is not None and not getattr(call, "__instrumented__", False):
+            self.dependant.call = _mark_endpoint_finished(call)
+        handler = super().get_route_handler()
+
+        async def instrumented_handler(request):
+            response = await handler(request)
+            metrics = _current_metrics.get()
+            if metrics is not None and metrics.endpoint_finished is not None:
+                metrics.add_timing(
+                    "serialize", time.perf_counter() - metrics.endpoint_finished
+                )
+            return response
+
+        return instrumented_handler
+
+
+def _mark_endpoint_finished(call: Callable) -> Callable:
+    if not inspect.iscoroutinefunction(call):
+        return call
+
+    @functools.wraps(call)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await call(*args, **kwargs)
+        finally:
+            metrics = _current_metrics.get()
+            if metrics is not None:
+                metrics.endpoint_finished = time.perf_counter()
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware, що збирає метрики кожного HTTP-запиту.
+
+    Додає заголовок ``Server-Timing``, пише підсумок у debug-лог,
+    попереджає про повторювані запити та перевищення бюджету.
+
+    :param app: ASGI-застосунок.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as metrics:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append(
+                        (b"server-timing", metrics.server_timing().encode("latin-1"))
+                    )
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        self._report(scope, metrics)
+
+    @staticmethod
+    def _report(scope, metrics: RequestMetrics) -> None:
+        path = scope.get("path")
+        logger.debug(
+            "%s %s: %d queries, db=%.2fms, %s",
+            scope.get("method"),
+            path,
+            metrics.queries,
+            metrics.db_time * 1000,
+            metrics.timings,
+        )
+
+        repeated = metrics.repeated_statements()
+        for statement, count in repeated.items():
+            logger.warning(
+                "Possible N+1 on %s: statement executed %d times: %s",
+                path,
+                count,
+                statement,
+            )
+
+        endpoint = scope.get("endpoint")
+        budget = getattr(endpoint, "__query_budget__", settings.QUERY_BUDGET_DEFAULT)
+        if metrics.queries > budget:
+            message = (
+                f"{scope.get('method')} {path} executed {metrics.queries} queries, "
+                f"budget is {budget}"
+            )
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
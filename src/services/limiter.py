@@ -1,26 +1,272 @@
-from fastapi import APIRouter, Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from src.schemas.users import User
+"""
+Розподілене обмеження частоти запитів.
 
-# Ініціалізація маршрутизатора для користувачів
-router = APIRouter(prefix="/users", tags=["users"])
+Ліміти зберігаються в Redis і спільні для всіх воркерів і хостів. Кожен ліміт —
+це «відро токенів»: ``N/період`` означає ємність ``N`` токенів, що
+поповнюються рівномірно за ``період``. Перевірка й списання токена виконуються
+одним Lua-скриптом, тож паралельні запити не можуть витратити більше, ніж є у
+відрі. Час береться з годинника Redis, а не воркера.
 
-# Обмежувач запитів (Rate Limiting)
-limiter = Limiter(key_func=get_remote_address)
+Ліміт підключається до маршруту як залежність::
 
+    @router.get("/me", dependencies=[Depends(limiter.limit("10/minute", per="user"))])
 
-@router.get("/me", response_model=User)
-@limiter.limit("5/minute")
-async def my_endpoint(request: Request):
+``per="ip"`` рахує запити з однієї IP-адреси, ``per="user"`` — одного
+користувача за полем ``sub`` JWT (без токена — за IP-адресою). Кілька
+залежностей на одному маршруті складаються. Ліміт маршруту можна змінити
+без зміни коду через ``RATE_LIMITS``: ключ — шаблон шляху маршруту
+(``/api/users/me``) або явне ім'я ліміту.
+
+Кожна відповідь обмеженого маршруту має заголовки ``RateLimit-Limit``,
+``RateLimit-Remaining``, ``RateLimit-Reset`` і ``RateLimit-Policy`` для
+найбільш вичерпаного з лімітів; відповідь 429 додатково має ``Retry-After``.
+Якщо Redis недоступний, запити пропускаються.
+"""
+
+import functools
+import logging
+import math
+from dataclasses import dataclass
+
+from fastapi import Request, Response, status
+from fastapi.responses import ORJSONResponse
+from jose import JWTError, jwt
+from redis.exceptions import RedisError
+
+from src.conf import messages
+from src.conf.config import settings
+from src.services.instrumentation import timed
+from src.services.metrics import RATE_LIMIT_REJECTIONS, route_label
+from src.services.redis_cache import redis_cache
+
+logger = logging.getLogger(__name__)
+
+TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call("time")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local bucket = redis.call("hmget", KEYS[1], "tokens", "ts")
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * capacity / period)
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = math.ceil((cost - tokens) * period / capacity)
+end
+redis.call("hset", KEYS[1], "tokens", tostring(tokens), "ts", now)
+redis.call("pexpire", KEYS[1], period)
+local reset = math.ceil((capacity - tokens) * period / capacity)
+return {allowed, math.floor(tokens), wait, reset}
+"""
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@functools.lru_cache(maxsize=None)
+def parse_rate(rate: str) -> tuple[int, int]:
+    """
+    Розбирає ліміт виду ``10/minute`` або ``100/5 minutes``.
+
+    :param rate: Ліміт.
+    :return: ``(кількість запитів, період у секундах)``.
+    :raises ValueError: Якщо ліміт має неправильний формат.
+    """
+    try:
+        amount, period = rate.split("/")
+        count, _, unit = period.strip().rpartition(" ")
+        seconds = PERIODS[unit.rstrip("s")] * int(count or 1)
+        amount = int(amount)
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"Invalid rate limit: {rate!r}") from e
+    if amount <= 0 or seconds <= 0:
+        raise ValueError(f"Invalid rate limit: {rate!r}")
+    return amount, seconds
+
+
+def client_ip(request: Request) -> str:
     """
-    Отримання інформації про поточного користувача.
+    Повертає IP-адресу клієнта.
+
+    За проксі адресу має підставляти сервер (``uvicorn --proxy-headers``).
 
     :param request: Запит FastAPI.
-    :type request: Request
+    :return: IP-адреса або ``unknown``.
+    """
+    return request.client.host if request.client else "unknown"
+
 
-    :return: JSON-відповідь із повідомленням.
-    :rtype: dict
-    :raise HTTPException: У разі перевищення ліміту запитів.
+def token_subject(request: Request) -> str | None:
+    """
+    Повертає поле ``sub`` JWT із заголовка ``Authorization`` без звернення до бази даних.
+
+    :param request: Запит FastAPI.
+    :return: Ім'я користувача або None, якщо токена немає чи він недійсний.
     """
-    return {"message": "It is my route"}
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(
+            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
+        )
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+
+@dataclass
+class RateLimitState:
+    """
+    Стан відра після списання токена.
+
+    :param allowed: Чи дозволено запит.
+    :param limit: Ємність відра.
+    :param remaining: Кількість токенів, що залишилися.
+    :param reset: Секунд до повного поповнення відра.
+    :param retry_after: Секунд до появи токена (для відхиленого запиту).
+    :param period: Період ліміту в секундах.
+    """
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int
+    retry_after: int
+    period: int
+
+    def headers(self) -> dict[str, str]:
+        """
+        Заголовки ``RateLimit-*`` для відповіді.
+        """
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(self.reset),
+            "RateLimit-Policy": f"{self.limit};w={self.period}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+class RateLimitExceeded(Exception):
+    """
+    Запит перевищив ліміт.
+
+    :param state: Стан відра, що відхилило запит.
+    """
+
+    def __init__(self, state: RateLimitState):
+        super().__init__(f"Rate limit {state.limit}/{state.period}s exceeded")
+        self.state = state
+
+
+async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
+    """
+    Обробник :class:`RateLimitExceeded`: відповідь 429 із заголовками ліміту.
+    """
+    RATE_LIMIT_REJECTIONS.labels(route_label(request.scope)).inc()
+    return ORJSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"error": messages.RATE_LIMIT_EXCEEDED},
+        headers=exc.state.headers(),
+    )
+
+
+class RateLimiter:
+    """
+    Обмежувач запитів на відрах токенів у Redis.
+
+    :param prefix: Префікс ключів Redis.
+    :param overrides: Ліміти, що замінюють задані в коді (ім'я -> ліміт).
+    """
+
+    def __init__(
+        self,
+        prefix: str = "ratelimit",
+        overrides: dict[str, str] | None = None,
+    ):
+        self.prefix = prefix
+        self.overrides = settings.RATE_LIMITS if overrides is None else overrides
+        self.enabled = settings.RATE_LIMIT_ENABLED
+
+    async def hit(self, key: str, rate: str, cost: int = 1) -> RateLimitState | None:
+        """
+        Списує токени з відра.
+
+        :param key: Ідентифікатор відра (без префікса).
+        :param rate: Ліміт виду ``10/minute``.
+        :param cost: Кількість токенів.
+        :return: Стан відра або None, якщо Redis недоступний.
+        """
+        if redis_cache.redis is None:
+            return None
+        amount, period = parse_rate(rate)
+        try:
+            with timed("cache"):
+                allowed, remaining, wait, reset = await redis_cache.redis.eval(
+                    TOKEN_BUCKET,
+                    1,
+                    f"{self.prefix}:{key}",
+                    amount,
+                    period * 1000,
+                    cost,
+                )
+        except RedisError as e:
+            logger.warning("Rate limiter is unavailable, request allowed: %s", e)
+            return None
+        return RateLimitState(
+            allowed=bool(allowed),
+            limit=amount,
+            remaining=int(remaining),
+            reset=math.ceil(int(reset) / 1000),
+            retry_after=max(1, math.ceil(int(wait) / 1000)),
+            period=period,
+        )
+
+    def limit(self, rate: str, per: str = "ip", name: str | None = None):
+        """
+        Створює залежність FastAPI, що обмежує запити до маршруту.
+
+        :param rate: Ліміт виду ``10/minute``.
+        :param per: ``ip`` або ``user``.
+        :param name: Ім'я ліміту для ключа й ``RATE_LIMITS``; за замовчуванням —
+            шаблон шляху маршруту.
+        :return: Залежність.
+        :raises ValueError: Якщо ліміт або ``per`` неправильні.
+        """
+        parse_rate(rate)
+        if per not in ("ip", "user"):
+            raise ValueError(f"Unknown rate limit scope: {per!r}")
+
+        async def dependency(request: Request, response: Response):
+            if not self.enabled:
+                return
+            route = request.scope.get("route")
+            limit_name = name or getattr(route, "path", request.url.path)
+            subject = token_subject(request) if per == "user" else None
+            identity = f"user:{subject}" if subject else f"ip:{client_ip(request)}"
+            state = await self.hit(
+                f"{limit_name}:{identity}", self.overrides.get(limit_name, rate)
+            )
+            if state is None:
+                return
+            if not state.allowed:
+                raise RateLimitExceeded(state)
+            # Заголовки описують ліміт, який вичерпається першим.
+            current = getattr(request.state, "rate_limit", None)
+            if current is None or state.remaining < current.remaining:
+                request.state.rate_limit = state
+                response.headers.update(state.headers())
+
+        return dependency
+
+
+limiter = RateLimiter()
+"""Спільний обмежувач запитів застосунку."""
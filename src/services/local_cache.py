@@ -0,0 +1,86 @@
+"""
+Локальний (у пам'яті воркера) рівень кешу перед Redis.
+
+``LocalCache`` — обмежений за кількістю записів LRU із TTL. Він зберігає ті
+самі байти, що й Redis, тож кожне читання повертає новий об'єкт і обробник не
+може випадково змінити закешоване значення.
+
+Узгодженість між воркерами й хостами забезпечує канал Redis pub/sub
+``CACHE_INVALIDATION_CHANNEL``: кожен запис чи видалення ключа в
+``RedisCache`` публікує список змінених ключів, і всі інші воркери видаляють
+їх зі своїх локальних кешів. TTL локального рівня обмежує час, протягом
+якого значення може бути застарілим, якщо повідомлення загубилося.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+from src.conf.config import settings
+
+
+class LocalCache:
+    """
+    LRU-кеш із TTL.
+
+    :param max_entries: Максимальна кількість записів.
+    :param ttl: Час життя запису в секундах.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.CACHE_LOCAL_MAX_ENTRIES,
+        ttl: float = settings.CACHE_LOCAL_TTL,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Повертає запис і позначає його як нещодавно використаний.
+
+        :param key: Ключ.
+        :return: Байти запису або None, якщо його немає чи він прострочений.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return data
+
+    def set(self, key: str, data: bytes, ttl: float | None = None) -> None:
+        """
+        Зберігає запис, витісняючи найдавніше використані понад ліміт.
+
+        :param key: Ключ.
+        :param data: Байти запису.
+        :param ttl: Час життя; не довший за TTL локального рівня.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + ttl, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        """
+        Видаляє записи.
+
+        :param keys: Ключі.
+        """
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Видаляє всі записи.
+        """
+        self._entries.clear()
@@ -0,0 +1,157 @@
+"""
+Попередній захист ``/auth/login`` від підбору паролів.
+
+Кожна спроба входу коштує запит до бази даних і перевірку bcrypt — найдорожчу
+операцію застосунку за процесорним часом. ``LoginThrottle`` відсіює зайві
+спроби до будь-якого SQL чи хешування:
+
+- спроби з однієї IP-адреси обмежені відром токенів ``LOGIN_RATE_PER_IP``
+  (той самий Lua-скрипт, що й у :mod:`src.services.limiter`);
+- невдалі спроби для кожного імені користувача рахуються протягом
+  ``LOGIN_FAILURE_WINDOW`` секунд. Починаючи з ``LOGIN_DELAY_AFTER``-ї
+  невдачі наступна спроба дозволена лише після затримки, що подвоюється з
+  кожною невдачею (від ``LOGIN_DELAY_BASE`` до ``LOGIN_DELAY_MAX`` секунд);
+  після ``LOGIN_LOCKOUT_THRESHOLD`` невдач ім'я блокується на
+  ``LOGIN_LOCKOUT_SECONDS`` секунд.
+
+Затримка не витримується на сервері: поки вона діє, спроби відхиляються
+відповіддю 429 із ``Retry-After``, тож атака не тримає ні з'єднань, ні
+потоків. Лічильники та блокування живуть у Redis і спільні для всіх
+воркерів. Неіснуючі імена обробляються так само, як існуючі, тому
+блокування не розкриває, які облікові записи є. Без Redis або під час його
+збою перевірки пропускаються.
+"""
+
+import logging
+import math
+
+from fastapi import HTTPException, status
+from redis.exceptions import RedisError
+
+from src.conf import messages
+from src.conf.config import settings
+from src.services.instrumentation import timed
+from src.services.limiter import limiter
+from src.services.metrics import CACHE_LATENCY, LOGIN_THROTTLED
+from src.services.redis_cache import redis_cache
+
+logger = logging.getLogger(__name__)
+
+REGISTER_FAILURE = """
+local count = redis.call("incr", KEYS[1])
+if count == 1 then
+    redis.call("expire", KEYS[1], ARGV[1])
+end
+local delay_after = tonumber(ARGV[2])
+local block = 0
+if count >= tonumber(ARGV[5]) then
+    block = tonumber(ARGV[6])
+elseif count >= delay_after then
+    block = math.min(tonumber(ARGV[3]) * 2 ^ (count - delay_after), tonumber(ARGV[4]))
+end
+if block > 0 then
+    redis.call("set", KEYS[2], count, "px", math.floor(block))
+end
+return {count, math.floor(block)}
+"""
+
+
+class LoginThrottle:
+    """
+    Обмеження спроб входу за IP-адресою та іменем користувача.
+
+    :param prefix: Префікс ключів Redis.
+    """
+
+    def __init__(self, prefix: str = "login"):
+        self.prefix = prefix
+        self.enabled = settings.LOGIN_THROTTLE_ENABLED
+
+    def _active(self) -> bool:
+        return self.enabled and redis_cache.redis is not None
+
+    def _keys(self, username: str) -> tuple[str, str]:
+        # Ім'я обрізається, щоб довгі рядки від клієнта не роздували ключі.
+        name = username.strip().lower()[:128]
+        return f"{self.prefix}:failures:{name}", f"{self.prefix}:blocked:{name}"
+
+    @staticmethod
+    def _reject(reason: str, retry_after: float) -> HTTPException:
+        LOGIN_THROTTLED.labels(reason).inc()
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=messages.LOGIN_THROTTLED,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    async def check(self, username: str, ip: str) -> None:
+        """
+        Перевіряє, чи можна зараз перевіряти пароль.
+
+        :param username: Ім'я користувача з форми входу.
+        :param ip: IP-адреса клієнта.
+        :raises HTTPException: 429, якщо ім'я заблоковане чи з IP-адреси
+            забагато спроб.
+        """
+        if not self._active():
+            return
+        _, blocked = self._keys(username)
+        try:
+            with timed("cache"), CACHE_LATENCY.labels("login_check").time():
+                blocked_ms = await redis_cache.redis.pttl(blocked)
+        except RedisError as e:
+            logger.warning("Login throttle is unavailable, attempt allowed: %s", e)
+            blocked_ms = 0
+        if blocked_ms > 0:
+            raise self._reject("username", blocked_ms / 1000)
+        state = await limiter.hit(f"login:ip:{ip}", settings.LOGIN_RATE_PER_IP)
+        if state is not None and not state.allowed:
+            raise self._reject("ip", state.retry_after)
+
+    async def failure(self, username: str) -> int:
+        """
+        Реєструє невдалу спробу і, за потреби, блокує ім'я.
+
+        :param username: Ім'я користувача з форми входу.
+        :return: Кількість невдач у поточному вікні (0, якщо вимкнено чи
+            Redis недоступний).
+        """
+        if not self._active():
+            return 0
+        failures, blocked = self._keys(username)
+        try:
+            with timed("cache"), CACHE_LATENCY.labels("login_failure").time():
+                count, _ = await redis_cache.redis.eval(
+                    REGISTER_FAILURE,
+                    2,
+                    failures,
+                    blocked,
+                    settings.LOGIN_FAILURE_WINDOW,
+                    settings.LOGIN_DELAY_AFTER,
+                    int(settings.LOGIN_DELAY_BASE * 1000),
+                    int(settings.LOGIN_DELAY_MAX * 1000),
+                    settings.LOGIN_LOCKOUT_THRESHOLD,
+                    settings.LOGIN_LOCKOUT_SECONDS * 1000,
+                )
+        except RedisError as e:
+            logger.warning("Login failure was not recorded: %s", e)
+            return 0
+        return int(count)
+
+    async def success(self, username: str) -> None:
+        """
+        Скидає лічильник невдач після успішного входу.
+
+        :param username: Ім'я користувача.
+        """
+        if not self._active():
+            return
+        try:
+            with timed("cache"), CACHE_LATENCY.labels("login_success").time():
+                await redis_cache.redis.delete(*self._keys(username))
+        except RedisError as e:
+            logger.warning("Login failures were not reset: %s", e)
+
+
+login_throttle = LoginThrottle()
+"""Спільний обмежувач спроб входу."""
@@ -0,0 +1,139 @@
+"""
+Сторожовий механізм блокування циклу подій.
+
+Асинхронний обробник, що виконує синхронну роботу (bcrypt, мережеві виклики
+SDK, файловий ввід-вивід), блокує цикл подій для всіх інших запитів.
+``LoopWatchdog`` виявляє такі випадки:
+
+- задача-пульс на циклі подій кожні ``LOOP_WATCHDOG_INTERVAL_MS`` вимірює,
+  наскільки пізно вона прокинулась (метрика ``event_loop_lag_seconds``);
+- фоновий потік помічає, що пульс не оновлювався довше за
+  ``LOOP_BLOCK_THRESHOLD_MS``, і знімає стек потоку циклу подій — саме той код,
+  що зараз утримує цикл. Стек пишеться в журнал, а лічильник
+  ``event_loop_blocks_total`` збільшується.
+
+У тестах ``assert_no_blocking`` перевіряє, що код не блокує цикл подій.
+"""
+
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+from src.conf.config import settings
+from src.services.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+
+class LoopWatchdog:
+    """
+    Вимірює затримку циклу подій і знімає стек коду, що його заблокував.
+
+    :param threshold_ms: Тривалість блокування, після якої знімається стек.
+    :param interval_ms: Інтервал пульсу в мілісекундах.
+    :param size: Кількість останніх блокувань, що зберігаються.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = settings.LOOP_BLOCK_THRESHOLD_MS,
+        interval_ms: float = settings.LOOP_WATCHDOG_INTERVAL_MS,
+        size: int = 50,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.blocks: deque[dict] = deque(maxlen=size)
+        self._last_beat = time.monotonic()
+        self._reported_beat: float | None = None
+        self._loop_thread: int | None = None
+        self._heartbeat: asyncio.Task | None = None
+        self._monitor: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """
+        Запускає пульс на поточному циклі подій і потік спостереження.
+        """
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat = asyncio.create_task(self._beat())
+        self._monitor = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._monitor.start()
+
+    async def stop(self) -> None:
+        """
+        Зупиняє пульс і потік спостереження.
+        """
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._heartbeat
+            self._heartbeat = None
+        if self._monitor is not None:
+            self._monitor.join()
+            self._monitor = None
+
+    async def _beat(self) -> None:
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = time.monotonic() - self._last_beat - self.interval
+            EVENT_LOOP_LAG.observe(max(lag, 0))
+
+    def _watch(self) -> None:
+        while not self._stop.wait(min(self.interval, self.threshold) / 2):
+            beat = self._last_beat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled < self.threshold or beat == self._reported_beat:
+                continue
+            self._reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            self.blocks.append({"blocked_ms": round(stalled * 1000, 1), "stack": stack})
+            EVENT_LOOP_BLOCKS.inc()
+            logger.warning(
+                "Event loop blocked for more than %.0f ms:\n%s",
+                stalled * 1000,
+                stack,
+            )
+
+
+loop_watchdog = LoopWatchdog()
+
+
+@contextlib.asynccontextmanager
+async def assert_no_blocking(threshold_ms: float = 50):
+    """
+    Перевіряє, що код усередині блоку не блокує цикл подій.
+
+    Приклад::
+
+        async with assert_no_blocking(threshold_ms=20):
+            await client.post("/api/auth/login", data=credentials)
+
+    :param threshold_ms: Допустима тривалість блокування.
+    :raises AssertionError: Якщо цикл подій був заблокований, зі стеком
+        коду, що його утримував.
+    """
+    watchdog = LoopWatchdog(threshold_ms=threshold_ms, interval_ms=threshold_ms / 5)
+    watchdog.start()
+    try:
+        yield watchdog
+        await asyncio.sleep(watchdog.interval)
+    finally:
+        await watchdog.stop()
+    if watchdog.blocks:
+        block = watchdog.blocks[0]
+        raise AssertionError(
+            f"Event loop blocked for {block['blocked_ms']} ms "
+            f"(threshold {threshold_ms} ms):\n{block['stack']}"
+        )
@@ -0,0 +1,354 @@
+"""
+Відправлення листів через пул постійних SMTP-з'єднань.
+
+Раніше кожен лист відкривав нове з'єднання з поштовим сервером: TCP,
+TLS-рукостискання та автентифікація коштували більше, ніж саме відправлення.
+``MailDelivery`` тримає ``MAIL_POOL_SIZE`` автентифікованих з'єднань, кожне
+з яких обслуговує окрема задача. Задачі беруть листи зі спільної черги
+``asyncio.Queue`` пакетами до ``MAIL_BATCH_SIZE`` і відправляють їх підряд
+тим самим з'єднанням::
+
+    await mailer.send(message, kind="verify")
+
+- З'єднання відкривається під час першого листа й повторно
+  використовується; якщо воно простоювало довше ``MAIL_IDLE_TIMEOUT``
+  секунд, перед відправленням перевіряється командою ``NOOP``.
+- Тимчасові помилки (розірване з'єднання, тайм-аут, відповіді ``4xx``)
+  повторюються до ``MAIL_RETRY_ATTEMPTS`` разів із затримкою, що
+  подвоюється від ``MAIL_RETRY_BACKOFF`` секунд; постійні (``5xx``,
+  відхилені адресати) одразу повертаються викликачу.
+- Під час зупинки застосунку черга дочікується до ``MAIL_DRAIN_TIMEOUT``
+  секунд.
+
+Кількість відправлених листів, повторів, розмір пакетів і довжина черги
+експортуються в Prometheus, а ``stats()`` показує пропускну здатність
+процесу за останню хвилину. Листи застосунку відправляє окремий процес
+черги листів (:mod:`src.services.outbox`).
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from email.message import EmailMessage
+
+from src.conf.config import settings
+from src.services.metrics import (
+    EMAIL_BATCH_SIZE,
+    EMAIL_CONNECTIONS_OPENED,
+    EMAIL_QUEUE_DEPTH,
+    EMAIL_RETRIES,
+    EMAIL_SEND_FAILURES,
+    EMAIL_SEND_LATENCY,
+    EMAIL_SENT,
+)
+
+logger = logging.getLogger(__name__)
+
+THROUGHPUT_WINDOW = 60
+"""Вікно, за яке рахується пропускна здатність, у секундах."""
+
+
+def smtp_client():
+    """
+    Створює не підключений SMTP-клієнт із налаштувань застосунку.
+
+    ``aiosmtplib`` імпортується лише під час першого відправлення листа,
+    щоб не сповільнювати запуск застосунку.
+
+    :return: Об'єкт ``aiosmtplib.SMTP``.
+    """
+    from aiosmtplib import SMTP
+
+    credentials = {}
+    if settings.USE_CREDENTIALS:
+        credentials = {
+            "username": settings.MAIL_USERNAME,
+            "password": settings.MAIL_PASSWORD,
+        }
+    return SMTP(
+        hostname=settings.MAIL_SERVER,
+        port=settings.MAIL_PORT,
+        use_tls=settings.MAIL_SSL_TLS,
+        start_tls=settings.MAIL_STARTTLS,
+        validate_certs=settings.VALIDATE_CERTS,
+        timeout=settings.MAIL_TIMEOUT,
+        **credentials,
+    )
+
+
+def is_permanent(error: Exception) -> bool:
+    """
+    Визначає, чи має сенс повторювати відправлення після помилки.
+
+    :param error: Виняток, що виник під час відправлення.
+    :return: True для відповідей ``5xx`` і відхилених адресатів.
+    """
+    from aiosmtplib import SMTPRecipientsRefused, SMTPResponseException
+
+    if isinstance(error, SMTPRecipientsRefused):
+        return True
+    return isinstance(error, SMTPResponseException) and error.code >= 500
+
+
+@dataclass
+class MailJob:
+    """
+    Лист у черзі відправлення.
+
+    :param message: Лист.
+    :param kind: Тип листа (для метрик).
+    :param future: Результат відправлення або None, якщо його ніхто не чекає.
+    :param attempts: Кількість виконаних спроб.
+    """
+
+    message: EmailMessage
+    kind: str
+    future: asyncio.Future | None = None
+    attempts: int = 0
+
+    def resolve(self, error: Exception | None = None) -> None:
+        if self.future is None or self.future.done():
+            return
+        if error is None:
+            self.future.set_result(None)
+        else:
+            self.future.set_exception(error)
+
+
+class MailDelivery:
+    """
+    Черга листів, що обслуговується пулом постійних SMTP-з'єднань.
+
+    :param client_factory: Функція, що створює не підключений SMTP-клієнт.
+    :param pool_size: Кількість з'єднань.
+    :param batch_size: Максимальна кількість листів, що відправляються одним
+        з'єднанням підряд.
+    :param queue_size: Максимальна довжина черги.
+    :param retry_attempts: Кількість спроб відправлення листа.
+    :param retry_backoff: Початкова затримка між спробами в секундах.
+    :param idle_timeout: Простій з'єднання в секундах, після якого воно
+        перевіряється перед відправленням.
+    :param drain_timeout: Скільки секунд чекати на спорожнення черги під час
+        зупинки.
+    """
+
+    def __init__(
+        self,
+        client_factory=smtp_client,
+        pool_size: int = settings.MAIL_POOL_SIZE,
+        batch_size: int = settings.MAIL_BATCH_SIZE,
+        queue_size: int = settings.MAIL_QUEUE_SIZE,
+        retry_attempts: int = settings.MAIL_RETRY_ATTEMPTS,
+        retry_backoff: float = settings.MAIL_RETRY_BACKOFF,
+        idle_timeout: float = settings.MAIL_IDLE_TIMEOUT,
+        drain_timeout: float = settings.MAIL_DRAIN_TIMEOUT,
+    ):
+        self.client_factory = client_factory
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.retry_attempts = retry_attempts
+        self.retry_backoff = retry_backoff
+        self.idle_timeout = idle_timeout
+        self.drain_timeout = drain_timeout
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.connections_opened = 0
+        self._queue: asyncio.Queue[MailJob] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._clients: list = []
+        self._last_used: list[float] = []
+        self._loop = None
+        self._sent_at: deque[float] = deque()
+
+    def start(self) -> None:
+        """
+        Запускає задачі пулу в поточному циклі подій.
+
+        З'єднання відкриваються лише під час першого листа.
+        """
+        loop = asyncio.get_running_loop()
+        if self._workers and self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(self.queue_size)
+        self._clients = [None] * self.pool_size
+        self._last_used = [0.0] * self.pool_size
+        self._workers = [
+            asyncio.create_task(self._worker(index), name=f"mailer-{index}")
+            for index in range(self.pool_size)
+        ]
+
+    async def stop(self) -> None:
+        """
+        Дочікується відправлення листів із черги та закриває з'єднання.
+        """
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Mail queue was not drained, %d emails dropped", self._queue.qsize()
+            )
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while not self._queue.empty():
+            self._queue.get_nowait().resolve(RuntimeError("Mail delivery stopped"))
+        EMAIL_QUEUE_DEPTH.set(0)
+        for index in range(self.pool_size):
+            await self._disconnect(index, quit=True)
+
+    def enqueue(self, message: EmailMessage, kind: str = "email") -> asyncio.Future:
+        """
+        Ставить лист у чергу, не чекаючи на відправлення.
+
+        :param message: Лист.
+        :param kind: Тип листа (для метрик).
+        :return: Future, що завершується після відправлення або останньої
+            невдалої спроби.
+        :raises asyncio.QueueFull: Якщо черга заповнена.
+        """
+        self.start()
+        job = MailJob(message, kind, self._loop.create_future())
+        self._queue.put_nowait(job)
+        EMAIL_QUEUE_DEPTH.set(self._queue.qsize())
+        return job.future
+
+    async def send(self, message: EmailMessage, kind: str = "email") -> None:
+        """
+        Відправляє лист через пул і чекає на результат.
+
+        Якщо черга заповнена, чекає, доки в ній звільниться місце.
+
+        :param message: Лист.
+        :param kind: Тип листа (для метрик).
+        :raises aiosmtplib.SMTPException: Якщо лист не вдалося відправити.
+        :raises OSError: Якщо поштовий сервер недоступний після всіх спроб.
+        """
+        self.start()
+        job = MailJob(message, kind, self._loop.create_future())
+        await self._queue.put(job)
+        EMAIL_QUEUE_DEPTH.set(self._queue.qsize())
+        await job.future
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            EMAIL_QUEUE_DEPTH.set(self._queue.qsize())
+            EMAIL_BATCH_SIZE.observe(len(batch))
+            for job in batch:
+                try:
+                    await self._deliver(index, job)
+                except Exception as e:
+                    logger.exception("Unexpected mail delivery error: %s", e)
+                    job.resolve(e)
+                finally:
+                    self._queue.task_done()
+
+    async def _deliver(self, index: int, job: MailJob) -> None:
+        from aiosmtplib import SMTPException
+
+        while True:
+            job.attempts += 1
+            try:
+                client = await self._connection(index)
+                with EMAIL_SEND_LATENCY.labels(job.kind).time():
+                    await client.send_message(job.message)
+            except (SMTPException, OSError, asyncio.TimeoutError) as e:
+                error, permanent = e, is_permanent(e)
+            else:
+                self._last_used[index] = time.monotonic()
+                self._record_sent(job.kind)
+                job.resolve()
+                return
+
+            if not permanent:
+                await self._disconnect(index)
+            if permanent or job.attempts >= self.retry_attempts:
+                self.failed += 1
+                EMAIL_SEND_FAILURES.labels(job.kind).inc()
+                logger.warning(
+                    "Email %s was not sent after %d attempts: %s",
+                    job.kind,
+                    job.attempts,
+                    error,
+                )
+                job.resolve(error)
+                return
+            self.retried += 1
+            EMAIL_RETRIES.labels(job.kind).inc()
+            await asyncio.sleep(self.retry_backoff * 2 ** (job.attempts - 1))
+
+    async def _connection(self, index: int):
+        from aiosmtplib import SMTPException
+
+        client = self._clients[index]
+        if client is not None and client.is_connected:
+            if time.monotonic() - self._last_used[index] < self.idle_timeout:
+                return client
+            try:
+                await client.noop()
+                return client
+            except (SMTPException, OSError):
+                await self._disconnect(index)
+
+        client = self.client_factory()
+        await client.connect()
+        self._clients[index] = client
+        self._last_used[index] = time.monotonic()
+        self.connections_opened += 1
+        EMAIL_CONNECTIONS_OPENED.inc()
+        return client
+
+    async def _disconnect(self, index: int, quit: bool = False) -> None:
+        client = self._clients[index] if index < len(self._clients) else None
+        if client is None:
+            return
+        self._clients[index] = None
+        if quit and client.is_connected:
+            try:
+                await client.quit()
+                return
+            except Exception:
+                pass
+        client.close()
+
+    def _record_sent(self, kind: str) -> None:
+        self.sent += 1
+        EMAIL_SENT.labels(kind).inc()
+        now = time.monotonic()
+        self._sent_at.append(now)
+        while self._sent_at and now - self._sent_at[0] > THROUGHPUT_WINDOW:
+            self._sent_at.popleft()
+
+    def stats(self) -> dict:
+        """
+        Стан пулу та пропускна здатність воркера.
+        """
+        now = time.monotonic()
+        while self._sent_at and now - self._sent_at[0] > THROUGHPUT_WINDOW:
+            self._sent_at.popleft()
+        return {
+            "pool_size": self.pool_size,
+            "connected": sum(
+                1 for client in self._clients if client and client.is_connected
+            ),
+            "connections_opened": self.connections_opened,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "messages_per_second": round(len(self._sent_at) / THROUGHPUT_WINDOW, 2),
+        }
+
+
+mailer = MailDelivery()
+"""Спільний пул відправлення листів воркера."""
@@ -0,0 +1,325 @@
+"""
+Діагностика пам'яті на основі ``tracemalloc``.
+
+Відстеження виділень вмикається адміністратором на час діагностики (або
+``MEMORY_TRACING_ENABLED`` під час запуску), бо ``tracemalloc`` сповільнює
+кожне виділення пам'яті. Коли відстеження ввімкнене, доступні:
+
+- знімки пам'яті та різниця між ними;
+- найбільші місця виділення, згруповані за модулями (``src.repository``,
+  ``src.api``, SQLAlchemy, pydantic тощо);
+- пікове виділення пам'яті під час обробки запитів для кожного маршруту
+  (``MemorySamplingMiddleware``).
+
+Коли відстеження вимкнене, проміжний шар лише перевіряє
+``tracemalloc.is_tracing()``.
+"""
+
+import itertools
+import os
+import random
+import threading
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime, UTC
+
+from src.conf.config import settings
+from src.services.metrics import REQUEST_PEAK_MEMORY, route_label
+
+MODULE_GROUPS = [
+    "src.repository",
+    "src.api",
+    "src.services",
+    "src.database",
+    "src.schemas",
+    "src",
+    "sqlalchemy",
+    "pydantic",
+    "pydantic_core",
+    "fastapi",
+    "starlette",
+    "asyncio",
+    "json",
+]
+"""Групи модулів, від більш специфічних до загальніших."""
+
+_group_markers = [
+    (group, f"{os.sep}{group.replace('.', os.sep)}{os.sep}") for group in MODULE_GROUPS
+]
+_trace_filters = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def module_group(filename: str) -> str:
+    """
+    Визначає групу модуля для файлу.
+
+    :param filename: Шлях до файлу з трасування виділення.
+    :return: Назва групи з ``MODULE_GROUPS`` або ``other``.
+    """
+    for group, marker in _group_markers:
+        if marker in filename:
+            return group
+    return "other"
+
+
+def group_statistics(statistics: list, limit: int) -> list[dict]:
+    """
+    Підсумовує статистику ``tracemalloc`` за групами модулів.
+
+    :param statistics: Результат ``Snapshot.statistics`` або ``compare_to``
+        з групуванням ``lineno``.
+    :param limit: Кількість груп у відповіді.
+    :return: Групи, впорядковані за розміром (або зміною розміру).
+    """
+    groups: dict[str, dict] = {}
+    for stat in statistics:
+        group = groups.setdefault(
+            module_group(stat.traceback[0].filename),
+            {"size": 0, "count": 0, "size_diff": 0, "count_diff": 0},
+        )
+        group["size"] += stat.size
+        group["count"] += stat.count
+        group["size_diff"] += getattr(stat, "size_diff", 0)
+        group["count_diff"] += getattr(stat, "count_diff", 0)
+    key = "size_diff" if statistics and hasattr(statistics[0], "size_diff") else "size"
+    ordered = sorted(groups.items(), key=lambda item: abs(item[1][key]), reverse=True)
+    return [{"module": module, **values} for module, values in ordered[:limit]]
+
+
+def _site(stat) -> dict:
+    frame = stat.traceback[0]
+    site = {
+        "file": frame.filename,
+        "line": frame.lineno,
+        "module": module_group(frame.filename),
+        "size": stat.size,
+        "count": stat.count,
+    }
+    if hasattr(stat, "size_diff"):
+        site.update(size_diff=stat.size_diff, count_diff=stat.count_diff)
+    return site
+
+
+class MemoryProfiler:
+    """
+    Керує ``tracemalloc``, знімками пам'яті та статистикою маршрутів.
+
+    :param frames: Глибина трасування кожного виділення.
+    :param max_snapshots: Кількість знімків, що зберігаються.
+    """
+
+    def __init__(
+        self,
+        frames: int = settings.MEMORY_TRACE_FRAMES,
+        max_snapshots: int = settings.MEMORY_MAX_SNAPSHOTS,
+    ):
+        self.frames = frames
+        self.max_snapshots = max_snapshots
+        self.snapshots: OrderedDict[int, dict] = OrderedDict()
+        self.routes: dict[str, dict] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        """
+        Чи ввімкнене відстеження виділень.
+        """
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int | None = None) -> dict:
+        """
+        Вмикає відстеження виділень пам'яті.
+
+        :param frames: Глибина трасування (за замовчуванням ``frames``).
+        :return: Поточний стан відстеження.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames or self.frames)
+        return self.status()
+
+    def stop(self) -> dict:
+        """
+        Вимикає відстеження та видаляє знімки, що посилаються на нього.
+
+        :return: Поточний стан відстеження.
+        """
+        tracemalloc.stop()
+        self.snapshots.clear()
+        return self.status()
+
+    def status(self) -> dict:
+        """
+        Повертає стан відстеження та обсяг відстежуваної пам'яті.
+
+        :return: Словник зі станом.
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "frames": tracemalloc.get_traceback_limit(),
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+        }
+
+    def _take(self) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing")
+        return tracemalloc.take_snapshot().filter_traces(_trace_filters)
+
+    def take_snapshot(self) -> dict:
+        """
+        Знімає й зберігає знімок пам'яті; найстаріші знімки видаляються.
+
+        :return: Опис знімка.
+        :raises RuntimeError: Якщо відстеження вимкнене.
+        """
+        snapshot = self._take()
+        entry = {
+            "id": next(self._ids),
+            "created_at": datetime.now(UTC).isoformat(),
+            "traced_bytes": sum(trace.size for trace in snapshot.traces),
+        }
+        with self._lock:
+            self.snapshots[entry["id"]] = {**entry, "snapshot": snapshot}
+            while len(self.snapshots) > self.max_snapshots:
+                self.snapshots.popitem(last=False)
+        return entry
+
+    def list_snapshots(self) -> list[dict]:
+        """
+        Повертає описи збережених знімків.
+
+        :return: Список знімків без самих даних.
+        """
+        return [
+            {key: value for key, value in entry.items() if key != "snapshot"}
+            for entry in self.snapshots.values()
+        ]
+
+    def top(self, limit: int = 20) -> dict:
+        """
+        Повертає найбільші місця виділення в поточному стані пам'яті.
+
+        :param limit: Кількість місць і груп у відповіді.
+        :return: Групи модулів і місця виділення.
+        :raises RuntimeError: Якщо відстеження вимкнене.
+        """
+        statistics = self._take().statistics("lineno")
+        return {
+            "modules": group_statistics(statistics, limit),
+            "sites": [_site(stat) for stat in statistics[:limit]],
+        }
+
+    def diff(self, snapshot_id: int, base_id: int | None = None, limit: int = 20):
+        """
+        Порівнює знімок із базовим (за замовчуванням — попереднім).
+
+        :param snapshot_id: Ідентифікатор знімка.
+        :param base_id: Ідентифікатор базового знімка.
+        :param limit: Кількість місць і груп у відповіді.
+        :return: Зміни за групами модулів і місцями виділення або None,
+            якщо знімків не знайдено.
+        """
+        if base_id is None:
+            earlier = [id_ for id_ in self.snapshots if id_ < snapshot_id]
+            base_id = earlier[-1] if earlier else None
+        current = self.snapshots.get(snapshot_id)
+        base = self.snapshots.get(base_id)
+        if current is None or base is None:
+            return None
+        statistics = current["snapshot"].compare_to(base["snapshot"], "lineno")
+        return {
+            "snapshot": snapshot_id,
+            "base": base_id,
+            "size_diff": current["traced_bytes"] - base["traced_bytes"],
+            "modules": group_statistics(statistics, limit),
+            "sites": [_site(stat) for stat in statistics[:limit]],
+        }
+
+    def record_route(self, route: str, peak: int) -> None:
+        """
+        Додає вимір пікового виділення пам'яті для маршруту.
+
+        :param route: Шаблон маршруту.
+        :param peak: Пікове виділення під час запиту в байтах.
+        """
+        REQUEST_PEAK_MEMORY.labels(route).observe(peak)
+        with self._lock:
+            stats = self.routes.setdefault(
+                route, {"samples": 0, "total_bytes": 0, "max_bytes": 0}
+            )
+            stats["samples"] += 1
+            stats["total_bytes"] += peak
+            stats["max_bytes"] = max(stats["max_bytes"], peak)
+            stats["last_bytes"] = peak
+
+    def route_stats(self) -> list[dict]:
+        """
+        Повертає пікові виділення пам'яті за маршрутами, найбільші — першими.
+
+        :return: Список зі статистикою для кожного маршруту.
+        """
+        with self._lock:
+            stats = [
+                {
+                    "route": route,
+                    **values,
+                    "mean_bytes": values["total_bytes"] // values["samples"],
+                }
+                for route, values in self.routes.items()
+            ]
+        return sorted(stats, key=lambda item: item["max_bytes"], reverse=True)
+
+
+memory_profiler = MemoryProfiler()
+
+
+class MemorySamplingMiddleware:
+    """
+    ASGI-проміжний шар, що міряє пікове виділення пам'яті під час запиту.
+
+    Працює лише при ввімкненому ``tracemalloc``. Пік пам'яті в ``tracemalloc``
+    глобальний, тому одночасно вимірюється лише один запит.
+
+    :param app: ASGI-застосунок.
+    :param profiler: Профайлер, що накопичує статистику.
+    :param sample_rate: Частка запитів, що вимірюються.
+    """
+
+    def __init__(
+        self,
+        app,
+        profiler: MemoryProfiler = memory_profiler,
+        sample_rate: float = settings.MEMORY_ROUTE_SAMPLE_RATE,
+    ):
+        self.app = app
+        self.profiler = profiler
+        self.sample_rate = sample_rate
+        self._active = False
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not tracemalloc.is_tracing()
+            or self._active
+            or (self.sample_rate < 1 and random.random() >= self.sample_rate)
+        ):
+            return await self.app(scope, receive, send)
+
+        self._active = True
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._active = False
+            if tracemalloc.is_tracing():
+                _, peak = tracemalloc.get_traced_memory()
+                self.profiler.record_route(route_label(scope), max(peak - start, 0))
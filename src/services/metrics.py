@@ -0,0 +1,298 @@
+"""
+Метрики застосунку у форматі Prometheus.
+
+Збирає:
+- гістограми затримок і лічильники статусів для кожного маршруту;
+- стан пулу з'єднань бази даних;
+- влучання, промахи та затримки ``RedisCache`` (окремо для локального
+  рівня та Redis);
+- кількість паролів, що зараз хешуються bcrypt;
+- затримки, помилки та повтори відправлення email, довжину черги листів,
+  розмір пакетів, кількість відкритих SMTP-з'єднань і результати обробки
+  черги листів;
+- відмови обмежувача запитів;
+- ліміти, зайнятість і відмови контролю допуску;
+- витрати та відмови квот користувачів;
+- затримку та блокування циклу подій;
+- пікове виділення пам'яті запитами (коли ввімкнено ``tracemalloc``).
+
+Для кількох воркерів uvicorn задайте змінну оточення
+``PROMETHEUS_MULTIPROC_DIR`` (порожній каталог, спільний для всіх воркерів)
+ще до запуску застосунку — тоді ``/metrics`` агрегує значення всіх процесів.
+"""
+
+import os
+import time
+import weakref
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Тривалість обробки HTTP-запиту.",
+    ["method", "route"],
+)
+REQUEST_COUNT = Counter(
+    "http_requests_total",
+    "Кількість HTTP-запитів за маршрутом і статусом.",
+    ["method", "route", "status"],
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Розмір пулу з'єднань бази даних.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Кількість з'єднань, виданих із пулу.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Кількість з'єднань понад розмір пулу.",
+    multiprocess_mode="livesum",
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Кількість звернень до RedisCache.get за результатом.",
+    ["result"],
+)
+CACHE_TIER_REQUESTS = Counter(
+    "cache_tier_requests_total",
+    "Кількість звернень до кожного рівня RedisCache (local, redis) за результатом.",
+    ["tier", "result"],
+)
+CACHE_LOCAL_ENTRIES = Gauge(
+    "cache_local_entries",
+    "Кількість записів у локальному рівні кешу.",
+    multiprocess_mode="livesum",
+)
+CACHE_COMPUTES = Counter(
+    "cache_computes_total",
+    "Кількість обчислень значень RedisCache.get_or_compute за причиною "
+    "(miss, early, stale).",
+    ["reason"],
+)
+NEGATIVE_CACHE_HITS = Counter(
+    "negative_cache_hits_total",
+    "Кількість запитів до бази даних, яких уникнуто завдяки негативному кешу.",
+    ["entity"],
+)
+CACHE_LATENCY = Histogram(
+    "cache_operation_duration_seconds",
+    "Тривалість операцій RedisCache.",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+
+PASSWORD_HASH_IN_PROGRESS = Gauge(
+    "password_hash_in_progress",
+    "Кількість операцій bcrypt, що виконуються або очікують виконання.",
+    multiprocess_mode="livesum",
+)
+
+EMAIL_SEND_LATENCY = Histogram(
+    "email_send_duration_seconds",
+    "Тривалість відправлення email.",
+    ["kind"],
+)
+EMAIL_SEND_FAILURES = Counter(
+    "email_send_failures_total",
+    "Кількість невдалих спроб відправлення email.",
+    ["kind"],
+)
+EMAIL_SENT = Counter(
+    "email_sent_total",
+    "Кількість відправлених email.",
+    ["kind"],
+)
+EMAIL_RETRIES = Counter(
+    "email_retries_total",
+    "Кількість повторних спроб відправлення email.",
+    ["kind"],
+)
+EMAIL_QUEUE_DEPTH = Gauge(
+    "email_queue_depth",
+    "Кількість листів у черзі відправлення.",
+    multiprocess_mode="livesum",
+)
+EMAIL_BATCH_SIZE = Histogram(
+    "email_batch_size",
+    "Кількість листів, відправлених одним з'єднанням підряд.",
+    buckets=(1, 2, 5, 10, 20, 50, 100),
+)
+EMAIL_CONNECTIONS_OPENED = Counter(
+    "email_connections_opened_total",
+    "Кількість відкритих з'єднань із поштовим сервером.",
+)
+EMAIL_OUTBOX_PROCESSED = Counter(
+    "email_outbox_processed_total",
+    "Кількість оброблених листів черги за результатом (sent, retry, dead).",
+    ["result"],
+)
+
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Кількість запитів, відхилених обмежувачем запитів.",
+    ["route"],
+)
+LOGIN_THROTTLED = Counter(
+    "login_throttled_total",
+    "Кількість спроб входу, відхилених до перевірки пароля.",
+    ["reason"],
+)
+
+ADMISSION_LIMIT = Gauge(
+    "admission_limit",
+    "Поточний адаптивний ліміт одночасних запитів класу маршрутів.",
+    ["route_class"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight",
+    "Кількість запитів класу маршрутів, що обробляються.",
+    ["route_class"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds",
+    "Час очікування запиту в черзі контролю допуску.",
+    ["route_class"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
+)
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections_total",
+    "Кількість запитів, відхилених контролем допуску (503).",
+    ["route_class", "reason"],
+)
+
+QUOTA_SPENT = Counter(
+    "quota_spent_units_total",
+    "Сума вартості запитів, списаної з квот користувачів.",
+    ["route"],
+)
+QUOTA_REJECTIONS = Counter(
+    "quota_rejections_total",
+    "Кількість запитів, відхилених через вичерпану квоту.",
+    ["route"],
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Запізнення пульсу циклу подій відносно запланованого часу.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+EVENT_LOOP_BLOCKS = Counter(
+    "event_loop_blocks_total",
+    "Кількість блокувань циклу подій довших за LOOP_BLOCK_THRESHOLD_MS.",
+)
+
+REQUEST_PEAK_MEMORY = Histogram(
+    "http_request_peak_memory_bytes",
+    "Пікове виділення пам'яті під час обробки запиту (вибірково, tracemalloc).",
+    ["route"],
+    buckets=(2**14, 2**16, 2**18, 2**20, 2**22, 2**24, 2**26, 2**28),
+)
+
+_instrumented_pools: weakref.WeakSet = weakref.WeakSet()
+
+
+def route_label(scope) -> str:
+    """
+    Повертає шаблон маршруту для міток метрик.
+
+    Використовується шаблон (``/api/contacts/{contact_id}``), а не фактичний
+    шлях, щоб кількість часових рядів не залежала від ідентифікаторів.
+
+    :param scope: ASGI scope запиту.
+    :return: Шаблон маршруту або ``unmatched``.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def render_latest() -> bytes:
+    """
+    Формує текстове представлення всіх метрик.
+
+    :return: Метрики у форматі Prometheus.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead() -> None:
+    """
+    Прибирає live-метрики поточного воркера при його зупинці.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    """
+    Підключає оновлення метрик пулу до подій видачі та повернення з'єднань.
+
+    :param engine: Асинхронний рушій бази даних.
+    """
+    pool = engine.sync_engine.pool
+    if pool in _instrumented_pools or not hasattr(pool, "checkedout"):
+        return
+    _instrumented_pools.add(pool)
+
+    def update_pool_metrics(*args):
+        DB_POOL_SIZE.set(pool.size())
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    event.listen(pool, "checkout", update_pool_metrics)
+    event.listen(pool, "checkin", update_pool_metrics)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware, що вимірює затримку та статус кожного HTTP-запиту.
+
+    :param app: ASGI-застосунок.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_label(scope)
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method, route).observe(time.perf_counter() - start)
+            REQUEST_COUNT.labels(method, route, str(status_code)).inc()
@@ -0,0 +1,117 @@
+"""
+Негативний кеш: ідентифікатори, яких немає в базі даних.
+
+Сканери та зламані клієнти часто запитують неіснуючі записи, і кожен такий
+запит доходить до бази даних. ``NegativeCache`` запам'ятовує «не знайдено» на
+``NEGATIVE_CACHE_TTL`` секунд.
+
+Усі записи одного типу сутностей лежать в одній відсортованій множині Redis,
+де оцінка — час завершення дії запису. Після кожного додавання прострочені
+записи видаляються, а множина обрізається до ``NEGATIVE_CACHE_MAX_ENTRIES``
+найновіших записів, тож перебір ідентифікаторів не може заповнити пам'ять
+Redis. Під час створення сутності її ідентифікатор видаляється з множини.
+
+Якщо Redis недоступний, записи вважаються відсутніми в кеші, і запити йдуть
+у базу даних.
+"""
+
+import logging
+import time
+
+from redis.exceptions import RedisError
+
+from src.conf.config import settings
+from src.services.instrumentation import timed
+from src.services.metrics import CACHE_LATENCY, NEGATIVE_CACHE_HITS
+from src.services.redis_cache import redis_cache
+
+logger = logging.getLogger(__name__)
+
+
+class NegativeCache:
+    """
+    Обмежений кеш відсутніх записів.
+
+    :param entity: Тип сутностей (для ключа Redis і метрик).
+    :param ttl: Час дії запису в секундах.
+    :param max_entries: Максимальна кількість записів.
+    """
+
+    def __init__(
+        self,
+        entity: str,
+        ttl: int = settings.NEGATIVE_CACHE_TTL,
+        max_entries: int = settings.NEGATIVE_CACHE_MAX_ENTRIES,
+    ):
+        self.entity = entity
+        self.key = f"negative:{entity}"
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    @staticmethod
+    def _enabled() -> bool:
+        return settings.NEGATIVE_CACHE_ENABLED and redis_cache.redis is not None
+
+    async def contains(self, member) -> bool:
+        """
+        Перевіряє, чи відомо, що запису немає.
+
+        Кожне влучання — це запит до бази даних, якого вдалося уникнути.
+
+        :param member: Ідентифікатор запису.
+        :return: True, якщо запис нещодавно не знайшли.
+        """
+        if not self._enabled():
+            return False
+        try:
+            with timed("cache"), CACHE_LATENCY.labels("negative_get").time():
+                expires_at = await redis_cache.redis.zscore(self.key, str(member))
+        except RedisError as e:
+            logger.warning("Negative cache is unavailable: %s", e)
+            return False
+        if expires_at is None or expires_at <= time.time():
+            return False
+        NEGATIVE_CACHE_HITS.labels(self.entity).inc()
+        return True
+
+    async def add(self, member) -> None:
+        """
+        Запам'ятовує, що запису немає.
+
+        :param member: Ідентифікатор запису.
+        """
+        if not self._enabled():
+            return
+        now = time.time()
+        try:
+            with timed("cache"), CACHE_LATENCY.labels("negative_set").time():
+                async with redis_cache.redis.pipeline(transaction=True) as pipe:
+                    pipe.zadd(self.key, {str(member): now + self.ttl})
+                    pipe.zremrangebyscore(self.key, "-inf", now)
+                    pipe.zremrangebyrank(self.key, 0, -self.max_entries - 1)
+                    pipe.expire(self.key, self.ttl)
+                    await pipe.execute()
+        except RedisError as e:
+            logger.warning("Negative cache is unavailable: %s", e)
+
+    async def discard(self, member) -> None:
+        """
+        Видаляє запис після створення сутності.
+
+        :param member: Ідентифікатор запису.
+        """
+        if not self._enabled():
+            return
+        try:
+            with timed("cache"), CACHE_LATENCY.labels("negative_delete").time():
+                await redis_cache.redis.zrem(self.key, str(member))
+        except RedisError as e:
+            # Запис зникне сам після закінчення ``ttl``.
+            logger.warning("Negative cache entry %s was not removed: %s", member, e)
+
+
+missing_users = NegativeCache("users")
+"""Ідентифікатори користувачів, яких немає."""
+
+missing_contacts = NegativeCache("contacts")
+"""Пари ``<ID користувача>:<ID контакту>``, для яких контакт не знайдено."""
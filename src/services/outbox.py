@@ -0,0 +1,310 @@
+"""
+Надійна черга листів у базі даних (transactional outbox).
+
+Обробники API не відправляють листи самі: ``stage_email`` додає лист у
+таблицю ``email_outbox`` у тій самій сесії, що й зміну користувача, тож
+лист і зміна фіксуються однією транзакцією::
+
+    stage_email(db, verification_email(email, username, host), "verify")
+    new_user = await user_service.create_user(user_data)  # фіксує обидва
+
+Час відповіді API більше не залежить від поштового сервера, а перезапуск
+воркера застосунку не губить листи. Чергу розбирає окремий процес
+(:mod:`src.tools.outbox_worker`) з ``OutboxWorker``:
+
+- забирає до ``OUTBOX_BATCH_SIZE`` листів, закріплюючи їх за собою на
+  ``OUTBOX_LEASE_SECONDS`` секунд (у PostgreSQL — через
+  ``FOR UPDATE SKIP LOCKED``, тож кілька воркерів не заважають один одному);
+- відправляє пакет через пул SMTP-з'єднань :mod:`src.services.mailer`;
+- після тимчасової помилки відкладає лист із затримкою, що подвоюється від
+  ``OUTBOX_RETRY_BACKOFF`` до ``OUTBOX_RETRY_MAX`` секунд;
+- після постійної помилки або ``OUTBOX_MAX_ATTEMPTS`` спроб позначає лист
+  як недоставлений (``dead``). Такі листи можна переглянути й повернути в
+  чергу через ``/api/admin/outbox``.
+
+Якщо воркер завершився, не записавши результат, лист повертається в чергу
+після завершення закріплення, тож у рідкісних випадках може бути
+відправлений двічі.
+"""
+
+import asyncio
+import email
+import logging
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from email.policy import default as default_policy
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import settings
+from src.database.models import EmailOutbox, OutboxStatus
+from src.services.mailer import MailDelivery, is_permanent, mailer
+from src.services.metrics import EMAIL_OUTBOX_PROCESSED
+
+logger = logging.getLogger(__name__)
+
+
+def utcnow() -> datetime:
+    """
+    Поточний час UTC без часової зони, як його зберігають стовпці ``DateTime``.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def stage_email(db: AsyncSession, message: EmailMessage, kind: str) -> EmailOutbox:
+    """
+    Додає лист у чергу в поточній транзакції.
+
+    Запис не фіксується: його фіксує ``commit`` викликача разом з іншими
+    змінами сесії.
+
+    :param db: Сесія бази даних.
+    :param message: Лист.
+    :param kind: Тип листа (для метрик).
+    :return: Запис черги.
+    """
+    entry = EmailOutbox(
+        kind=kind,
+        recipient=message["To"],
+        message=message.as_string(),
+        status=OutboxStatus.PENDING,
+        attempts=0,
+        next_attempt_at=utcnow(),
+    )
+    db.add(entry)
+    return entry
+
+
+async def outbox_stats(db: AsyncSession) -> dict:
+    """
+    Кількість листів черги в кожному стані та вік найстаршого невідправленого.
+
+    :param db: Сесія бази даних.
+    :return: Статистика черги.
+    """
+    rows = await db.execute(
+        select(
+            EmailOutbox.status,
+            func.count(),
+            func.min(EmailOutbox.created_at),
+        ).group_by(EmailOutbox.status)
+    )
+    stats = {status.value: 0 for status in OutboxStatus}
+    oldest_pending = None
+    for status, count, oldest in rows:
+        stats[status.value] = count
+        if status == OutboxStatus.PENDING:
+            oldest_pending = oldest
+    stats["oldest_pending_at"] = oldest_pending
+    return stats
+
+
+async def dead_letters(db: AsyncSession, limit: int = 50) -> list[dict]:
+    """
+    Повертає недоставлені листи, новіші — першими.
+
+    :param db: Сесія бази даних.
+    :param limit: Максимальна кількість записів.
+    :return: Ідентифікатор, тип, отримувач, кількість спроб і остання помилка.
+    """
+    rows = await db.execute(
+        select(
+            EmailOutbox.id,
+            EmailOutbox.kind,
+            EmailOutbox.recipient,
+            EmailOutbox.attempts,
+            EmailOutbox.last_error,
+            EmailOutbox.updated_at,
+        )
+        .where(EmailOutbox.status == OutboxStatus.DEAD)
+        .order_by(EmailOutbox.id.desc())
+        .limit(limit)
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+async def retry_dead_letter(db: AsyncSession, entry_id: int) -> bool:
+    """
+    Повертає недоставлений лист у чергу з обнуленим лічильником спроб.
+
+    :param db: Сесія бази даних.
+    :param entry_id: Ідентифікатор запису.
+    :return: True, якщо лист повернуто в чергу.
+    """
+    result = await db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == entry_id, EmailOutbox.status == OutboxStatus.DEAD)
+        .values(
+            status=OutboxStatus.PENDING,
+            attempts=0,
+            next_attempt_at=utcnow(),
+            last_error=None,
+        )
+    )
+    await db.commit()
+    return result.rowcount > 0
+
+
+class OutboxWorker:
+    """
+    Розбирає чергу листів пакетами.
+
+    :param session_factory: Фабрика асинхронних сесій бази даних.
+    :param delivery: Пул відправлення листів.
+    :param batch_size: Кількість листів, що забираються за раз.
+    :param poll_interval: Пауза між перевірками порожньої черги в секундах.
+    :param max_attempts: Кількість спроб, після якої лист недоставлений.
+    :param retry_backoff: Початкова затримка між спробами в секундах.
+    :param retry_max: Максимальна затримка між спробами в секундах.
+    :param lease: Тривалість закріплення листа за воркером у секундах.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        delivery: MailDelivery = mailer,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        poll_interval: float = settings.OUTBOX_POLL_INTERVAL,
+        max_attempts: int = settings.OUTBOX_MAX_ATTEMPTS,
+        retry_backoff: float = settings.OUTBOX_RETRY_BACKOFF,
+        retry_max: float = settings.OUTBOX_RETRY_MAX,
+        lease: float = settings.OUTBOX_LEASE_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.delivery = delivery
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.retry_max = retry_max
+        self.lease = lease
+
+    def retry_delay(self, attempts: int) -> float:
+        """
+        Затримка перед наступною спробою.
+
+        :param attempts: Кількість виконаних спроб.
+        :return: Затримка в секундах.
+        """
+        return min(self.retry_max, self.retry_backoff * 2 ** (attempts - 1))
+
+    async def claim(self) -> list:
+        """
+        Забирає пакет листів, час відправлення яких настав.
+
+        :return: Рядки з ``id``, ``kind``, ``message`` і ``attempts`` (уже
+            збільшеним на одиницю).
+        """
+        now = utcnow()
+        async with self.session_factory() as session:
+            rows = (
+                await session.execute(
+                    select(
+                        EmailOutbox.id,
+                        EmailOutbox.kind,
+                        EmailOutbox.message,
+                        EmailOutbox.attempts + 1,
+                    )
+                    .where(
+                        EmailOutbox.status == OutboxStatus.PENDING,
+                        EmailOutbox.next_attempt_at <= now,
+                    )
+                    .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+            ).all()
+            if rows:
+                await session.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id.in_([row[0] for row in rows]))
+                    .values(
+                        attempts=EmailOutbox.attempts + 1,
+                        next_attempt_at=now + timedelta(seconds=self.lease),
+                    )
+                )
+                await session.commit()
+        return rows
+
+    async def process_batch(self) -> int:
+        """
+        Забирає, відправляє пакет листів і записує результати.
+
+        :return: Кількість оброблених листів.
+        """
+        rows = await self.claim()
+        if not rows:
+            return 0
+        results = await asyncio.gather(
+            *(
+                self.delivery.send(
+                    email.message_from_string(message, policy=default_policy),
+                    kind=kind,
+                )
+                for _, kind, message, _ in rows
+            ),
+            return_exceptions=True,
+        )
+
+        now = utcnow()
+        sent, counts = [], {"sent": 0, "retry": 0, "dead": 0}
+        async with self.session_factory() as session:
+            for (entry_id, _, _, attempts), error in zip(rows, results):
+                if error is None:
+                    sent.append(entry_id)
+                    counts["sent"] += 1
+                    continue
+                values = {"last_error": str(error)[:500] or type(error).__name__}
+                if is_permanent(error) or attempts >= self.max_attempts:
+                    values["status"] = OutboxStatus.DEAD
+                    counts["dead"] += 1
+                else:
+                    values["next_attempt_at"] = now + timedelta(
+                        seconds=self.retry_delay(attempts)
+                    )
+                    counts["retry"] += 1
+                await session.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id == entry_id)
+                    .values(**values)
+                )
+            if sent:
+                await session.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id.in_(sent))
+                    .values(status=OutboxStatus.SENT, sent_at=now, last_error=None)
+                )
+            await session.commit()
+
+        for result, count in counts.items():
+            EMAIL_OUTBOX_PROCESSED.labels(result).inc(count)
+        logger.info(
+            "Outbox batch: %d sent, %d retried, %d dead (%.2f emails/s)",
+            counts["sent"],
+            counts["retry"],
+            counts["dead"],
+            self.delivery.stats()["messages_per_second"],
+        )
+        return len(rows)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """
+        Розбирає чергу, доки не встановлено ``stop``.
+
+        Повні пакети обробляються без пауз; коли черга спорожніла, воркер
+        перевіряє її раз на ``poll_interval`` секунд.
+
+        :param stop: Подія зупинки.
+        """
+        while not stop.is_set():
+            try:
+                processed = await self.process_batch()
+            except SQLAlchemyError as e:
+                logger.error("Outbox batch failed: %s", e)
+                processed = 0
+            if processed < self.batch_size:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(stop.wait(), self.poll_interval)
@@ -0,0 +1,297 @@
+"""
+Профілювання окремих запитів на вимогу.
+
+``ProfilingMiddleware`` профілює запит статистичним семплером, якщо запит
+містить заголовок ``X-Profile`` з токеном, підписаним для адміністратора
+(``create_profile_token``), або потрапив у вибірку ``PROFILING_SAMPLE_RATE``.
+Семплер у фоновому потоці кожні ``PROFILING_INTERVAL_MS`` знімає стек потоку
+циклу подій, тож профіль показує і код запиту, і все, що блокувало цикл.
+
+Профілі зберігаються у форматі collapsed stacks (``flamegraph.pl``, speedscope,
+inferno) у кільцевому буфері на диску: зберігаються лише останні
+``PROFILING_MAX_FILES`` профілів. Запити без тригера проходять без додаткової
+роботи, крім перевірки заголовків.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+
+from jose import JWTError, jwt
+
+from src.conf.config import settings
+from src.services.metrics import route_label
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_SCOPE = "profile"
+PROFILE_NAME = re.compile(r"^[\w.-]+\.collapsed$")
+
+_profile_header = PROFILE_HEADER.lower().encode()
+
+
+def create_profile_token(subject: str, ttl: int | None = None) -> tuple[str, datetime]:
+    """
+    Створює токен для заголовка ``X-Profile``.
+
+    :param subject: Email адміністратора, що запросив профілювання.
+    :param ttl: Термін дії в секундах (за замовчуванням ``PROFILING_TOKEN_TTL``).
+    :return: Токен і час завершення його дії.
+    """
+    expire = datetime.now(UTC) + timedelta(seconds=ttl or settings.PROFILING_TOKEN_TTL)
+    token = jwt.encode(
+        {"sub": subject, "scope": PROFILE_SCOPE, "exp": expire},
+        settings.JWT_SECRET,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    return token, expire
+
+
+def verify_profile_token(token: str) -> bool:
+    """
+    Перевіряє токен профілювання.
+
+    :param token: Значення заголовка ``X-Profile``.
+    :return: True, якщо токен дійсний і виданий для профілювання.
+    """
+    try:
+        payload = jwt.decode(
+            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
+        )
+    except JWTError:
+        return False
+    return payload.get("scope") == PROFILE_SCOPE
+
+
+class StackSampler:
+    """
+    Статистичний профайлер: періодично знімає стек заданого потоку.
+
+    :param interval: Інтервал між вибірками в секундах.
+    :param thread_id: Потік, що профілюється (за замовчуванням поточний).
+    """
+
+    def __init__(self, interval: float, thread_id: int | None = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """
+        Запускає фоновий потік семплювання.
+        """
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        """
+        Зупиняє семплювання.
+
+        :return: Кількість вибірок для кожного стеку.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+
+
+def collapse_stack(frame) -> str:
+    """
+    Перетворює стек кадрів на рядок collapsed stacks (корінь — першим).
+
+    :param frame: Найглибший кадр стеку.
+    :return: Кадри, розділені ``;``.
+    """
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        names.append(f"{code.co_qualname} ({filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class ProfileStore:
+    """
+    Кільцевий буфер профілів на диску.
+
+    Кожен профіль — файл ``<id>.collapsed`` із метаданими в ``<id>.json``.
+
+    :param directory: Каталог для профілів.
+    :param max_files: Кількість профілів, що зберігаються.
+    """
+
+    def __init__(self, directory: Path, max_files: int):
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def new_name(self) -> str:
+        """
+        Генерує назву нового профілю; назви впорядковані за часом.
+
+        :return: Назва файлу профілю.
+        """
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%f")
+        return f"{stamp}-{os.getpid()}-{next(self._ids)}.collapsed"
+
+    def save(self, name: str, stacks: Counter, meta: dict) -> None:
+        """
+        Записує профіль і видаляє найстаріші понад ``max_files``.
+
+        :param name: Назва файлу профілю (``new_name``).
+        :param stacks: Кількість вибірок для кожного стеку.
+        :param meta: Метадані запиту.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / name
+        path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        )
+        path.with_suffix(".json").write_text(json.dumps({"name": name, **meta}))
+        with self._lock:
+            self._evict()
+
+    def _evict(self) -> None:
+        profiles = sorted(self.directory.glob("*.collapsed"))
+        for path in profiles[: max(len(profiles) - self.max_files, 0)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+
+    def list(self) -> list[dict]:
+        """
+        Повертає метадані збережених профілів, новіші — першими.
+
+        :return: Список метаданих.
+        """
+        if not self.directory.exists():
+            return []
+        entries = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                entries.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def path(self, name: str) -> Path | None:
+        """
+        Повертає шлях до профілю за назвою.
+
+        :param name: Назва файлу профілю.
+        :return: Шлях або None, якщо назва некоректна чи профілю немає.
+        """
+        if not PROFILE_NAME.match(name):
+            return None
+        path = self.directory / name
+        return path if path.is_file() else None
+
+
+profile_store = ProfileStore(
+    Path(settings.PROFILING_DIR), max_files=settings.PROFILING_MAX_FILES
+)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI-проміжний шар, що профілює запити з тригером.
+
+    Одночасно профілюється лише один запит: семплер бачить увесь потік циклу
+    подій, тож паралельні профілі змішувалися б між собою. Назва збереженого
+    профілю повертається в заголовку ``X-Profile-Id``.
+
+    :param app: ASGI-застосунок.
+    :param store: Сховище профілів.
+    :param sample_rate: Частка запитів, що профілюються без заголовка.
+    :param interval_ms: Інтервал семплювання в мілісекундах.
+    """
+
+    def __init__(
+        self,
+        app,
+        store: ProfileStore = profile_store,
+        sample_rate: float = settings.PROFILING_SAMPLE_RATE,
+        interval_ms: float = settings.PROFILING_INTERVAL_MS,
+    ):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self._active = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active:
+            return await self.app(scope, receive, send)
+        trigger = self._trigger(scope)
+        if trigger is None:
+            return await self.app(scope, receive, send)
+
+        self._active = True
+        sampler = StackSampler(self.interval)
+        name = self.store.new_name()
+        status = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", name.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stacks = sampler.stop()
+            self._active = False
+            meta = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route_label(scope),
+                "status": status,
+                "trigger": trigger,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "samples": sum(stacks.values()),
+                "interval_ms": self.interval * 1000,
+                "created_at": datetime.now(UTC).isoformat(),
+            }
+            try:
+                await asyncio.to_thread(self.store.save, name, stacks, meta)
+                logger.info("Saved profile %s for %s", name, meta["path"])
+            except OSError as e:
+                logger.warning("Could not save profile: %s", e)
+
+    def _trigger(self, scope) -> str | None:
+        for key, value in scope["headers"]:
+            if key == _profile_header:
+                if verify_profile_token(value.decode("latin-1")):
+                    return "header"
+                break
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sample"
+        return None
@@ -0,0 +1,219 @@
+"""
+Квоти користувачів із вартістю запитів.
+
+Пошук, дні народження, вивантаження всіх контактів і завантаження аватара
+коштують на порядки більше, ніж читання одного контакту, тож рахувати їх
+як «один запит» несправедливо. Кожен такий ендпоінт оголошує вартість у
+умовних одиницях, а кожен користувач має бюджет ``QUOTA_BUDGET`` одиниць на
+ковзне вікно ``QUOTA_WINDOW`` секунд::
+
+    @router.get("/search/")
+    async def search_contacts(..., quota: QuotaUsage = Depends(quotas.charge(10))):
+        contacts = await ...
+        await quota.add(len(contacts) // 10)
+
+Базова вартість списується до виконання обробника: якщо бюджету не
+вистачає, запит отримує 429 із ``Retry-After``. Динамічну частину (кількість
+рядків, розмір файлу) обробник додає після виконання роботи — вона
+списується завжди й зменшує бюджет наступних запитів.
+
+Вікно поділене на ``QUOTA_BUCKETS`` інтервалів; витрати кожного інтервалу
+лежать в одному хеші Redis на користувача, а перевірка та списання
+виконуються одним Lua-скриптом. Відповіді мають заголовки
+``X-Quota-Limit``, ``X-Quota-Remaining``, ``X-Quota-Reset`` (секунд до
+звільнення найстарішого інтервалу) і ``X-Quota-Cost``. Без Redis квоти не
+застосовуються.
+"""
+
+import math
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from redis.exceptions import RedisError
+
+from src.conf import messages
+from src.conf.config import settings
+from src.database.models import User
+from src.services.auth import get_current_user
+from src.services.instrumentation import timed
+from src.services.metrics import CACHE_LATENCY, QUOTA_REJECTIONS, QUOTA_SPENT
+from src.services.redis_cache import redis_cache
+
+SPEND = """
+local budget = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local bucket = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local time = redis.call("time")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local buckets = math.floor(window / bucket)
+local current = math.floor(now / bucket)
+local oldest = current - buckets + 1
+local used = 0
+local first = nil
+local fields = redis.call("hgetall", KEYS[1])
+for i = 1, #fields, 2 do
+    local index = tonumber(fields[i])
+    if index < oldest then
+        redis.call("hdel", KEYS[1], fields[i])
+    else
+        used = used + tonumber(fields[i + 1])
+        if first == nil or index < first then
+            first = index
+        end
+    end
+end
+local allowed = 1
+if ARGV[5] == "1" and used + cost > budget then
+    allowed = 0
+elseif cost > 0 then
+    redis.call("hincrby", KEYS[1], current, cost)
+    redis.call("pexpire", KEYS[1], window)
+    used = used + cost
+    first = first or current
+end
+local reset = 0
+if first ~= nil then
+    reset = (first + buckets) * bucket - now
+end
+return {allowed, used, reset}
+"""
+
+
+class QuotaUsage:
+    """
+    Списання з бюджету користувача в межах одного запиту.
+
+    :param manager: Менеджер квот.
+    :param user_id: Ідентифікатор користувача.
+    :param name: Назва ендпоінту (для метрик).
+    :param response: Відповідь, у яку записуються заголовки квоти.
+    """
+
+    def __init__(self, manager: "QuotaManager", user_id, name: str, response):
+        self.manager = manager
+        self.user_id = user_id
+        self.name = name
+        self.response = response
+        self.cost = 0
+
+    def _update(self, cost: int, used: int, reset_ms: int) -> None:
+        self.cost += cost
+        QUOTA_SPENT.labels(self.name).inc(cost)
+        self.response.headers.update(
+            {
+                "X-Quota-Limit": str(self.manager.budget),
+                "X-Quota-Remaining": str(max(0, self.manager.budget - used)),
+                "X-Quota-Reset": str(math.ceil(reset_ms / 1000)),
+                "X-Quota-Cost": str(self.cost),
+            }
+        )
+
+    async def add(self, cost: int) -> None:
+        """
+        Списує динамічну вартість уже виконаної роботи.
+
+        Списання не відхиляє запит, навіть якщо бюджет вичерпано.
+
+        :param cost: Додаткова вартість в одиницях.
+        """
+        cost = max(0, int(cost))
+        if cost == 0:
+            return
+        result = await self.manager.spend(self.user_id, cost, enforce=False)
+        if result is not None:
+            self._update(cost, *result[1:])
+
+
+class QuotaManager:
+    """
+    Бюджети користувачів у ковзних вікнах Redis.
+
+    :param prefix: Префікс ключів Redis.
+    :param budget: Бюджет користувача на вікно в одиницях.
+    :param window: Тривалість вікна в секундах.
+    :param buckets: Кількість інтервалів у вікні.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "quota",
+        budget: int = settings.QUOTA_BUDGET,
+        window: int = settings.QUOTA_WINDOW,
+        buckets: int = settings.QUOTA_BUCKETS,
+    ):
+        self.prefix = prefix
+        self.budget = budget
+        self.window = window
+        self.buckets = buckets
+        self.enabled = settings.QUOTA_ENABLED
+
+    async def spend(self, user_id, cost: int, enforce: bool = True):
+        """
+        Списує вартість із бюджету користувача.
+
+        :param user_id: Ідентифікатор користувача.
+        :param cost: Вартість в одиницях.
+        :param enforce: Чи відмовляти, якщо бюджету не вистачає.
+        :return: ``(дозволено, використано, мс до звільнення)`` або None,
+            якщо квоти вимкнені чи Redis недоступний.
+        """
+        if not self.enabled or redis_cache.redis is None:
+            return None
+        window_ms = self.window * 1000
+        try:
+            with timed("cache"), CACHE_LATENCY.labels("quota").time():
+                allowed, used, reset = await redis_cache.redis.eval(
+                    SPEND,
+                    1,
+                    f"{self.prefix}:{user_id}",
+                    self.budget,
+                    window_ms,
+                    window_ms // self.buckets,
+                    cost,
+                    "1" if enforce else "0",
+                )
+        except RedisError:
+            return None
+        return bool(allowed), int(used), int(reset)
+
+    def charge(self, cost: int, name: str | None = None):
+        """
+        Створює залежність FastAPI, що списує базову вартість запиту.
+
+        :param cost: Базова вартість в одиницях.
+        :param name: Назва для метрик; за замовчуванням — шаблон маршруту.
+        :return: Залежність, що повертає :class:`QuotaUsage`.
+        """
+
+        async def dependency(
+            request: Request,
+            response: Response,
+            user: User = Depends(get_current_user),
+        ) -> QuotaUsage:
+            route = request.scope.get("route")
+            label = name or getattr(route, "path", request.url.path)
+            usage = QuotaUsage(self, user.id, label, response)
+            result = await self.spend(user.id, cost)
+            if result is None:
+                return usage
+            allowed, used, reset = result
+            if not allowed:
+                QUOTA_REJECTIONS.labels(label).inc()
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=messages.QUOTA_EXCEEDED,
+                    headers={
+                        "Retry-After": str(max(1, math.ceil(reset / 1000))),
+                        "X-Quota-Limit": str(self.budget),
+                        "X-Quota-Remaining": str(max(0, self.budget - used)),
+                        "X-Quota-Reset": str(math.ceil(reset / 1000)),
+                    },
+                )
+            usage._update(cost, used, reset)
+            return usage
+
+        return dependency
+
+
+quotas = QuotaManager()
+"""Спільний менеджер квот."""
@@ -1,36 +1,495 @@
-from redis import asyncio as aioredis
+import asyncio
+import logging
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from typing import Awaitable, Callable, Iterable, Optional
+
+import msgpack
+from pydantic import BaseModel
 
-import json
-from fastapi import Depends
-from typing import Optional
 from src.conf.config import settings  # Налаштування конфігурації
+from src.services.cache_codec import StaleEntry, codec
+from src.services.instrumentation import timed
+from src.services.local_cache import LocalCache
+from src.services.metrics import (
+    CACHE_COMPUTES,
+    CACHE_LATENCY,
+    CACHE_LOCAL_ENTRIES,
+    CACHE_REQUESTS,
+    CACHE_TIER_REQUESTS,
+)
+
+logger = logging.getLogger(__name__)
+
+INVALIDATE_TAGS = """
+local deleted = {}
+for _, tag in ipairs(KEYS) do
+    for _, key in ipairs(redis.call("smembers", tag)) do
+        redis.call("del", key)
+        table.insert(deleted, key)
+    end
+    redis.call("del", tag)
+end
+return deleted
+"""
+
+RELEASE_LOCK = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
 
 
 class RedisCache:
-    def __init__(self):
+    """
+    Кеш об'єктів у Redis.
+
+    Значення зберігаються у бінарному форматі :mod:`src.services.cache_codec`.
+    Пакетні операції (``get_many``, ``set_many``, ``delete`` кількох ключів)
+    виконуються за один мережевий обмін.
+
+    З ``CACHE_LOCAL_ENABLED`` перед Redis працює локальний LRU-рівень
+    (:mod:`src.services.local_cache`), а зміни ключів розсилаються іншим
+    воркерам через канал ``CACHE_INVALIDATION_CHANNEL``.
+
+    Записи можна позначати тегами (``tags``): ``invalidate_tags`` атомарно
+    видаляє всі записи з тегом одним Lua-скриптом. Тег — це множина Redis
+    ``tag:<назва>`` з ключами записів.
+
+    ``get_or_compute`` захищає від лавини промахів (cache stampede): значення
+    для ключа обчислює лише одна задача на воркер і один воркер на кластер,
+    гарячі ключі оновлюються ймовірнісно ще до завершення свіжості, а
+    застаріле значення віддається, поки оновлення виконується у фоні.
+
+    :param local: Локальний рівень кешу; None — лише Redis.
+    """
+
+    def __init__(self, local: LocalCache | None = None):
         self.redis = None
+        self.local = local
+        self.instance_id = uuid.uuid4().hex
+        self.stats = {"local": Counter(), "redis": Counter()}
+        self._listener: asyncio.Task | None = None
+        self._invalidations = 0
+        self._inflight: dict[str, asyncio.Task] = {}
 
     async def connect(self):
-        self.redis = await aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        """
+        Створює клієнт Redis із пулом з'єднань фіксованого розміру.
+
+        Якщо всі ``REDIS_MAX_CONNECTIONS`` з'єднань зайняті, запит чекає на
+        вільне не довше ``REDIS_POOL_TIMEOUT`` секунд.
+        """
+        from redis import asyncio as aioredis
+
+        pool = aioredis.BlockingConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        )
+        self.redis = aioredis.Redis(connection_pool=pool)
+        if settings.CACHE_LOCAL_ENABLED and self.local is None:
+            self.local = LocalCache()
+        if self.local is not None:
+            self.start_listener()
+
+    def start_listener(self) -> None:
+        """
+        Запускає фонове прослуховування каналу інвалідації.
+        """
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while self._listener is not None:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+                    # Повідомлення, надіслані до підписки, втрачено.
+                    self._invalidate_local(None)
+                    # Скасування задачі може бути поглинуте тайм-аутом читання
+                    # redis-py, тому цикл також перевіряє, чи слухач ще потрібен.
+                    while self._listener is not None:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=1.0
+                        )
+                        if message is not None:
+                            origin, keys = msgpack.unpackb(message["data"])
+                            if origin != self.instance_id:
+                                self._invalidate_local(keys)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Cache invalidation channel failed: %s", e)
+                self._invalidate_local(None)
+                await asyncio.sleep(1)
+
+    def _invalidate_local(self, keys: list[str] | None) -> None:
+        self._invalidations += 1
+        if keys is None:
+            self.local.clear()
+        else:
+            self.local.delete(keys)
+        CACHE_LOCAL_ENTRIES.set(len(self.local))
+
+    def _record(self, tier: str, result: str) -> None:
+        self.stats[tier][result] += 1
+        CACHE_TIER_REQUESTS.labels(tier, result).inc()
+
+    def _decode(self, key: str, data: Optional[bytes], tier: str = "redis"):
+        if data is None:
+            self._record(tier, "miss")
+            if tier == "redis":
+                CACHE_REQUESTS.labels("miss").inc()
+            return None
+        try:
+            entry = codec.loads_entry(data)
+        except StaleEntry as e:
+            self._record(tier, "stale")
+            CACHE_REQUESTS.labels("stale").inc()
+            logger.debug("Ignoring cache entry %s: %s", key, e)
+            return None
+        self._record(tier, "hit")
+        CACHE_REQUESTS.labels("hit").inc()
+        return entry
+
+    def _get_local(self, key: str):
+        if self.local is None:
+            return None
+        return self._decode(key, self.local.get(key), tier="local")
+
+    async def _get_entry(self, key: str):
+        entry = self._get_local(key)
+        if entry is not None:
+            return entry
+        invalidations = self._invalidations
+        with timed("cache"), CACHE_LATENCY.labels("get").time():
+            data = await self.redis.get(key)
+        entry = self._decode(key, data)
+        if entry is not None and invalidations == self._invalidations:
+            self._set_local(key, data)
+        return entry
+
+    @staticmethod
+    def _fresh(entry) -> bool:
+        fresh_until = entry[1]
+        return fresh_until is None or fresh_until > time.time()
+
+    def _set_local(self, key: str, data: bytes, expire: int | None = None) -> None:
+        if self.local is not None:
+            self.local.set(key, data, expire)
+            CACHE_LOCAL_ENTRIES.set(len(self.local))
+
+    def _publish(self, pipe, keys: list[str]) -> None:
+        if self.local is not None:
+            # Читання, що вже чекають на Redis, не покладуть у локальний
+            # рівень значення, старіше за цей запис.
+            self._invalidations += 1
+            pipe.publish(
+                settings.CACHE_INVALIDATION_CHANNEL,
+                msgpack.packb([self.instance_id, keys]),
+            )
 
-    async def set(self, key: str, value: dict, expire: int = 3600):
-        """Зберігає об'єкт у Redis на певний час"""
-        await self.redis.setex(key, expire, json.dumps(value))
+    def tier_stats(self) -> dict:
+        """
+        Статистика звернень до кожного рівня кешу в цьому воркері.
 
-    async def get(self, key: str) -> Optional[dict]:
-        """Отримує дані з Redis"""
-        data = await self.redis.get(key)
-        if data:
-            return json.loads(data)
+        :return: Для кожного рівня — влучання, промахи та частка влучань.
+        """
+        result = {}
+        for tier, counts in self.stats.items():
+            total = sum(counts.values())
+            result[tier] = {
+                "hits": counts["hit"],
+                "misses": counts["miss"],
+                "stale": counts["stale"],
+                "hit_ratio": round(counts["hit"] / total, 4) if total else None,
+            }
+        result["local"]["enabled"] = self.local is not None
+        result["local"]["entries"] = len(self.local) if self.local is not None else 0
+        return result
+
+    async def set(
+        self,
+        key: str,
+        value,
+        expire: int = 3600,
+        schema: type[BaseModel] | None = None,
+        tags: Iterable[str] = (),
+    ):
+        """
+        Зберігає об'єкт у Redis на певний час.
+
+        :param key: Ключ.
+        :param value: Модель, ORM-об'єкт (разом зі ``schema``) або просте значення.
+        :param expire: Час життя в секундах.
+        :param schema: Зареєстрована модель, до якої приводиться ``value``.
+        :param tags: Теги для ``invalidate_tags``.
+        """
+        await self._write(key, codec.dumps(value, schema), expire, tags)
+
+    async def _write(
+        self, key: str, data: bytes, expire: int, tags: Iterable[str] = ()
+    ) -> None:
+        tags = list(tags)
+        with timed("cache"), CACHE_LATENCY.labels("set").time():
+            if self.local is None and not tags:
+                await self.redis.setex(key, expire, data)
+            else:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.setex(key, expire, data)
+                    for tag in tags:
+                        # Тег має жити не менше за найдовший запис у ньому.
+                        tag_key = f"tag:{tag}"
+                        pipe.sadd(tag_key, key)
+                        pipe.expire(tag_key, expire, nx=True)
+                        pipe.expire(tag_key, expire, gt=True)
+                    self._publish(pipe, [key])
+                    await pipe.execute()
+        self._set_local(key, data, expire)
+
+    async def invalidate_tags(self, *tags: str) -> list[str]:
+        """
+        Атомарно видаляє всі записи, позначені будь-яким із тегів.
+
+        :param tags: Теги.
+        :return: Видалені ключі.
+        """
+        if not tags:
+            return []
+        tag_keys = [f"tag:{tag}" for tag in tags]
+        with timed("cache"), CACHE_LATENCY.labels("invalidate").time():
+            deleted = await self.redis.eval(INVALIDATE_TAGS, len(tag_keys), *tag_keys)
+            deleted = [key.decode() for key in deleted]
+            if self.local is not None and deleted:
+                self.local.delete(deleted)
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    self._publish(pipe, deleted)
+                    await pipe.execute()
+        return deleted
+
+    async def get(self, key: str):
+        """
+        Отримує дані з Redis.
+
+        :param key: Ключ.
+        :return: Збережене значення або None, якщо запису немає чи він застарів.
+        """
+        entry = await self._get_entry(key)
+        if entry is None or not self._fresh(entry):
+            return None
+        return entry[0]
+
+    async def get_many(self, keys: Iterable[str]) -> dict:
+        """
+        Отримує кілька значень однією командою ``MGET``.
+
+        :param keys: Ключі.
+        :return: Словник ``ключ -> значення`` лише для знайдених записів.
+        """
+        entries = {}
+        missing = []
+        for key in keys:
+            entry = self._get_local(key)
+            if entry is not None:
+                entries[key] = entry
+            else:
+                missing.append(key)
+        if missing:
+            invalidations = self._invalidations
+            with timed("cache"), CACHE_LATENCY.labels("get_many").time():
+                values = await self.redis.mget(missing)
+            for key, data in zip(missing, values):
+                entry = self._decode(key, data)
+                if entry is not None:
+                    entries[key] = entry
+                    if invalidations == self._invalidations:
+                        self._set_local(key, data)
+        return {key: entry[0] for key, entry in entries.items() if self._fresh(entry)}
+
+    async def set_many(
+        self,
+        mapping: dict,
+        expire: int = 3600,
+        schema: type[BaseModel] | None = None,
+    ):
+        """
+        Зберігає кілька значень за один мережевий обмін (pipeline).
+
+        :param mapping: Словник ``ключ -> значення``.
+        :param expire: Час життя кожного запису в секундах.
+        :param schema: Зареєстрована модель, до якої приводяться значення.
+        """
+        if not mapping:
+            return
+        encoded = {key: codec.dumps(value, schema) for key, value in mapping.items()}
+        with timed("cache"), CACHE_LATENCY.labels("set_many").time():
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, data in encoded.items():
+                    pipe.setex(key, expire, data)
+                self._publish(pipe, list(encoded))
+                await pipe.execute()
+        for key, data in encoded.items():
+            self._set_local(key, data, expire)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable],
+        expire: int = 3600,
+        schema: type[BaseModel] | None = None,
+        stale_ttl: int = settings.CACHE_STALE_TTL,
+        beta: float = settings.CACHE_EARLY_EXPIRY_BETA,
+        tags: Iterable[str] | Callable[..., Iterable[str]] = (),
+    ):
+        """
+        Повертає значення з кешу або обчислює й зберігає його.
+
+        - Свіже значення повертається одразу. Чим ближче кінець свіжості і чим
+          довше значення обчислюється, тим імовірніше, що запит запустить
+          дострокове фонове оновлення (XFetch, коефіцієнт ``beta``).
+        - Протягом ``stale_ttl`` секунд після завершення свіжості повертається
+          застаріле значення, а оновлення виконується у фоні.
+        - Якщо значення немає, його обчислює одна задача на воркер під
+          блокуванням Redis; інші воркери чекають на результат.
+
+        ``compute`` може виконуватися після завершення запиту, тому не має
+        використовувати сесію бази даних запиту, якщо ``stale_ttl`` або
+        ``beta`` більші за нуль. Коли обидва дорівнюють нулю, значення завжди
+        обчислюється в межах виклику.
+
+        :param key: Ключ.
+        :param compute: Асинхронна функція без аргументів, що повертає значення.
+            None не кешується.
+        :param expire: Час свіжості в секундах.
+        :param schema: Зареєстрована модель, до якої приводиться значення.
+        :param stale_ttl: Скільки секунд після завершення свіжості можна
+            віддавати застаріле значення.
+        :param beta: Коефіцієнт дострокового оновлення; 0 вимикає його.
+        :param tags: Теги запису або функція, що отримує обчислене значення
+            й повертає теги.
+        :return: Значення (екземпляр ``schema``, якщо її задано) або None.
+        """
+        options = (expire, schema, stale_ttl, tags)
+        entry = await self._get_entry(key)
+        if entry is not None:
+            value, fresh_until, delta = entry
+            if fresh_until is None:
+                return value
+            remaining = fresh_until - time.time()
+            if remaining > 0:
+                # 1 - random() лежить у (0, 1], тож логарифм визначений.
+                early = -delta * beta * math.log(1.0 - random.random())
+                if early < remaining:
+                    return value
+                reason = "early"
+            else:
+                reason = "stale"
+            if reason == "early" or stale_ttl > 0:
+                if key not in self._inflight:
+                    CACHE_COMPUTES.labels(reason).inc()
+                    self._start_compute(key, compute, options, True)
+                return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            CACHE_COMPUTES.labels("miss").inc()
+            task = self._start_compute(key, compute, options, False)
+        return await asyncio.shield(task)
+
+    def _start_compute(self, key, compute, options, background):
+        task = asyncio.create_task(self._compute(key, compute, options, background))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        if background:
+            task.add_done_callback(self._log_failure)
+        return task
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background cache refresh failed: %s", task.exception())
+
+    async def _compute(self, key, compute, options, background):
+        expire, schema, stale_ttl, tags = options
+        lock = f"lock:{key}"
+        token = uuid.uuid4().hex
+        lock_timeout = settings.CACHE_LOCK_TIMEOUT
+        acquired = await self.redis.set(
+            lock, token, nx=True, px=int(lock_timeout * 1000)
+        )
+        if not acquired:
+            if background:
+                # Значення вже оновлює інший воркер.
+                return None
+            entry = await self._wait_for_entry(key, lock_timeout)
+            if entry is not None:
+                return entry[0]
+        try:
+            start = time.perf_counter()
+            value = await compute()
+            delta = time.perf_counter() - start
+            if value is None:
+                return None
+            if schema is not None:
+                value = schema.model_validate(value, from_attributes=True)
+            data = codec.dumps(value, schema, time.time() + expire, delta)
+            if callable(tags):
+                tags = tags(value)
+            await self._write(key, data, expire + stale_ttl, tags)
+            return value
+        finally:
+            if acquired:
+                await self.redis.eval(RELEASE_LOCK, 1, lock, token)
+
+    async def _wait_for_entry(self, key: str, timeout: float):
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.1)
+            with timed("cache"), CACHE_LATENCY.labels("get").time():
+                data = await self.redis.get(key)
+            if data is not None:
+                try:
+                    entry = codec.loads_entry(data)
+                except StaleEntry:
+                    continue
+                if self._fresh(entry):
+                    return entry
         return None
 
-    async def delete(self, key: str):
-        """Видаляє ключ із Redis"""
-        await self.redis.delete(key)
+    async def delete(self, *keys: str):
+        """
+        Видаляє ключі з Redis однією командою.
+
+        :param keys: Ключі.
+        """
+        if self.local is not None:
+            self.local.delete(keys)
+        with timed("cache"), CACHE_LATENCY.labels("delete").time():
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.delete(*keys)
+                self._publish(pipe, list(keys))
+                await pipe.execute()
 
     async def close(self):
         """Закриває підключення до Redis"""
-        await self.redis.close()
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.cancel()
+            try:
+                await listener
+            except asyncio.CancelledError:
+                pass
+        await self.redis.aclose(close_connection_pool=True)
 
 
 redis_cache = RedisCache()
@@ -0,0 +1,253 @@
+"""
+Декларативний кеш методів репозиторіїв.
+
+Методи читання позначаються :func:`cached` із шаблоном ключа, часом життя й
+тегами, методи запису — :func:`invalidates` із тегами, які вони роблять
+недійсними::
+
+    @cached(User, "user:{user_id}", tags=["user:{user_id}"])
+    async def get_user_by_id(self, user_id: int) -> User | None: ...
+
+    @invalidates("user:{user_id}")
+    async def update_user(self, user_id: int, data: dict) -> User | None: ...
+
+Шаблони форматуються аргументами методу (``{user.id}`` теж працює), шаблони
+тегів читання й запису можуть посилатися на результат (``{result.id}``).
+Інвалідація тегу видаляє всі записи з ним одним Lua-скриптом у Redis
+(:meth:`RedisCache.invalidate_tags`).
+
+У кеші зберігаються значення колонок ORM-рядків. Під час влучання рядки
+відновлюються та приєднуються до сесії репозиторію без ``SELECT``, тож
+викликач отримує ті самі ORM-об'єкти, що й без кешу. Значення завжди
+обчислюється в межах виклику (без фонового оновлення), бо обчислення
+використовує сесію запиту.
+
+Кеш вимикається через ``REPOSITORY_CACHE_ENABLED``, за відсутності Redis і
+всередині :func:`uncached`. Якщо Redis недоступний, методи читання йдуть у
+базу даних, а методи запису лише записують помилку інвалідації в журнал.
+"""
+
+import contextlib
+import contextvars
+import enum
+import functools
+import inspect
+import logging
+from datetime import date, datetime
+from types import SimpleNamespace
+from typing import Iterable
+
+from sqlalchemy import Date, DateTime, Enum
+from sqlalchemy import inspect as sa_inspect
+from redis.exceptions import RedisError
+from sqlalchemy.orm import make_transient_to_detached
+
+from src.conf.config import settings
+from src.services.redis_cache import redis_cache
+
+logger = logging.getLogger(__name__)
+
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "repository_cache_bypass", default=False
+)
+
+
+@contextlib.contextmanager
+def uncached():
+    """
+    Контекстний менеджер, що виконує методи репозиторіїв повз кеш.
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def _enabled() -> bool:
+    return (
+        settings.REPOSITORY_CACHE_ENABLED
+        and redis_cache.redis is not None
+        and not _bypass.get()
+    )
+
+
+def _arguments(signature: inspect.Signature, args, kwargs) -> dict:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return bound.arguments
+
+
+def _format_tags(templates: Iterable[str], arguments: dict, result) -> list[str]:
+    tags = []
+    for template in templates:
+        try:
+            tags.append(template.format(**arguments, result=result))
+        except (AttributeError, KeyError):
+            # Тег залежить від результату, якого немає (наприклад, None).
+            continue
+    return tags
+
+
+def _dump_row(row, exclude: frozenset[str]) -> dict:
+    values = {}
+    for attr in sa_inspect(type(row)).column_attrs:
+        if attr.key in exclude:
+            continue
+        value = getattr(row, attr.key)
+        if isinstance(value, enum.Enum):
+            value = value.value
+        elif isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        values[attr.key] = value
+    return values
+
+
+def _load_row(model, values: dict, exclude: frozenset[str]):
+    attrs = [attr for attr in sa_inspect(model).column_attrs if attr.key not in exclude]
+    if set(values) != {attr.key for attr in attrs}:
+        raise ValueError(f"Cached {model.__name__} has different columns")
+    row = model()
+    for attr in attrs:
+        value = values[attr.key]
+        column_type = attr.columns[0].type
+        if value is not None:
+            if isinstance(column_type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(column_type, Date):
+                value = date.fromisoformat(value)
+            elif isinstance(column_type, Enum) and column_type.enum_class:
+                value = column_type.enum_class(value)
+        setattr(row, attr.key, value)
+    make_transient_to_detached(row)
+    return row
+
+
+def _dump(result, exclude: frozenset[str]):
+    if isinstance(result, (list, tuple)):
+        return [_dump_row(row, exclude) for row in result]
+    return _dump_row(result, exclude)
+
+
+async def _load(session, model, payload, exclude: frozenset[str]):
+    if isinstance(payload, list):
+        return [
+            await session.merge(_load_row(model, values, exclude), load=False)
+            for values in payload
+        ]
+    return await session.merge(_load_row(model, payload, exclude), load=False)
+
+
+def cached(
+    model,
+    key: str,
+    ttl: int | None = None,
+    tags: Iterable[str] = (),
+    exclude: Iterable[str] = (),
+):
+    """
+    Декоратор методу читання: кешує його результат у Redis.
+
+    Метод має повертати ORM-об'єкт ``model``, список таких об'єктів або None
+    (None не кешується — для цього є негативний кеш).
+
+    :param model: ORM-модель результату.
+    :param key: Шаблон ключа кешу.
+    :param ttl: Час життя в секундах; за замовчуванням ``REPOSITORY_CACHE_TTL``.
+    :param tags: Шаблони тегів запису.
+    :param exclude: Колонки, які не зберігаються в Redis (наприклад, хеш
+        пароля). Після влучання вони не завантажені, тож код, якому вони
+        потрібні, має викликати метод усередині :func:`uncached`.
+    :return: Декоратор.
+    """
+    tags = tuple(tags)
+    exclude = frozenset(exclude)
+
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            if not _enabled():
+                return await method(self, *args, **kwargs)
+            arguments = _arguments(signature, (self, *args), kwargs)
+            computed = []
+
+            async def compute():
+                result = await method(self, *args, **kwargs)
+                computed.append(result)
+                return None if result is None else _dump(result, exclude)
+
+            def entry_tags(payload) -> list[str]:
+                result = payload
+                if isinstance(payload, dict):
+                    result = SimpleNamespace(**payload)
+                return _format_tags(tags, arguments, result)
+
+            try:
+                payload = await redis_cache.get_or_compute(
+                    key.format(**arguments),
+                    compute,
+                    expire=ttl or settings.REPOSITORY_CACHE_TTL,
+                    stale_ttl=0,
+                    beta=0,
+                    tags=entry_tags,
+                )
+            except RedisError as e:
+                logger.warning("Repository cache is unavailable: %s", e)
+                if computed:
+                    return computed[0]
+                return await method(self, *args, **kwargs)
+            if computed:
+                return computed[0]
+            if payload is None:
+                return None
+            try:
+                return await _load(self.db, model, payload, exclude)
+            except (ValueError, TypeError):
+                # Схема таблиці змінилася після запису: читаємо з бази даних.
+                return await method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def invalidates(*tags: str):
+    """
+    Декоратор методу запису: після його виконання видаляє записи з тегами.
+
+    Шаблони з ``{result...}`` форматуються поверненим значенням, тому метод
+    має повертати оновлений (не прострочений після ``commit``) об'єкт.
+
+    :param tags: Шаблони тегів.
+    :return: Декоратор.
+    """
+    by_result = [tag for tag in tags if "{result" in tag]
+    by_arguments = [tag for tag in tags if "{result" not in tag]
+
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            # Аргументи форматуються до виклику: після commit ORM-об'єкти
+            # прострочені, і читання їхніх атрибутів вимагало б запиту.
+            arguments = _arguments(signature, (self, *args), kwargs)
+            before = _format_tags(by_arguments, arguments, None)
+            result = await method(self, *args, **kwargs)
+            if settings.REPOSITORY_CACHE_ENABLED and redis_cache.redis is not None:
+                after = _format_tags(by_result, arguments, result)
+                try:
+                    await redis_cache.invalidate_tags(*before, *after)
+                except RedisError as e:
+                    logger.warning(
+                        "Repository cache tags %s were not invalidated: %s",
+                        [*before, *after],
+                        e,
+                    )
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,205 @@
+"""
+Кеш готових HTTP-відповідей у Redis.
+
+Відповіді зберігаються вже стисненими в усіх кодуваннях із
+:data:`src.services.compression.ENCODINGS`, тож влучання в кеш не витрачає
+процесор на повторне стиснення: ``CompressionMiddleware`` пропускає
+відповіді з ``Content-Encoding`` без змін. Тіла, менші за
+``COMPRESSION_MIN_SIZE``, зберігаються нестисненими. Стиснення виконується
+в пулі потоків, щоб не блокувати цикл подій.
+
+Кожна сторінка — окремий хеш Redis зі своїм часом життя, а ключ сторінки
+містить покоління власника. Інвалідація після зміни даних збільшує
+покоління (одна команда ``INCR``), і старі сторінки стають недосяжними, доки
+не зникнуть самі. :meth:`ResponseCache.get` повертає покоління, яке бачив
+запит, а :meth:`ResponseCache.set` записує сторінку лише тоді, коли
+покоління не змінилося, тож відповідь, зібрана до інвалідації, не потрапить
+у кеш після неї.
+
+Без Redis або під час його збою кеш пропускається.
+"""
+
+import logging
+
+from fastapi import Request, Response
+from redis.exceptions import RedisError
+from starlette.concurrency import run_in_threadpool
+
+from src.conf.config import settings
+from src.services.compression import (
+    ENCODINGS,
+    choose_encoding,
+    compress,
+    decompress,
+)
+from src.services.instrumentation import timed
+from src.services.metrics import CACHE_LATENCY, CACHE_REQUESTS
+from src.services.redis_cache import redis_cache
+
+logger = logging.getLogger(__name__)
+
+IDENTITY = "identity"
+
+GET_PAGE = """
+local generation = redis.call("get", KEYS[1]) or "0"
+local page = KEYS[1] .. ":" .. generation .. ":" .. ARGV[1]
+return {generation, redis.call("hmget", page, unpack(ARGV, 2))}
+"""
+
+SET_PAGE = """
+local generation = redis.call("get", KEYS[1]) or "0"
+if generation ~= ARGV[1] then
+    return 0
+end
+local page = KEYS[1] .. ":" .. generation .. ":" .. ARGV[2]
+redis.call("hset", page, unpack(ARGV, 4))
+redis.call("expire", page, ARGV[3])
+if generation ~= "0" then
+    -- Покоління має жити довше за свої сторінки.
+    redis.call("expire", KEYS[1], ARGV[3])
+end
+return 1
+"""
+
+
+class ResponseCache:
+    """
+    Кеш відповідей, згрупованих за власником.
+
+    :param prefix: Префікс ключів Redis.
+    :param expire: Час життя записів у секундах.
+    :param minimum_size: Розмір тіла, починаючи з якого воно зберігається стисненим.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        expire: int = settings.RESPONSE_CACHE_TTL,
+        minimum_size: int = settings.COMPRESSION_MIN_SIZE,
+    ):
+        self.prefix = prefix
+        self.expire = expire
+        self.minimum_size = minimum_size
+
+    def _key(self, owner) -> str:
+        return f"{self.prefix}:{owner}"
+
+    async def get(
+        self, owner, page: str, request: Request
+    ) -> tuple[Response | None, int | None]:
+        """
+        Повертає збережену відповідь у кодуванні, яке приймає клієнт.
+
+        :param owner: Власник даних (наприклад, ID користувача).
+        :param page: Ідентифікатор сторінки всередині власника.
+        :param request: Запит FastAPI.
+        :return: Готова відповідь (None, якщо запису немає) і покоління
+            власника для :meth:`set` (None, якщо кеш вимкнено чи Redis
+            недоступний).
+        """
+        if not settings.RESPONSE_CACHE_ENABLED or redis_cache.redis is None:
+            return None, None
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        fields = ["media_type", IDENTITY, "gzip"]
+        if encoding not in (None, "gzip"):
+            fields.append(encoding)
+        try:
+            with timed("cache"), CACHE_LATENCY.labels("get").time():
+                generation, values = await redis_cache.redis.eval(
+                    GET_PAGE, 1, self._key(owner), page, *fields
+                )
+        except RedisError as e:
+            logger.warning("Response cache is unavailable: %s", e)
+            return None, None
+        generation = int(generation)
+        media_type, identity, gzipped, *preferred = values
+        if media_type is None:
+            CACHE_REQUESTS.labels("miss").inc()
+            return None, generation
+        CACHE_REQUESTS.labels("hit").inc()
+
+        if identity is not None:
+            body, content_encoding = identity, None
+        elif preferred and preferred[0] is not None:
+            body, content_encoding = preferred[0], encoding
+        elif encoding == "gzip":
+            body, content_encoding = gzipped, "gzip"
+        else:
+            body, content_encoding = decompress(gzipped, "gzip"), None
+
+        headers = {"Vary": "Accept"}
+        if content_encoding is not None:
+            headers["Vary"] = "Accept, Accept-Encoding"
+            headers["Content-Encoding"] = content_encoding
+        response = Response(body, media_type=media_type.decode(), headers=headers)
+        return response, generation
+
+    def _encode(self, body: bytes) -> dict[str, bytes]:
+        if len(body) < self.minimum_size:
+            return {IDENTITY: body}
+        return {encoding: compress(body, encoding) for encoding in ENCODINGS}
+
+    async def set(
+        self, owner, page: str, response: Response, generation: int | None
+    ) -> bool:
+        """
+        Зберігає відповідь, попередньо стиснувши її в усіх кодуваннях.
+
+        :param owner: Власник даних.
+        :param page: Ідентифікатор сторінки всередині власника.
+        :param response: Відрендерена відповідь.
+        :param generation: Покоління, повернуте :meth:`get` до побудови
+            відповіді.
+        :return: True, якщо відповідь збережено; False, якщо дані власника
+            змінилися після :meth:`get` або кеш недоступний.
+        """
+        if (
+            not settings.RESPONSE_CACHE_ENABLED
+            or redis_cache.redis is None
+            or generation is None
+        ):
+            return False
+        encoded = await run_in_threadpool(self._encode, response.body)
+        mapping = [
+            value
+            for field, body in (("media_type", response.media_type), *encoded.items())
+            for value in (field, body)
+        ]
+        try:
+            with timed("cache"), CACHE_LATENCY.labels("set").time():
+                stored = await redis_cache.redis.eval(
+                    SET_PAGE,
+                    1,
+                    self._key(owner),
+                    generation,
+                    page,
+                    self.expire,
+                    *mapping,
+                )
+        except RedisError as e:
+            logger.warning("Response cache is unavailable: %s", e)
+            return False
+        return bool(stored)
+
+    async def invalidate(self, owner) -> None:
+        """
+        Робить недосяжними всі збережені відповіді власника.
+
+        :param owner: Власник даних.
+        """
+        if redis_cache.redis is None:
+            return
+        key = self._key(owner)
+        try:
+            with timed("cache"), CACHE_LATENCY.labels("delete").time():
+                async with redis_cache.redis.pipeline(transaction=True) as pipe:
+                    pipe.incr(key)
+                    pipe.expire(key, self.expire)
+                    await pipe.execute()
+        except RedisError as e:
+            # Старі сторінки зникнуть самі після закінчення ``expire``.
+            logger.warning("Response cache of %s was not invalidated: %s", key, e)
+
+
+contact_pages = ResponseCache("responses:contacts")
+"""Сторінки ``GET /api/contacts/`` кожного користувача."""
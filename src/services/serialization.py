@@ -0,0 +1,90 @@
+"""
+Формати відповідей API.
+
+JSON-відповіді застосунку кодуються через ``orjson`` (``ORJSONResponse`` —
+клас відповіді за замовчуванням). Ендпоінти зі списками контактів додатково
+віддають MessagePack, якщо клієнт надіслав ``Accept: application/msgpack``.
+"""
+
+from typing import Any
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+MSGPACK_RESPONSES = {
+    200: {
+        "content": {MSGPACK_MEDIA_TYPE: {}},
+        "description": "JSON або MessagePack залежно від заголовка ``Accept``.",
+    }
+}
+"""Опис альтернативного формату для ``responses`` у декораторі маршруту."""
+
+
+class MsgPackResponse(Response):
+    """
+    Відповідь у форматі MessagePack.
+
+    Вміст має бути JSON-сумісним (дати — рядки ISO 8601), щоб клієнти
+    отримували однакові дані в обох форматах.
+    """
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content)
+
+
+def wants_msgpack(request: Request) -> bool:
+    """
+    Перевіряє, чи клієнт запросив MessagePack.
+
+    :param request: Запит FastAPI.
+    :return: True, якщо ``Accept`` містить тип MessagePack.
+    """
+    accept = request.headers.get("accept", "")
+    return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def render(request: Request, adapter: TypeAdapter, data) -> Response:
+    """
+    Серіалізує ``data`` у формат, який запросив клієнт.
+
+    :param request: Запит FastAPI.
+    :param adapter: Схема для перетворення ``data`` на JSON-сумісні дані.
+    :param data: Результат обробника.
+    :return: ``MsgPackResponse`` або ``ORJSONResponse``.
+    """
+    content = adapter.dump_python(
+        adapter.validate_python(data, from_attributes=True), mode="json"
+    )
+    response_class = MsgPackResponse if wants_msgpack(request) else ORJSONResponse
+    return response_class(content, headers={"Vary": "Accept"})
+
+
+def negotiate(request: Request, response: Response, adapter: TypeAdapter, data):
+    """
+    Повертає MessagePack-відповідь, якщо клієнт її запросив.
+
+    Інакше повертає ``data`` без змін, і FastAPI серіалізує його як JSON
+    за ``response_model`` маршруту. Заголовки, задані залежностями у
+    ``response``, переносяться й у MessagePack-відповідь.
+
+    :param request: Запит FastAPI.
+    :param response: Відповідь маршруту (для заголовків).
+    :param adapter: Схема для перетворення ``data`` на JSON-сумісні дані.
+    :param data: Результат обробника.
+    :return: ``MsgPackResponse`` або ``data``.
+    """
+    if not wants_msgpack(request):
+        response.headers["Vary"] = "Accept"
+        return data
+    rendered = render(request, adapter, data)
+    for name, value in response.headers.items():
+        if name not in ("content-length", "content-type"):
+            rendered.headers[name] = value
+    return rendered
@@ -0,0 +1,267 @@
+"""
+Журнал повільних SQL-запитів.
+
+Якщо запит, виконаний з методу ``ContactRepository`` або ``UserRepository``,
+триває довше за ``SLOW_QUERY_THRESHOLD_MS``, у журнал записуються текст запиту,
+замасковані параметри, тривалість і метод репозиторію, що його виконав.
+
+План виконання (``EXPLAIN``, за бажанням ``EXPLAIN ANALYZE``) знімається
+фоновою задачею поза обробкою HTTP-запиту. Записи семплюються та обмежуються
+за частотою, щоб журналювання не стало вузьким місцем.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import itertools
+import logging
+import random
+import time
+from collections import deque
+from datetime import datetime, UTC
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.conf.config import settings
+
+logger = logging.getLogger(__name__)
+
+_repository_method: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "repository_method", default=None
+)
+_explaining: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "explaining", default=False
+)
+
+
+def track_repository(cls):
+    """
+    Декоратор класу репозиторію: запам'ятовує, який метод виконує SQL-запит.
+
+    :param cls: Клас репозиторію.
+    :return: Той самий клас з обгорнутими публічними асинхронними методами.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+        setattr(cls, name, _track_method(method, f"{cls.__name__}.{name}"))
+    return cls
+
+
+def _track_method(method, qualified_name: str):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = _repository_method.set(qualified_name)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            _repository_method.reset(token)
+
+    return wrapper
+
+
+def redact_parameters(parameters):
+    """
+    Маскує параметри запиту для журналу.
+
+    Числа, булеві значення та None залишаються як є, решта замінюється
+    описом типу, щоб у журнал не потрапили email, паролі чи інші дані.
+
+    :param parameters: Параметри запиту (кортеж, список або словник).
+    :return: Параметри з замаскованими значеннями.
+    """
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(value) for value in parameters]
+    return _redact_value(parameters)
+
+
+def _redact_value(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple, dict)):
+        return redact_parameters(value)
+    return f"<{type(value).__name__}>"
+
+
+class SlowQueryLog:
+    """
+    Журнал повільних запитів із фоновим зняттям планів виконання.
+
+    :param threshold_ms: Поріг тривалості запиту в мілісекундах.
+    :param sample_rate: Частка повільних запитів, що потрапляють у журнал (0..1).
+    :param max_per_second: Максимальна кількість записів на секунду.
+    :param size: Кількість останніх записів, що зберігаються.
+    :param explain_analyze: Чи використовувати ``EXPLAIN ANALYZE``.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = settings.SLOW_QUERY_THRESHOLD_MS,
+        sample_rate: float = settings.SLOW_QUERY_SAMPLE_RATE,
+        max_per_second: float = settings.SLOW_QUERY_MAX_PER_SECOND,
+        size: int = settings.SLOW_QUERY_LOG_SIZE,
+        explain_analyze: bool = settings.SLOW_QUERY_EXPLAIN_ANALYZE,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.sample_rate = sample_rate
+        self.max_per_second = max_per_second
+        self.explain_analyze = explain_analyze
+        self.entries: deque[dict] = deque(maxlen=size)
+        self._tokens = max_per_second
+        self._last_refill = time.monotonic()
+        self._ids = itertools.count(1)
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._engine: AsyncEngine | None = None
+
+    def install(self, engine: AsyncEngine) -> None:
+        """
+        Підключає журнал до подій виконання запитів рушія.
+
+        :param engine: Асинхронний рушій бази даних.
+        """
+        sync_engine = engine.sync_engine
+        if event.contains(sync_engine, "after_cursor_execute", self._after_execute):
+            return
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_execute)
+
+    def start(self, engine: AsyncEngine) -> None:
+        """
+        Запускає фонову задачу зняття планів виконання.
+
+        :param engine: Рушій, через який виконується ``EXPLAIN``.
+        """
+        self._engine = engine
+        self._queue = asyncio.Queue(maxsize=self.entries.maxlen)
+        self._worker = asyncio.create_task(self._explain_worker())
+
+    async def stop(self) -> None:
+        """
+        Зупиняє фонову задачу зняття планів виконання.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+        self._queue = None
+
+    def recent(self, limit: int = 50) -> list[dict]:
+        """
+        Повертає останні записи журналу, новіші — першими.
+
+        :param limit: Максимальна кількість записів.
+        :return: Список записів журналу.
+        """
+        return list(itertools.islice(reversed(self.entries), limit))
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, many):
+        # Як і в :mod:`src.services.instrumentation`, час зберігається в
+        # контексті: для запиту з помилкою ``_after_execute`` не викликається.
+        context._slow_query_start = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, many):
+        duration = time.perf_counter() - context._slow_query_start
+        if duration < self.threshold or _explaining.get():
+            return
+        method = _repository_method.get()
+        if method is None or not self._admit():
+            return
+        self.record(statement, parameters, duration, method, conn.dialect.name)
+
+    def _admit(self) -> bool:
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return False
+        now = time.monotonic()
+        self._tokens = min(
+            self.max_per_second,
+            self._tokens + (now - self._last_refill) * self.max_per_second,
+        )
+        self._last_refill = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def record(
+        self,
+        statement: str,
+        parameters,
+        duration: float,
+        method: str,
+        dialect: str,
+    ) -> dict:
+        """
+        Додає повільний запит у журнал і ставить його в чергу на ``EXPLAIN``.
+
+        :param statement: Текст SQL-запиту.
+        :param parameters: Параметри запиту (у журнал потрапляють замаскованими).
+        :param duration: Тривалість у секундах.
+        :param method: Метод репозиторію, що виконав запит.
+        :param dialect: Назва діалекту бази даних.
+        :return: Створений запис журналу.
+        """
+        entry = {
+            "id": next(self._ids),
+            "timestamp": datetime.now(UTC).isoformat(),
+            "repository_method": method,
+            "duration_ms": round(duration * 1000, 2),
+            "statement": statement,
+            "parameters": redact_parameters(parameters),
+            "plan": None,
+        }
+        self.entries.append(entry)
+        logger.warning(
+            "Slow query in %s (%.1f ms): %s %s",
+            method,
+            entry["duration_ms"],
+            statement,
+            entry["parameters"],
+        )
+        if self._queue is not None and statement.lstrip().upper().startswith("SELECT"):
+            try:
+                self._queue.put_nowait((entry, statement, parameters, dialect))
+            except asyncio.QueueFull:
+                pass
+        return entry
+
+    def _explain_prefix(self, dialect: str) -> str:
+        if dialect == "sqlite":
+            return "EXPLAIN QUERY PLAN "
+        if dialect == "postgresql" and self.explain_analyze:
+            return "EXPLAIN (ANALYZE, BUFFERS) "
+        return "EXPLAIN "
+
+    async def _explain_worker(self):
+        _explaining.set(True)
+        while True:
+            entry, statement, parameters, dialect = await self._queue.get()
+            try:
+                async with self._engine.connect() as conn:
+                    result = await conn.exec_driver_sql(
+                        self._explain_prefix(dialect) + statement, parameters
+                    )
+                    entry["plan"] = [
+                        " ".join(str(value) for value in row) for row in result
+                    ]
+            except Exception as e:
+                logger.warning("EXPLAIN failed for slow query %s: %s", entry["id"], e)
+            finally:
+                self._queue.task_done()
+
+    async def join(self) -> None:
+        """
+        Очікує, доки всі поставлені в чергу плани будуть зняті.
+        """
+        if self._queue is not None:
+            await self._queue.join()
+
+
+slow_query_log = SlowQueryLog()
@@ -1,7 +1,3 @@
-import cloudinary
-import cloudinary.uploader
-
-
 class UploadFileService:
     """
     Сервіс для завантаження файлів у Cloudinary.
@@ -25,6 +21,9 @@ class UploadFileService:
         self.cloud_name = cloud_name
         self.api_key = api_key
         self.api_secret = api_secret
+        # Cloudinary SDK імпортується лише під час використання сервісу.
+        import cloudinary
+
         cloudinary.config(
             cloud_name=self.cloud_name,
             api_key=self.api_key,
@@ -44,6 +43,9 @@ class UploadFileService:
         :return: URL зображення, обробленого Cloudinary.
         :rtype: str
         """
+        import cloudinary
+        import cloudinary.uploader
+
         public_id = f"RestApp/{username}"
         r = cloudinary.uploader.upload(file.file, public_id=public_id, overwrite=True)
         src_url = cloudinary.CloudinaryImage(public_id).build_url(
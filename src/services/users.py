@@ -1,9 +1,13 @@
+import logging
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from libgravatar import Gravatar
 
 from src.repository.users import UserRepository
 from src.schemas.users import UserCreate
 
+logger = logging.getLogger(__name__)
+
 
 class UserService:
     """
@@ -35,7 +39,7 @@ class UserService:
             g = Gravatar(body.email)
             avatar = g.get_image()
         except Exception as e:
-            print(e)
+            logger.warning("Could not get Gravatar for %s: %s", body.email, e)
 
         return await self.repository.create_user(body, avatar)
 
@@ -81,3 +85,16 @@ class UserService:
         :return: None
         """
         return await self.repository.confirmed_email(email)
+
+    async def update_password(self, user, hashed_password: str):
+        """
+        Замінює хеш пароля користувача.
+
+        :param user: Користувач, завантажений з бази даних.
+        :type user: User
+        :param hashed_password: Новий хеш пароля.
+        :type hashed_password: str
+        :return: Оновлений користувач.
+        :rtype: User
+        """
+        return await self.repository.update_password(user, hashed_password)
@@ -0,0 +1,175 @@
+"""
+Прогрів застосунку перед прийомом трафіку та стан готовності.
+
+Під час запуску (``lifespan``) ``Readiness.warm_up``:
+
+- відкриває ``WARMUP_DB_CONNECTIONS`` з'єднань із базою даних одночасно, щоб
+  пул був заповнений, а TCP/TLS-з'єднання та інтроспекція типів asyncpg
+  відбулися до першого запиту;
+- на кожному з'єднанні один раз виконує основні запити репозиторіїв, щоб
+  наповнити кеш скомпільованих запитів SQLAlchemy і кеш підготовлених
+  запитів драйвера;
+- перевіряє Redis через ``PING`` з ``WARMUP_REDIS_CONNECTIONS`` з'єднань.
+
+Лише після цього інстанс вважається готовим (``/api/readiness``). Якщо прогрів
+не вдався, він повторюється у фоні кожні ``WARMUP_RETRY_INTERVAL`` секунд.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, UTC
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from src.conf.config import settings
+from src.database.models import User
+from src.repository.contacts import ContactRepository
+from src.repository.users import UserRepository
+from src.services.repository_cache import uncached
+
+logger = logging.getLogger(__name__)
+
+
+async def prime_statements(conn: AsyncConnection) -> None:
+    """
+    Виконує основні запити репозиторіїв на з'єднанні без зміни даних.
+
+    Запити виконуються від імені неіснуючого користувача повз кеш
+    репозиторіїв, тому доходять до бази даних і повертають порожній результат.
+
+    :param conn: З'єднання з базою даних.
+    """
+    with uncached():
+        async with AsyncSession(bind=conn) as session:
+            nobody = User(id=0)
+            users = UserRepository(session)
+            contacts = ContactRepository(session)
+            await users.get_user_by_username("")
+            await users.get_user_by_email("")
+            await contacts.get_contacts(0, 1, nobody)
+            await contacts.get_contact_by_id(0, nobody)
+            await contacts.search_contacts("", 0, 1, nobody)
+            await contacts.upcoming_birthdays(7, nobody)
+            await session.rollback()
+
+
+class Readiness:
+    """
+    Стан готовності інстансу до прийому трафіку.
+
+    :param db_connections: Кількість з'єднань із базою даних для прогріву.
+    :param redis_connections: Кількість з'єднань із Redis для прогріву.
+    :param timeout: Максимальна тривалість однієї спроби прогріву в секундах.
+    :param retry_interval: Інтервал між повторними спробами в секундах.
+    """
+
+    def __init__(
+        self,
+        db_connections: int = settings.WARMUP_DB_CONNECTIONS,
+        redis_connections: int = settings.WARMUP_REDIS_CONNECTIONS,
+        timeout: float = settings.WARMUP_TIMEOUT,
+        retry_interval: float = settings.WARMUP_RETRY_INTERVAL,
+    ):
+        self.db_connections = db_connections
+        self.redis_connections = redis_connections
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.ready = False
+        self.details: dict = {}
+        self._retry: asyncio.Task | None = None
+
+    async def warm_up(self, engine: AsyncEngine, redis) -> bool:
+        """
+        Прогріває пул з'єднань бази даних і Redis.
+
+        Якщо спроба не вдалася, запускає фонові повторні спроби.
+
+        :param engine: Асинхронний рушій бази даних.
+        :param redis: Клієнт Redis.
+        :return: True, якщо інстанс готовий.
+        """
+        if await self._attempt(engine, redis):
+            return True
+        if self._retry is None:
+            self._retry = asyncio.create_task(self._retry_until_ready(engine, redis))
+        return False
+
+    async def stop(self) -> None:
+        """
+        Скасовує фонові повторні спроби та знімає готовність.
+        """
+        self.ready = False
+        if self._retry is not None:
+            self._retry.cancel()
+            try:
+                await self._retry
+            except asyncio.CancelledError:
+                pass
+            self._retry = None
+
+    async def _retry_until_ready(self, engine: AsyncEngine, redis) -> None:
+        while not self.ready:
+            await asyncio.sleep(self.retry_interval)
+            await self._attempt(engine, redis)
+        self._retry = None
+
+    async def _attempt(self, engine: AsyncEngine, redis) -> bool:
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                db_ms = await self._warm_database(engine)
+                redis_ms = await self._warm_redis(redis)
+        except Exception as e:
+            self.details = {
+                "error": f"{type(e).__name__}: {e}",
+                "checked_at": datetime.now(UTC).isoformat(),
+            }
+            logger.error("Warm-up failed, instance is not ready: %s", e)
+            return False
+        self.details = {
+            "db_connections": self._db_connection_count(engine),
+            "db_ms": db_ms,
+            "redis_connections": self.redis_connections if redis else 0,
+            "redis_ms": redis_ms,
+            "total_ms": round((time.perf_counter() - start) * 1000, 1),
+            "ready_at": datetime.now(UTC).isoformat(),
+        }
+        self.ready = True
+        logger.info("Warm-up finished in %s ms", self.details["total_ms"])
+        return True
+
+    def _db_connection_count(self, engine: AsyncEngine) -> int:
+        pool_size = getattr(engine.pool, "size", None)
+        if callable(pool_size):
+            return min(self.db_connections, pool_size())
+        return self.db_connections
+
+    async def _warm_database(self, engine: AsyncEngine) -> float:
+        start = time.perf_counter()
+        count = self._db_connection_count(engine)
+        connections = await asyncio.gather(
+            *(engine.connect().start() for _ in range(count)), return_exceptions=True
+        )
+        try:
+            for conn in connections:
+                if isinstance(conn, BaseException):
+                    raise conn
+            for conn in connections:
+                await conn.execute(text("SELECT 1"))
+                await prime_statements(conn)
+        finally:
+            for conn in connections:
+                if not isinstance(conn, BaseException):
+                    await conn.close()
+        return round((time.perf_counter() - start) * 1000, 1)
+
+    async def _warm_redis(self, redis) -> float:
+        start = time.perf_counter()
+        if redis is not None:
+            await asyncio.gather(*(redis.ping() for _ in range(self.redis_connections)))
+        return round((time.perf_counter() - start) * 1000, 1)
+
+
+readiness = Readiness()
@@ -0,0 +1,78 @@
+"""
+Окремий процес, що відправляє листи з черги ``email_outbox``.
+
+Веб-воркери лише записують листи в чергу (:mod:`src.services.outbox`), а
+цей процес відправляє їх через пул SMTP-з'єднань. Процес можна запускати в
+кількох екземплярах; SIGINT/SIGTERM дочікуються поточного пакета.
+
+Приклад::
+
+    python -m src.tools.outbox_worker --batch-size 100
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.conf.config import settings
+from src.services.mailer import mailer
+from src.services.outbox import OutboxWorker
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Розбирає аргументи командного рядка.
+
+    :param argv: Аргументи (за замовчуванням ``sys.argv``).
+    :return: Розібрані аргументи.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.outbox_worker",
+        description="Відправляє листи з черги email_outbox.",
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+    parser.add_argument(
+        "--poll-interval", type=float, default=settings.OUTBOX_POLL_INTERVAL
+    )
+    parser.add_argument("--db-url", help="URL бази даних (за замовчуванням DB_URL)")
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Обробити один пакет і завершитися",
+    )
+    return parser.parse_args(argv)
+
+
+async def main(argv=None) -> None:
+    """
+    Точка входу CLI: розбирає чергу до сигналу зупинки.
+
+    :param argv: Аргументи командного рядка.
+    """
+    args = parse_args(argv)
+    engine = create_async_engine(args.db_url or settings.DB_URL)
+    worker = OutboxWorker(
+        async_sessionmaker(engine, expire_on_commit=False),
+        batch_size=args.batch_size,
+        poll_interval=args.poll_interval,
+    )
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        if args.once:
+            await worker.process_batch()
+        else:
+            await worker.run(stop)
+    finally:
+        await mailer.stop()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,389 @@
+"""
+Генератор синтетичних даних і CLI для заповнення бази даних.
+
+Створює користувачів і контакти, що відповідають моделям ``User``/``Contact``
+та обмеженням ``ContactBase``. Дані детерміновані: однаковий ``seed`` дає
+однаковий набір. Кількість контактів на користувача має довгий хвіст
+(розподіл Ципфа), дати народження — реалістичний розподіл віку та сезонність.
+
+Запис виконується пакетними вставками, а для PostgreSQL — через ``COPY``.
+
+Приклад::
+
+    python -m src.tools.seed --users 5000 --contacts 2000000 --seed 42
+"""
+
+import argparse
+import asyncio
+import bisect
+import itertools
+import random
+import time
+from datetime import date, datetime
+from typing import Iterator
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from src.conf.config import settings
+from src.database.models import Base, Contact, User, UserRole
+from src.services.auth import Hash
+
+FIRST_NAMES = [
+    "Олександр",
+    "Андрій",
+    "Дмитро",
+    "Максим",
+    "Іван",
+    "Сергій",
+    "Олена",
+    "Марія",
+    "Анна",
+    "Наталія",
+    "Ірина",
+    "Юлія",
+    "Taras",
+    "Oksana",
+    "John",
+    "Emma",
+    "Liam",
+    "Olivia",
+    "Noah",
+    "Sophia",
+    "Lucas",
+    "Mia",
+    "Ethan",
+    "Ava",
+]
+LAST_NAMES = [
+    "Шевченко",
+    "Коваленко",
+    "Бондаренко",
+    "Ткаченко",
+    "Кравченко",
+    "Мельник",
+    "Бойко",
+    "Ковальчук",
+    "Smith",
+    "Johnson",
+    "Brown",
+    "Garcia",
+    "Miller",
+    "Davis",
+    "Wilson",
+    "Anderson",
+    "Taylor",
+    "Moore",
+    "Martin",
+    "Lee",
+]
+EMAIL_DOMAINS = ["example.com", "example.org", "example.net", "mail.example.com"]
+NOTES = [
+    "Колега по роботі",
+    "Друг з університету",
+    "Сусід",
+    "Родич",
+    "Клієнт",
+    "Зустрілися на конференції",
+    "Тренер у спортзалі",
+]
+# Відносна частота народжень за місяцями (пік наприкінці літа).
+MONTH_WEIGHTS = [0.95, 0.9, 0.97, 0.96, 1.0, 1.02, 1.08, 1.1, 1.07, 1.0, 0.95, 0.96]
+
+CONTACT_COLUMNS = [
+    "first_name",
+    "last_name",
+    "email",
+    "phone_number",
+    "birthday",
+    "additional_data",
+    "user_id",
+    "created_at",
+    "updated_at",
+]
+USER_COLUMNS = [
+    "id",
+    "username",
+    "email",
+    "hashed_password",
+    "avatar",
+    "confirmed",
+    "is_active",
+    "role",
+    "created_at",
+    "updated_at",
+]
+
+
+class DatasetFactory:
+    """
+    Детермінована фабрика користувачів і контактів.
+
+    Використовується CLI та бенчмарками як фабрика фікстур.
+
+    :param seed: Зерно генератора випадкових чисел.
+    :param today: Дата, відносно якої генеруються дні народження.
+    """
+
+    def __init__(self, seed: int = 0, today: date | None = None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.today = today or date.today()
+        self.now = datetime.combine(self.today, datetime.min.time())
+        self._month_cumulative = list(itertools.accumulate(MONTH_WEIGHTS))
+
+    def contact_counts(self, users: int, contacts: int, skew: float = 1.1) -> list[int]:
+        """
+        Розподіляє ``contacts`` контактів між ``users`` користувачами.
+
+        Ваги відповідають розподілу Ципфа з показником ``skew``: кілька
+        користувачів мають дуже багато контактів, більшість — небагато.
+
+        :param users: Кількість користувачів.
+        :param contacts: Загальна кількість контактів.
+        :param skew: Показник розподілу Ципфа (0 — рівномірний розподіл).
+        :return: Кількість контактів для кожного користувача.
+        :raises ValueError: Якщо контакти є, а користувачів немає.
+        """
+        if contacts > 0 and users < 1:
+            raise ValueError("Контакти потребують принаймні одного користувача")
+        weights = [1 / (rank + 1) ** skew for rank in range(users)]
+        self.rng.shuffle(weights)
+        total = sum(weights)
+        counts = [int(contacts * weight / total) for weight in weights]
+        for i in self.rng.sample(range(users), contacts - sum(counts)):
+            counts[i] += 1
+        return counts
+
+    def user(self, user_id: int, hashed_password: str) -> dict:
+        """
+        Генерує користувача.
+
+        :param user_id: Ідентифікатор користувача.
+        :param hashed_password: Готовий хеш пароля (спільний для всіх).
+        :return: Словник зі значеннями колонок ``users``.
+        """
+        username = f"user{user_id}"
+        return {
+            "id": user_id,
+            "username": username,
+            "email": f"{username}@{self.rng.choice(EMAIL_DOMAINS)}",
+            "hashed_password": hashed_password,
+            "avatar": None,
+            "confirmed": self.rng.random() < 0.9,
+            "is_active": True,
+            "role": UserRole.USER,
+            "created_at": self.now,
+            "updated_at": self.now,
+        }
+
+    def birthday(self) -> date:
+        """
+        Генерує дату народження: вік ~ N(38, 15) у межах 1..95 років,
+        місяць — з урахуванням сезонності.
+
+        :return: Дата народження, не пізніша за сьогодні.
+        """
+        age = min(max(int(self.rng.gauss(38, 15)), 1), 95)
+        month = bisect.bisect(
+            self._month_cumulative, self.rng.random() * self._month_cumulative[-1]
+        )
+        month = min(month, 11) + 1
+        day = self.rng.randint(1, 28 if month == 2 else 30)
+        birthday = date(self.today.year - age, month, day)
+        if birthday > self.today:
+            birthday = birthday.replace(year=birthday.year - 1)
+        return birthday
+
+    def contact(self, user_id: int | None = None) -> dict:
+        """
+        Генерує контакт, що проходить валідацію ``ContactBase``.
+
+        :param user_id: Власник контакту; якщо None, поле не додається
+            (зручно для тіла запиту до API).
+        :return: Словник зі значеннями колонок ``contacts``.
+        """
+        domain = self.rng.choice(EMAIL_DOMAINS)
+        contact = {
+            "first_name": self.rng.choice(FIRST_NAMES),
+            "last_name": self.rng.choice(LAST_NAMES),
+            "email": f"contact{self.rng.getrandbits(40):x}@{domain}",
+            "phone_number": f"+380{self.rng.randint(0, 999_999_999):09d}",
+            "birthday": self.birthday(),
+            "additional_data": self.rng.choice(NOTES),
+        }
+        if user_id is not None:
+            contact.update(user_id=user_id, created_at=self.now, updated_at=self.now)
+        return contact
+
+    def contact_payload(self) -> dict:
+        """
+        Генерує тіло запиту для створення контакту через API.
+
+        :return: JSON-сумісний словник.
+        """
+        contact = self.contact()
+        contact["birthday"] = contact["birthday"].isoformat()
+        return contact
+
+    def contacts(self, counts: list[int], first_user_id: int = 1) -> Iterator[dict]:
+        """
+        Генерує контакти для послідовних користувачів.
+
+        :param counts: Кількість контактів кожного користувача.
+        :param first_user_id: Ідентифікатор першого користувача.
+        :return: Ітератор словників контактів.
+        """
+        for offset, count in enumerate(counts):
+            user_id = first_user_id + offset
+            for _ in range(count):
+                yield self.contact(user_id)
+
+
+def _batches(rows: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+async def _write(conn, table, columns: list[str], rows: list[dict]) -> None:
+    if conn.dialect.name == "postgresql":
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table.name,
+            records=[
+                tuple(
+                    row[column].name if column == "role" else row[column]
+                    for column in columns
+                )
+                for row in rows
+            ],
+            columns=columns,
+        )
+    else:
+        await conn.execute(insert(table), rows)
+
+
+async def seed_database(
+    engine: AsyncEngine,
+    users: int,
+    contacts: int,
+    seed: int = 0,
+    password: str = "password123",
+    skew: float = 1.1,
+    batch_size: int = 10_000,
+    progress: bool = False,
+) -> list[dict]:
+    """
+    Заповнює базу даних синтетичними користувачами та контактами.
+
+    Нові користувачі отримують ідентифікатори після вже наявних.
+
+    :param engine: Асинхронний рушій бази даних.
+    :param users: Кількість користувачів.
+    :param contacts: Загальна кількість контактів.
+    :param seed: Зерно генератора.
+    :param password: Пароль усіх користувачів (хешується один раз).
+    :param skew: Показник розподілу Ципфа для кількості контактів.
+    :param batch_size: Розмір пакета вставки.
+    :param progress: Чи друкувати прогрес.
+    :return: Створені користувачі із полем ``contacts`` (кількість контактів).
+    """
+    factory = DatasetFactory(seed)
+    hashed_password = Hash.hash_password(password)
+    counts = factory.contact_counts(users, contacts, skew)
+    started = time.perf_counter()
+
+    async with engine.begin() as conn:
+        first_id = (await conn.scalar(select(func.max(User.id)))) or 0
+        first_id += 1
+        created = [
+            factory.user(user_id, hashed_password)
+            for user_id in range(first_id, first_id + users)
+        ]
+        for batch in _batches(iter(created), batch_size):
+            await _write(conn, User.__table__, USER_COLUMNS, batch)
+        if conn.dialect.name == "postgresql":
+            await conn.execute(
+                text(
+                    "SELECT setval(pg_get_serial_sequence('users', 'id'), "
+                    "(SELECT max(id) FROM users))"
+                )
+            )
+
+        written = 0
+        for batch in _batches(factory.contacts(counts, first_id), batch_size):
+            await _write(conn, Contact.__table__, CONTACT_COLUMNS, batch)
+            written += len(batch)
+            if progress:
+                rate = written / (time.perf_counter() - started)
+                print(f"  {written}/{contacts} контактів ({rate:,.0f} рядків/с)")
+
+    for user, count in zip(created, counts):
+        user["contacts"] = count
+    return created
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Розбирає аргументи командного рядка.
+
+    :param argv: Аргументи (за замовчуванням ``sys.argv``).
+    :return: Розібрані аргументи.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.seed",
+        description="Заповнює базу даних синтетичними користувачами та контактами.",
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--contacts", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skew", type=float, default=1.1)
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--db-url", help="URL бази даних (за замовчуванням DB_URL)")
+    parser.add_argument(
+        "--create-tables",
+        action="store_true",
+        help="Створити таблиці без міграцій (для тимчасових баз)",
+    )
+    args = parser.parse_args(argv)
+    if args.contacts > 0 and args.users < 1:
+        parser.error("--contacts потребує принаймні одного користувача (--users >= 1)")
+    return args
+
+
+async def main(argv=None) -> None:
+    """
+    Точка входу CLI: заповнює базу даних і друкує швидкість запису.
+
+    :param argv: Аргументи командного рядка.
+    """
+    args = parse_args(argv)
+    engine = create_async_engine(args.db_url or settings.DB_URL)
+    started = time.perf_counter()
+    try:
+        if args.create_tables:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+        await seed_database(
+            engine,
+            users=args.users,
+            contacts=args.contacts,
+            seed=args.seed,
+            password=args.password,
+            skew=args.skew,
+            batch_size=args.batch_size,
+            progress=True,
+        )
+    finally:
+        await engine.dispose()
+    elapsed = time.perf_counter() - started
+    print(
+        f"✅ Створено {args.users} користувачів і {args.contacts} контактів "
+        f"за {elapsed:.1f} с"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
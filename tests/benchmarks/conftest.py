@@ -0,0 +1,206 @@
+"""
+Спільні фікстури для бенчмарків API.
+
+Бенчмарки запускаються лише з ``RUN_BENCHMARKS=1``. Налаштування:
+
+- ``BENCH_DB_URL`` — база даних (за замовчуванням тимчасова SQLite);
+- ``BENCH_USERS`` / ``BENCH_CONTACTS`` — розмір набору даних;
+- ``BENCH_SEED`` — зерно генератора даних;
+- ``BENCH_CONCURRENCY`` — кількість одночасних клієнтів;
+- ``BENCH_REQUESTS`` — кількість запитів на сценарій;
+- ``BENCH_REPORT`` — шлях до JSON-звіту;
+- ``BENCH_BASELINE`` — шлях до збереженого базового звіту;
+- ``BENCH_TOLERANCE`` — допустиме погіршення p95 відносно базового звіту;
+- ``BENCH_UPDATE_BASELINE=1`` — перезаписати базовий звіт поточними результатами.
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from main import app
+from src.database.db import get_db
+from src.database.models import Base
+from src.services.admission import admission
+from src.services.limiter import limiter
+from src.services.login_throttle import login_throttle
+from src.services.quotas import quotas
+from src.services.redis_cache import redis_cache
+from src.tools.seed import seed_database
+
+BENCH_DIR = Path(__file__).parent
+BENCH_PASSWORD = "benchmark-password"
+
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", 10))
+REQUESTS = int(os.getenv("BENCH_REQUESTS", 200))
+USERS = int(os.getenv("BENCH_USERS", 10))
+CONTACTS = int(os.getenv("BENCH_CONTACTS", 5000))
+SEED = int(os.getenv("BENCH_SEED", 0))
+REPORT_PATH = Path(os.getenv("BENCH_REPORT", BENCH_DIR / "results" / "api_load.json"))
+BASELINE_PATH = Path(
+    os.getenv("BENCH_BASELINE", BENCH_DIR / "baselines" / "api_load.json")
+)
+TOLERANCE = float(os.getenv("BENCH_TOLERANCE", 0.25))
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv("RUN_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="Бенчмарки запускаються з RUN_BENCHMARKS=1")
+    for item in items:
+        if BENCH_DIR in Path(str(item.fspath)).parents:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def bench_client(tmp_path_factory):
+    """
+    HTTP-клієнт, що викликає ``main:app`` через ASGI-транспорт httpx.
+
+    База даних заповнюється синтетичними даними ``src.tools.seed``, Redis
+    замінюється на fakeredis, обмежувачі запитів і спроб входу, контроль
+    допуску та квоти вимикаються, щоб міряти саму обробку запитів.
+    """
+    fakeredis = pytest.importorskip("fakeredis")
+    db_url = os.getenv("BENCH_DB_URL") or (
+        f"sqlite+aiosqlite:///{tmp_path_factory.mktemp('bench') / 'bench.db'}"
+    )
+    engine = create_async_engine(db_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    users = await seed_database(
+        engine, users=USERS, contacts=CONTACTS, seed=SEED, password=BENCH_PASSWORD
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    redis_cache.redis = fakeredis.FakeAsyncRedis()
+    limiter.enabled = False
+    login_throttle.enabled = False
+    admission.enabled = False
+    quotas.enabled = False
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        client.usernames = [user["username"] for user in users if user["confirmed"]]
+        yield client
+
+    limiter.enabled = True
+    login_throttle.enabled = True
+    admission.enabled = True
+    quotas.enabled = True
+    app.dependency_overrides.pop(get_db, None)
+    await redis_cache.redis.aclose()
+    redis_cache.redis = None
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def auth_headers(bench_client):
+    """
+    Заголовки авторизації для кожного тестового користувача.
+    """
+    headers = []
+    for username in bench_client.usernames:
+        response = await bench_client.post(
+            "/api/auth/login",
+            data={"username": username, "password": BENCH_PASSWORD},
+        )
+        assert response.status_code == 200, response.text
+        token = response.json()["access_token"]
+        headers.append({"Authorization": f"Bearer {token}"})
+    return headers
+
+
+async def run_load(request_factory, requests: int = REQUESTS) -> dict:
+    """
+    Виконує ``requests`` запитів з ``CONCURRENCY`` одночасними клієнтами.
+
+    :param request_factory: Асинхронна функція ``(i) -> httpx.Response``.
+    :param requests: Загальна кількість запитів.
+    :return: Пропускна здатність, перцентилі затримки та кількість помилок.
+    """
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            response = await request_factory(i)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": requests,
+        "concurrency": CONCURRENCY,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 2),
+        "p50_ms": round(percentiles[49] * 1000, 3),
+        "p95_ms": round(percentiles[94] * 1000, 3),
+        "p99_ms": round(percentiles[98] * 1000, 3),
+    }
+
+
+@pytest.fixture(scope="session")
+def load_report():
+    """
+    Збирає результати сценаріїв, пише JSON-звіт та порівнює з базовим.
+
+    Тест сценарію падає, якщо його p95 гірший за базовий більш ніж на
+    ``BENCH_TOLERANCE``.
+    """
+    results = {}
+    baseline = {}
+    if BASELINE_PATH.exists():
+        baseline = json.loads(BASELINE_PATH.read_text())["scenarios"]
+
+    def record(name: str, result: dict) -> None:
+        results[name] = result
+        expected = baseline.get(name)
+        if expected and not os.getenv("BENCH_UPDATE_BASELINE"):
+            limit = expected["p95_ms"] * (1 + TOLERANCE)
+            assert (
+                result["p95_ms"] <= limit
+            ), f"{name}: p95 {result['p95_ms']} ms, baseline {expected['p95_ms']} ms"
+
+    yield record
+
+    report = {
+        "dataset": {"users": USERS, "contacts": CONTACTS, "seed": SEED},
+        "scenarios": results,
+    }
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(json.dumps(report, indent=2))
+    if os.getenv("BENCH_UPDATE_BASELINE"):
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(report, indent=2))
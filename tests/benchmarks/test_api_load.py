@@ -0,0 +1,95 @@
+"""
+Навантажувальні бенчмарки основних ендпоінтів API.
+
+Запуск::
+
+    RUN_BENCHMARKS=1 BENCH_CONCURRENCY=20 pytest tests/benchmarks -q
+"""
+
+import pytest
+
+from src.tools.seed import DatasetFactory
+from tests.benchmarks.conftest import BENCH_PASSWORD, REQUESTS, run_load
+
+new_contact = DatasetFactory(seed=1).contact_payload()
+
+
+@pytest.mark.asyncio
+async def test_login(bench_client, load_report):
+    usernames = bench_client.usernames
+
+    async def request(i):
+        return await bench_client.post(
+            "/api/auth/login",
+            data={
+                "username": usernames[i % len(usernames)],
+                "password": BENCH_PASSWORD,
+            },
+        )
+
+    result = await run_load(request, requests=max(REQUESTS // 10, 10))
+    assert result["errors"] == 0
+    load_report("login", result)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name, method, path, body",
+    [
+        ("list_contacts", "GET", "/api/contacts/?limit=100", None),
+        ("search_contacts", "GET", "/api/contacts/search/?text=an&limit=100", None),
+        (
+            "upcoming_birthdays",
+            "POST",
+            "/api/contacts/upcoming-birthdays",
+            {"days": 30},
+        ),
+        ("users_me", "GET", "/api/users/me", None),
+    ],
+)
+async def test_read_endpoints(
+    bench_client, auth_headers, load_report, name, method, path, body
+):
+    async def request(i):
+        return await bench_client.request(
+            method, path, json=body, headers=auth_headers[i % len(auth_headers)]
+        )
+
+    result = await run_load(request)
+    assert result["errors"] == 0
+    load_report(name, result)
+
+
+@pytest.mark.asyncio
+async def test_contact_writes(bench_client, auth_headers, load_report):
+    created = {}
+
+    async def create(i):
+        response = await bench_client.post(
+            "/api/contacts/",
+            json=new_contact,
+            headers=auth_headers[i % len(auth_headers)],
+        )
+        created[i] = response.json().get("id")
+        return response
+
+    async def update(i):
+        return await bench_client.put(
+            f"/api/contacts/{created[i]}",
+            json={**new_contact, "first_name": "Updated"},
+            headers=auth_headers[i % len(auth_headers)],
+        )
+
+    async def delete(i):
+        return await bench_client.delete(
+            f"/api/contacts/{created[i]}", headers=auth_headers[i % len(auth_headers)]
+        )
+
+    for name, request in [
+        ("create_contact", create),
+        ("update_contact", update),
+        ("delete_contact", delete),
+    ]:
+        result = await run_load(request)
+        assert result["errors"] == 0, name
+        load_report(name, result)
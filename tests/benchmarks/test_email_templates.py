@@ -0,0 +1,60 @@
+"""
+Бенчмарк масового рендерингу листів підтвердження.
+
+Порівнює рендеринг ``verify_email.html`` так, як це робив ``fastapi_mail``
+(нове середовище Jinja й компіляція шаблону для кожного листа), з
+попередньо скомпільованими шаблонами ``EmailTemplates`` — по одному листу
+через ``render`` і пакетом через ``render_many``. ``extra_info`` містить
+кількість листів за секунду::
+
+    RUN_BENCHMARKS=1 pytest tests/benchmarks/test_email_templates.py
+"""
+
+import pytest
+from jinja2 import Environment, FileSystemLoader
+
+from src.conf.config import settings
+from src.services.email_templates import EmailTemplates
+
+MESSAGES = 1000
+
+
+@pytest.fixture(scope="module")
+def recipients():
+    return [
+        {"username": f"user{number}", "token": f"token-{number:06d}"}
+        for number in range(MESSAGES)
+    ]
+
+
+def render_per_message_environment(recipients):
+    for recipient in recipients:
+        env = Environment(loader=FileSystemLoader(settings.TEMPLATE_FOLDER))
+        env.get_template("verify_email.html").render(host="http://app/", **recipient)
+
+
+def render_precompiled(templates, recipients):
+    for recipient in recipients:
+        templates.render("verify_email.html", host="http://app/", **recipient)
+
+
+def render_batch(templates, recipients):
+    for _ in templates.render_many("verify_email.html", recipients, host="http://app/"):
+        pass
+
+
+@pytest.mark.parametrize("mode", ["per_message_env", "precompiled", "render_many"])
+def test_bulk_render(benchmark, recipients, mode):
+    templates = EmailTemplates()
+    templates.load()
+    run = {
+        "per_message_env": lambda: render_per_message_environment(recipients),
+        "precompiled": lambda: render_precompiled(templates, recipients),
+        "render_many": lambda: render_batch(templates, recipients),
+    }[mode]
+
+    benchmark(run)
+    rate = MESSAGES / benchmark.stats.stats.mean
+    benchmark.extra_info["messages_per_second"] = round(rate)
+    if mode != "per_message_env":
+        assert rate > 5000
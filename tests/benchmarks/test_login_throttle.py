@@ -0,0 +1,99 @@
+"""
+Бенчмарк входу під атакою підбору паролів (credential stuffing).
+
+Атакувальник перебирає неправильні паролі для відомих імен із
+``STUFFING_IPS`` IP-адрес. Без обмежувача кожна спроба коштує запит до бази
+даних і перевірку bcrypt; з обмежувачем кількість перевірок bcrypt обмежена
+``LOGIN_LOCKOUT_THRESHOLD`` на ім'я незалежно від кількості спроб, тож
+процесорний час сервера не росте разом з атакою.
+
+Запуск::
+
+    RUN_BENCHMARKS=1 pytest tests/benchmarks/test_login_throttle.py -q
+"""
+
+import time
+from collections import Counter
+
+import httpx
+import pytest
+
+from main import app
+from src.conf.config import settings
+from src.services.auth import Hash
+from src.services.login_throttle import login_throttle
+from src.services.redis_cache import redis_cache
+from tests.benchmarks.conftest import CONCURRENCY, REQUESTS, run_load
+
+STUFFING_IPS = 20
+
+
+@pytest.fixture
+def password_checks(monkeypatch):
+    calls = []
+    verify = Hash.verify_password
+
+    def counting_verify(plain_password, hashed_password):
+        calls.append(plain_password)
+        return verify(plain_password, hashed_password)
+
+    monkeypatch.setattr(Hash, "verify_password", staticmethod(counting_verify))
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_login_stuffing(bench_client, load_report, password_checks):
+    usernames = bench_client.usernames
+    # Після блокування імені пароль ще перевіряють лише спроби, які вже
+    # пройшли перевірку обмежувача (не більше CONCURRENCY - 1 одночасних).
+    checks_per_username = settings.LOGIN_LOCKOUT_THRESHOLD + CONCURRENCY - 1
+    # Спроб має бути значно більше за дозволені перевірки bcrypt, інакше
+    # обмежувач не може помітно зменшити процесорний час.
+    attempts = max(REQUESTS * 5, len(usernames) * checks_per_username * 10)
+    clients = [
+        httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app, client=(f"10.0.0.{i + 1}", 4000)),
+            base_url="http://bench",
+        )
+        for i in range(STUFFING_IPS)
+    ]
+
+    async def attempt(i):
+        return await clients[i % STUFFING_IPS].post(
+            "/api/auth/login",
+            data={"username": usernames[i % len(usernames)], "password": f"guess{i}"},
+        )
+
+    # Процесорний час однієї спроби без обмежувача.
+    start = time.process_time()
+    await run_load(attempt, requests=10)
+    unthrottled_cpu = (time.process_time() - start) / 10
+
+    password_checks.clear()
+    await redis_cache.redis.flushall()
+    login_throttle.enabled = True
+    try:
+        start = time.process_time()
+        result = await run_load(attempt, requests=attempts)
+        cpu = time.process_time() - start
+    finally:
+        login_throttle.enabled = False
+        for client in clients:
+            await client.aclose()
+
+    assert result["errors"] == attempts
+    checks = Counter(
+        usernames[int(password.removeprefix("guess")) % len(usernames)]
+        for password in password_checks
+    )
+    assert max(checks.values()) <= checks_per_username
+    assert cpu < unthrottled_cpu * attempts / 4
+    load_report(
+        "login_stuffing",
+        {
+            **result,
+            "password_checks": len(password_checks),
+            "cpu_seconds": round(cpu, 3),
+            "unthrottled_cpu_seconds_estimate": round(unthrottled_cpu * attempts, 3),
+        },
+    )
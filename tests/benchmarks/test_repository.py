@@ -0,0 +1,294 @@
+"""
+Мікробенчмарки репозиторіїв, автентифікації та кешу (pytest-benchmark).
+
+Кожен метод ``ContactRepository`` і ``UserRepository`` міряється на наборах
+даних різного розміру (``BENCH_DATASET_SIZES``, за замовчуванням 1k, 100k і
+1M контактів), щоб було видно, як операція масштабується з обсягом даних.
+Запити виконуються від імені користувача з найбільшою кількістю контактів.
+
+Запуск із машиночитним звітом та порівнянням із попереднім запуском::
+
+    RUN_BENCHMARKS=1 pytest tests/benchmarks/test_repository.py \\
+        --benchmark-group-by=group --benchmark-autosave \\
+        --benchmark-compare --benchmark-compare-fail=median:20%
+
+    RUN_BENCHMARKS=1 pytest tests/benchmarks/test_repository.py \\
+        --benchmark-json=tests/benchmarks/results/repository.json
+"""
+
+import asyncio
+import itertools
+import os
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.database.models import Base, Contact, User
+from src.repository.contacts import ContactRepository
+from src.repository.users import UserRepository
+from src.schemas.contacts import ContactBase
+from src.schemas.users import UserCreate
+from src.services.auth import Hash, create_access_token, get_current_user
+from src.services.redis_cache import RedisCache
+from src.tools.seed import DatasetFactory, seed_database
+from tests.benchmarks.conftest import BENCH_PASSWORD, SEED
+
+DATASET_SIZES = [
+    int(size)
+    for size in os.getenv("BENCH_DATASET_SIZES", "1000,100000,1000000").split(",")
+]
+ROUNDS = int(os.getenv("BENCH_ROUNDS", 50))
+
+_unique = itertools.count()
+
+
+@pytest.fixture(scope="module")
+def runner():
+    """
+    Окремий цикл подій для синхронного ``benchmark``: рушій, сесія та всі
+    виклики виконуються в ньому.
+    """
+    with asyncio.Runner() as runner:
+        yield runner
+
+
+@pytest.fixture(scope="module", params=DATASET_SIZES, ids=lambda size: f"{size}")
+def dataset(request, runner, tmp_path_factory):
+    """
+    База даних із ``request.param`` контактами та сесія для бенчмарків.
+    """
+    contacts = request.param
+    path = tmp_path_factory.mktemp("repository") / f"contacts_{contacts}.db"
+    engine = create_async_engine(
+        os.getenv("BENCH_DB_URL") or f"sqlite+aiosqlite:///{path}"
+    )
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        users = await seed_database(
+            engine,
+            users=max(10, contacts // 1000),
+            contacts=contacts,
+            seed=SEED,
+            password=BENCH_PASSWORD,
+        )
+        session = async_sessionmaker(engine, expire_on_commit=False)()
+        heaviest = max(users, key=lambda user: user["contacts"])
+        user = await session.get(User, heaviest["id"])
+        contact_id = await session.scalar(
+            select(Contact.id).filter_by(user_id=user.id).limit(1)
+        )
+        return session, user, contact_id
+
+    session, user, contact_id = runner.run(setup())
+    yield {
+        "size": contacts,
+        "session": session,
+        "user": user,
+        "contact_id": contact_id,
+        "factory": DatasetFactory(seed=SEED + 1),
+    }
+    runner.run(session.close())
+    runner.run(engine.dispose())
+
+
+def run(benchmark, runner, name, dataset, coroutine_function, *args):
+    benchmark.group = name
+    benchmark.extra_info["contacts"] = dataset["size"] if dataset else None
+    return benchmark(lambda: runner.run(coroutine_function(*args)))
+
+
+CONTACT_READS = {
+    "get_contact": lambda d: (d["contact_id"], d["user"]),
+    "get_contact_by_id": lambda d: (d["contact_id"], d["user"]),
+    "get_contacts": lambda d: (0, 100, d["user"]),
+    "search_contacts": lambda d: ("an", 0, 100, d["user"]),
+    "upcoming_birthdays": lambda d: (30, d["user"]),
+}
+USER_METHODS = {
+    "get_user_by_id": lambda d: (d["user"].id,),
+    "get_user_by_username": lambda d: (d["user"].username,),
+    "get_user_by_email": lambda d: (d["user"].email,),
+    "confirmed_email": lambda d: (d["user"].email,),
+    "update_avatar_url": lambda d: (d["user"].email, "https://example.com/a.png"),
+}
+
+
+@pytest.mark.parametrize("method", CONTACT_READS)
+def test_contact_reads(benchmark, runner, dataset, method):
+    repository = ContactRepository(dataset["session"])
+    run(
+        benchmark,
+        runner,
+        f"ContactRepository.{method}",
+        dataset,
+        getattr(repository, method),
+        *CONTACT_READS[method](dataset),
+    )
+
+
+def test_contact_create(benchmark, runner, dataset):
+    repository = ContactRepository(dataset["session"])
+    factory = dataset["factory"]
+    benchmark.group = "ContactRepository.create_contact"
+    benchmark.extra_info["contacts"] = dataset["size"]
+    benchmark.pedantic(
+        lambda body: runner.run(repository.create_contact(body, dataset["user"], [])),
+        setup=lambda: ((ContactBase(**factory.contact_payload()),), {}),
+        rounds=ROUNDS,
+    )
+
+
+def test_contact_update(benchmark, runner, dataset):
+    repository = ContactRepository(dataset["session"])
+    data = {"additional_data": "оновлено"}
+    run(
+        benchmark,
+        runner,
+        "ContactRepository.update_contact",
+        dataset,
+        repository.update_contact,
+        dataset["contact_id"],
+        data,
+        dataset["user"],
+    )
+
+
+def test_contact_remove(benchmark, runner, dataset):
+    repository = ContactRepository(dataset["session"])
+    factory = dataset["factory"]
+
+    def setup():
+        body = ContactBase(**factory.contact_payload())
+        contact = runner.run(repository.create_contact(body, dataset["user"], []))
+        return (contact.id,), {}
+
+    benchmark.group = "ContactRepository.remove_contact"
+    benchmark.extra_info["contacts"] = dataset["size"]
+    benchmark.pedantic(
+        lambda contact_id: runner.run(
+            repository.remove_contact(contact_id, dataset["user"])
+        ),
+        setup=setup,
+        rounds=ROUNDS,
+    )
+
+
+@pytest.mark.parametrize("method", USER_METHODS)
+def test_user_methods(benchmark, runner, dataset, method):
+    repository = UserRepository(dataset["session"])
+    run(
+        benchmark,
+        runner,
+        f"UserRepository.{method}",
+        dataset,
+        getattr(repository, method),
+        *USER_METHODS[method](dataset),
+    )
+
+
+def test_user_create(benchmark, runner, dataset):
+    repository = UserRepository(dataset["session"])
+
+    def setup():
+        username = f"bench_new_{next(_unique)}"
+        body = UserCreate(
+            username=username, email=f"{username}@example.com", password="hash"
+        )
+        return (body,), {}
+
+    benchmark.group = "UserRepository.create_user"
+    benchmark.extra_info["contacts"] = dataset["size"]
+    benchmark.pedantic(
+        lambda body: runner.run(repository.create_user(body)),
+        setup=setup,
+        rounds=ROUNDS,
+    )
+
+
+def test_get_current_user(benchmark, runner, dataset):
+    token = runner.run(create_access_token({"sub": dataset["user"].username}))
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    run(
+        benchmark,
+        runner,
+        "get_current_user",
+        dataset,
+        get_current_user,
+        credentials,
+        dataset["session"],
+    )
+
+
+def test_hash_password(benchmark):
+    benchmark.group = "Hash"
+    benchmark(Hash.hash_password, BENCH_PASSWORD)
+
+
+def test_verify_password(benchmark):
+    benchmark.group = "Hash"
+    hashed = Hash.hash_password(BENCH_PASSWORD)
+    assert benchmark(Hash.verify_password, BENCH_PASSWORD, hashed)
+
+
+def test_create_access_token(benchmark, runner):
+    run(
+        benchmark,
+        runner,
+        "create_access_token",
+        None,
+        create_access_token,
+        {"sub": "bench_user"},
+    )
+
+
+@pytest.fixture(scope="module")
+def cache(runner):
+    """
+    ``RedisCache`` поверх ``BENCH_REDIS_URL`` або fakeredis.
+    """
+    cache = RedisCache()
+    if os.getenv("BENCH_REDIS_URL"):
+        from redis import asyncio as aioredis
+
+        cache.redis = aioredis.from_url(os.getenv("BENCH_REDIS_URL"))
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        cache.redis = fakeredis.FakeAsyncRedis()
+    yield cache
+    runner.run(cache.redis.aclose())
+
+
+def test_cache_set(benchmark, runner, cache):
+    value = {"id": 1, "username": "bench_user", "email": "bench@example.com"}
+    run(benchmark, runner, "RedisCache", None, cache.set, "bench:user", value)
+
+
+def test_cache_get(benchmark, runner, cache):
+    value = {"id": 1, "username": "bench_user", "email": "bench@example.com"}
+    runner.run(cache.set("bench:user", value))
+    assert run(benchmark, runner, "RedisCache", None, cache.get, "bench:user") == value
+
+
+PAGE_KEYS = [f"bench:contact:{i}" for i in range(100)]
+
+
+def test_cache_get_page_one_by_one(benchmark, runner, cache):
+    value = {"id": 1, "first_name": "Bench", "email": "bench@example.com"}
+    runner.run(cache.set_many({key: value for key in PAGE_KEYS}))
+
+    async def get_page():
+        return [await cache.get(key) for key in PAGE_KEYS]
+
+    assert len(run(benchmark, runner, "RedisCache page", None, get_page)) == 100
+
+
+def test_cache_get_many_page(benchmark, runner, cache):
+    value = {"id": 1, "first_name": "Bench", "email": "bench@example.com"}
+    runner.run(cache.set_many({key: value for key in PAGE_KEYS}))
+    found = run(benchmark, runner, "RedisCache page", None, cache.get_many, PAGE_KEYS)
+    assert len(found) == 100
@@ -0,0 +1,48 @@
+"""
+Бенчмарк кодування відповіді зі списком контактів.
+
+Порівнює стандартний ``JSONResponse``, ``ORJSONResponse`` (за замовчуванням у
+застосунку) та ``MsgPackResponse`` на 100 і 1000 контактах. Розмір тіла
+відповіді записується в ``extra_info``::
+
+    RUN_BENCHMARKS=1 pytest tests/benchmarks/test_serialization.py \\
+        --benchmark-group-by=param:payload
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from src.api.contacts import contact_list
+from src.services.serialization import MsgPackResponse
+from src.tools.seed import DatasetFactory
+from tests.benchmarks.conftest import SEED
+
+RESPONSE_CLASSES = {
+    "json": JSONResponse,
+    "orjson": ORJSONResponse,
+    "msgpack": MsgPackResponse,
+}
+
+
+@pytest.fixture(scope="module", params=[100, 1000], ids=lambda size: f"size={size}")
+def payload(request):
+    factory = DatasetFactory(SEED)
+    contacts = [
+        {
+            **contact,
+            "id": number,
+            "created_at": datetime(2025, 1, 1),
+            "updated_at": None,
+        }
+        for number, contact in enumerate(factory.contacts([request.param]), 1)
+    ]
+    return contact_list.dump_python(contact_list.validate_python(contacts), mode="json")
+
+
+@pytest.mark.parametrize("encoder", list(RESPONSE_CLASSES))
+def test_encode_contacts(benchmark, payload, encoder):
+    response_class = RESPONSE_CLASSES[encoder]
+    response = benchmark(response_class, payload)
+    benchmark.extra_info["bytes"] = len(response.body)
@@ -0,0 +1,98 @@
+"""
+Бенчмарк запуску застосунку.
+
+Міряє в окремих процесах:
+
+- час імпорту ``main`` (холодний інтерпретатор);
+- час від запуску uvicorn до першої успішної відповіді ``GET /``.
+
+Результати пишуться в ``BENCH_STARTUP_REPORT``. Якщо задано
+``BENCH_STARTUP_BUDGET``, тест падає, коли медіана часу до першої відповіді
+перевищує бюджет (у секундах).
+"""
+
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from tests.benchmarks.conftest import BENCH_DIR
+
+RUNS = int(os.getenv("BENCH_STARTUP_RUNS", 5))
+REPORT_PATH = Path(
+    os.getenv("BENCH_STARTUP_REPORT", BENCH_DIR / "results" / "startup.json")
+)
+BUDGET = os.getenv("BENCH_STARTUP_BUDGET")
+IMPORT_CODE = (
+    "import time; start = time.perf_counter(); import main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import() -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_CODE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def measure_first_response(timeout: float = 30) -> float:
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+                if response.status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.TransportError:
+                pass
+            time.sleep(0.01)
+        raise TimeoutError(f"No response from uvicorn within {timeout} s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def summary(samples: list[float]) -> dict:
+    return {
+        "runs": len(samples),
+        "median_s": round(statistics.median(samples), 4),
+        "min_s": round(min(samples), 4),
+        "max_s": round(max(samples), 4),
+    }
+
+
+def test_startup():
+    imports = [measure_import() for _ in range(RUNS)]
+    first_responses = [measure_first_response() for _ in range(RUNS)]
+    report = {
+        "import_main": summary(imports),
+        "time_to_first_response": summary(first_responses),
+    }
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(json.dumps(report, indent=2))
+
+    if BUDGET:
+        median = report["time_to_first_response"]["median_s"]
+        assert median <= float(BUDGET), f"startup {median} s > {BUDGET} s"
@@ -1,4 +1,5 @@
 import asyncio
+import fakeredis
 import pytest
 import pytest_asyncio
 import sys
@@ -12,8 +13,10 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
 from main import app
 from src.database.models import Base, User
 from src.database.db import get_db
+from src.conf.config import settings
 from src.services.auth import create_access_token, Hash
-
+from src.services.instrumentation import install_query_listeners
+from src.services.redis_cache import redis_cache
 
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
@@ -22,6 +25,7 @@ engine = create_async_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+install_query_listeners(engine)
 
 TestingSessionLocal = async_sessionmaker(
     autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
@@ -50,7 +54,7 @@ async def init_models():
         await conn.run_sync(Base.metadata.create_all)
 
     async with TestingSessionLocal() as session:
-        hash_password = Hash().get_password_hash(test_user["password"])
+        hash_password = Hash.hash_password(test_user["password"])
         current_user = User(
             username=test_user["username"],
             email=test_user["email"],
@@ -99,6 +103,30 @@ def get_token(client):
     return response.json()["access_token"]
 
 
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Підміняє Redis застосунку на fakeredis"""
+    redis = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(redis_cache, "redis", redis)
+    return redis
+
+
+@pytest.fixture
+def broken_redis(monkeypatch):
+    """Підміняє Redis застосунку на сервер, з'єднання з яким завжди падає"""
+    server = fakeredis.FakeServer()
+    server.connected = False
+    redis = fakeredis.FakeAsyncRedis(server=server)
+    monkeypatch.setattr(redis_cache, "redis", redis)
+    return redis
+
+
+@pytest.fixture
+def strict_query_budget(monkeypatch):
+    """Вмикає строгий режим: перевищення бюджету SQL-запитів валить тест"""
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", True)
+
+
 @pytest.fixture(scope="session", autouse=True)
 async def setup_database():
     """Ініціалізуємо тестову БД перед запуском тестів"""
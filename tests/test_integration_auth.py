@@ -1,4 +1,3 @@
-from unittest.mock import Mock
 import pytest
 from sqlalchemy import select
 from src.conf import messages
@@ -13,18 +12,13 @@ user_data = {
 }
 
 
-def test_signup(auth_client, monkeypatch):
+def test_signup(auth_client):
     """
     Перевіряє можливість реєстрації нового користувача.
 
     :param auth_client: Тестовий клієнт FastAPI.
     :type auth_client: TestClient
-    :param monkeypatch: Інструмент для заміни функцій.
-    :type monkeypatch: pytest.MonkeyPatch
     """
-    mock_send_email = Mock()
-    monkeypatch.setattr("src.api.auth.send_email", mock_send_email)
-
     response = auth_client.post("/api/auth/register", json=user_data)
     assert response.status_code in [
         201,
@@ -38,18 +32,13 @@ def test_signup(auth_client, monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_repeat_signup(auth_client, monkeypatch):
+async def test_repeat_signup(auth_client):
     """
     Перевіряє, що повторна реєстрація користувача не дозволена.
 
     :param auth_client: Тестовий клієнт FastAPI.
     :type auth_client: TestClient
-    :param monkeypatch: Інструмент для заміни функцій.
-    :type monkeypatch: pytest.MonkeyPatch
     """
-    mock_send_email = Mock()
-    monkeypatch.setattr("src.api.auth.send_email", mock_send_email)
-
     response = auth_client.post("/api/auth/register", json=user_data)
     assert response.status_code == 409, response.text
     data = response.json()
@@ -0,0 +1,93 @@
+import email
+import re
+from email.policy import default as default_policy
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.api import auth
+from src.database.db import get_db
+from src.database.models import Base, EmailOutbox, User
+from src.services.auth import Hash, create_email_token
+from src.services.redis_cache import redis_cache
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(redis_cache, "redis", None)
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_db():
+        async with sessions() as session:
+            yield session
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with sessions() as session:
+            session.add(
+                User(
+                    username="ada",
+                    email="ada@example.com",
+                    hashed_password=Hash.hash_password("old-password"),
+                    confirmed=True,
+                )
+            )
+            await session.commit()
+
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api")
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        client.portal.call(setup)
+        client.sessions = sessions
+        yield client
+
+
+def test_password_reset_flow(client):
+    """
+    Перевіряє скидання пароля за посиланням із листа, записаного в чергу.
+    """
+    response = client.post(
+        "/api/auth/request-password-reset", json={"email": "ada@example.com"}
+    )
+    assert response.status_code == 200, response.text
+
+    async def staged():
+        async with client.sessions() as session:
+            entry = (await session.execute(select(EmailOutbox))).scalars().one()
+        return entry.kind, entry.message
+
+    kind, message = client.portal.call(staged)
+    assert kind == "reset"
+    body = email.message_from_string(message, policy=default_policy).get_content()
+    token = re.search(r"token=([\w.-]+)", body).group(1)
+
+    response = client.post(
+        "/api/auth/reset-password",
+        json={"token": token, "new_password": "new-password"},
+    )
+    assert response.status_code == 200, response.text
+
+    async def stored_hash():
+        async with client.sessions() as session:
+            return (await session.get(User, 1)).hashed_password
+
+    assert Hash.verify_password("new-password", client.portal.call(stored_hash))
+
+
+def test_reset_rejects_other_tokens(client):
+    """
+    Перевіряє, що токен підтвердження email не скидає пароль.
+    """
+    token = create_email_token({"sub": "ada@example.com"})
+    response = client.post(
+        "/api/auth/reset-password",
+        json={"token": token, "new_password": "new-password"},
+    )
+    assert response.status_code == 400
@@ -0,0 +1,102 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.api import users
+from src.database.db import get_db
+from src.database.models import Base, EmailOutbox, User, UserRole
+from src.services.auth import get_current_user
+from src.services.redis_cache import redis_cache
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(redis_cache, "redis", None)
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_db():
+        async with sessions() as session:
+            yield session
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with sessions() as session:
+            session.add_all(
+                [
+                    User(
+                        username="admin",
+                        email="admin@example.com",
+                        hashed_password="x",
+                        role=UserRole.ADMIN,
+                        confirmed=True,
+                    ),
+                    User(
+                        username="victim",
+                        email="victim@example.com",
+                        hashed_password="x",
+                        confirmed=True,
+                    ),
+                ]
+            )
+            await session.commit()
+
+    app = FastAPI()
+    app.include_router(users.router, prefix="/api")
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        client.portal.call(setup)
+        client.sessions = sessions
+        client.app_ = app
+        yield client
+    app.dependency_overrides.clear()
+
+
+def login_as(client, user_id: int, role: UserRole):
+    client.app_.dependency_overrides[get_current_user] = lambda: User(
+        id=user_id, role=role
+    )
+
+
+def test_anonymous_cannot_update_or_delete(client):
+    """
+    Перевіряє, що без автентифікації користувача не можна змінити чи видалити.
+    """
+    response = client.put("/api/users/users/2", json={"email": "attacker@x.com"})
+    assert response.status_code in (401, 403)
+    assert client.delete("/api/users/users/2").status_code in (401, 403)
+
+    login_as(client, 2, UserRole.USER)
+    response = client.put("/api/users/users/2", json={"email": "attacker@x.com"})
+    assert response.status_code == 403
+    assert client.delete("/api/users/users/2").status_code == 403
+
+
+def test_admin_changes_email_with_confirmation(client):
+    """
+    Перевіряє, що зайнятий email відхиляється, а новий потребує підтвердження.
+    """
+    login_as(client, 1, UserRole.ADMIN)
+    response = client.put("/api/users/users/2", json={"email": "admin@example.com"})
+    assert response.status_code == 409
+    response = client.put("/api/users/users/2", json={"username": "admin"})
+    assert response.status_code == 409
+
+    response = client.put("/api/users/users/2", json={"email": "new@example.com"})
+    assert response.status_code == 200, response.text
+    assert response.json()["email"] == "new@example.com"
+
+    async def check():
+        async with client.sessions() as session:
+            user = await session.get(User, 2)
+            outbox = (await session.execute(select(EmailOutbox))).scalars().all()
+        return user.confirmed, [(entry.kind, entry.recipient) for entry in outbox]
+
+    assert client.portal.call(check) == (False, [("verify", "new@example.com")])
+
+    assert client.delete("/api/users/users/2").status_code == 200
+    assert client.get("/api/users/users/2").status_code == 404
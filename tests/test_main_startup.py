@@ -0,0 +1,24 @@
+import json
+import subprocess
+import sys
+
+LAZY_MODULES = ["jinja2", "aiosmtplib", "cloudinary", "uvicorn", "aiosqlite", "asyncpg"]
+
+
+def test_import_main_has_no_side_effects():
+    """
+    Перевіряє, що імпорт ``main`` не завантажує рідко вживані інтеграції
+    та драйвери бази даних і не створює рушій.
+    """
+    code = (
+        "import json, sys, main;"
+        "print(json.dumps({"
+        "'modules': [m for m in %r if m in sys.modules],"
+        "'engine': main.sessionmanager._engine is not None}))" % LAZY_MODULES
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    state = json.loads(result.stdout.strip().splitlines()[-1])
+    assert state == {"modules": [], "engine": False}
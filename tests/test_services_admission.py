@@ -0,0 +1,111 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.services.admission import (
+    AdaptiveLimiter,
+    AdmissionController,
+    AdmissionMiddleware,
+    route_class,
+)
+
+
+def test_route_class():
+    """
+    Перевіряє розподіл запитів за класами.
+    """
+    assert route_class("POST", "/api/auth/login") == "auth"
+    assert route_class("PATCH", "/api/auth/avatar") == "uploads"
+    assert route_class("GET", "/api/contacts/search/") == "search"
+    assert route_class("GET", "/api/contacts/5") == "reads"
+    assert route_class("PUT", "/api/contacts/5") == "writes"
+    assert route_class("GET", "/metrics") is None
+    assert route_class("GET", "/api/admin/cache") is None
+
+
+def test_aimd():
+    """
+    Перевіряє мультиплікативне зменшення та адитивне зростання ліміту.
+    """
+    limiter = AdaptiveLimiter("test", 10, min_limit=2, target_latency=0.1)
+    limiter.in_flight = 2
+    limiter.release(1.0)
+    assert limiter.limit == pytest.approx(9.0)
+    # Повторне зменшення в межах цільової тривалості ігнорується.
+    limiter.release(1.0)
+    assert limiter.limit == pytest.approx(9.0)
+
+    limiter._last_decrease = 0
+    limiter.limit = 2.0
+    limiter.in_flight = 1
+    limiter.release(1.0)
+    assert limiter.limit == 2.0
+
+    for _ in range(4):
+        limiter.in_flight = 1
+        limiter.release(0.01)
+    assert 3.5 < limiter.limit < 4
+
+
+def make_client(**options):
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        if scope["path"].startswith("/api/contacts/search"):
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    controller = AdmissionController(
+        limits={"search": 1, "reads": 10}, target_latency_ms={}, **options
+    )
+    transport = httpx.ASGITransport(app=AdmissionMiddleware(app, controller))
+    client = httpx.AsyncClient(transport=transport, base_url="http://test")
+    return client, controller, release
+
+
+@pytest.mark.asyncio
+async def test_queue_deadline_and_isolation():
+    """
+    Перевіряє, що запит чекає в черзі, отримує 503 після дедлайну, а інший
+    клас маршрутів обробляється без очікування.
+    """
+    client, _, release = make_client(queue_timeout=0.05, retry_after=3)
+    first = asyncio.create_task(client.get("/api/contacts/search/?text=a"))
+    await asyncio.sleep(0.01)
+
+    response = await client.get("/api/contacts/search/?text=b")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+    assert (await client.get("/api/contacts/1")).status_code == 200
+
+    queued = asyncio.create_task(client.get("/api/contacts/search/?text=c"))
+    await asyncio.sleep(0.01)
+    release.set()
+    assert (await first).status_code == 200
+    assert (await queued).status_code == 200
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_immediately():
+    """
+    Перевіряє відмову без очікування, коли черга заповнена.
+    """
+    client, controller, release = make_client(queue_timeout=5)
+    limiter = controller.limiters["search"]
+    limiter.queue_size = 0
+    first = asyncio.create_task(client.get("/api/contacts/search/"))
+    await asyncio.sleep(0.01)
+    response = await asyncio.wait_for(client.get("/api/contacts/search/"), 1)
+    assert response.status_code == 503
+    release.set()
+    await first
+    await client.aclose()
+    assert limiter.stats() == {
+        "limit": 1.0,
+        "max_limit": 1,
+        "in_flight": 0,
+        "queued": 0,
+    }
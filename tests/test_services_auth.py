@@ -25,7 +25,7 @@ def test_create_access_token():
 
 
 def test_verify_password():
-    hashed = Hash().get_password_hash("mypassword")
+    hashed = Hash.hash_password("mypassword")
     assert Hash().verify_password("mypassword", hashed) is True
 
 
@@ -43,3 +43,25 @@ def test_get_email_from_token():
     token = create_access_token({"sub": "test@example.com"})
     email = get_email_from_token(token)
     assert email == "test@example.com"
+
+
+@pytest.mark.asyncio
+async def test_queued_hashing_is_counted(monkeypatch):
+    """
+    Перевіряє, що хешування, яке чекає на потік, уже враховане в метриці.
+    """
+    from src.services import auth
+    from src.services.metrics import PASSWORD_HASH_IN_PROGRESS
+
+    seen = []
+
+    async def queued(func, *args):
+        seen.append(PASSWORD_HASH_IN_PROGRESS._value.get())
+        return func(*args)
+
+    monkeypatch.setattr(auth, "run_in_threadpool", queued)
+    before = PASSWORD_HASH_IN_PROGRESS._value.get()
+    hashed = await Hash.hash_password_async("mypassword")
+    assert await Hash.verify_password_async("mypassword", hashed)
+    assert seen == [before + 1, before + 1]
+    assert PASSWORD_HASH_IN_PROGRESS._value.get() == before
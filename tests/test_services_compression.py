@@ -0,0 +1,153 @@
+import orjson
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.services.compression import (
+    ENCODINGS,
+    CompressionMiddleware,
+    choose_encoding,
+    decompress,
+)
+from src.services.response_cache import ResponseCache
+
+PAYLOAD = [{"id": i, "email": f"contact{i}@example.com"} for i in range(200)]
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/large")
+    async def large():
+        return ORJSONResponse(PAYLOAD)
+
+    @app.get("/small")
+    async def small():
+        return ORJSONResponse({"id": 1})
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(5):
+                yield f"line {i}\n".encode() * 50
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/encoded")
+    async def encoded():
+        return PlainTextResponse("x" * 2000, headers={"Content-Encoding": "custom"})
+
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return TestClient(app)
+
+
+def get_raw(client, path, accept_encoding):
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as r:
+        return r, b"".join(r.iter_raw())
+
+
+def test_choose_encoding():
+    """
+    Перевіряє вибір кодування за ``Accept-Encoding``.
+    """
+    assert choose_encoding("gzip, deflate, br, zstd") == "zstd"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert choose_encoding("*;q=0.1, zstd;q=0") == "br"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("") is None
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_large_response_is_compressed(client, encoding):
+    """
+    Перевіряє стиснення великої відповіді кожним кодуванням.
+    """
+    response, body = get_raw(client, "/large", encoding)
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(body)
+    assert len(body) < len(orjson.dumps(PAYLOAD)) / 3
+    assert orjson.loads(decompress(body, encoding)) == PAYLOAD
+
+
+def test_small_and_encoded_responses_are_not_compressed(client):
+    """
+    Перевіряє поріг розміру та відповіді, що вже мають ``Content-Encoding``.
+    """
+    response, body = get_raw(client, "/small", "gzip")
+    assert "content-encoding" not in response.headers
+    assert orjson.loads(body) == {"id": 1}
+
+    response, body = get_raw(client, "/encoded", "gzip")
+    assert response.headers["content-encoding"] == "custom"
+    assert body == b"x" * 2000
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_streaming_response_is_compressed_per_chunk(client, encoding):
+    """
+    Перевіряє потокове стиснення ``StreamingResponse``.
+    """
+    response, body = get_raw(client, "/stream", encoding)
+    assert response.headers["content-encoding"] == encoding
+    assert "content-length" not in response.headers
+    expected = b"".join(f"line {i}\n".encode() * 50 for i in range(5))
+    assert decompress(body, encoding) == expected
+
+
+def make_request(accept_encoding: str) -> Request:
+    headers = [(b"accept-encoding", accept_encoding.encode())]
+    return Request({"type": "http", "headers": headers})
+
+
+@pytest.mark.asyncio
+async def test_response_cache_stores_precompressed_variants(fake_redis):
+    """
+    Перевіряє, що кеш віддає готові стиснені тіла й інвалідовується.
+    """
+    cache = ResponseCache("test", minimum_size=500)
+    original = ORJSONResponse(PAYLOAD)
+    cached, generation = await cache.get(1, "json:0:100", make_request("br"))
+    assert cached is None
+    assert await cache.set(1, "json:0:100", original, generation)
+    assert await fake_redis.ttl(f"test:1:{generation}:json:0:100") > 0
+
+    cached, _ = await cache.get(1, "json:0:100", make_request("br, gzip"))
+    assert cached.headers["content-encoding"] == "br"
+    assert cached.media_type == "application/json"
+    assert decompress(cached.body, "br") == original.body
+
+    cached, _ = await cache.get(1, "json:0:100", make_request("identity"))
+    assert "content-encoding" not in cached.headers
+    assert cached.body == original.body
+
+    await cache.invalidate(1)
+    cached, _ = await cache.get(1, "json:0:100", make_request("br"))
+    assert cached is None
+
+
+@pytest.mark.asyncio
+async def test_response_cache_skips_stale_pages(fake_redis):
+    """
+    Перевіряє, що сторінка, зібрана до інвалідації, не потрапляє в кеш.
+    """
+    cache = ResponseCache("test")
+    _, generation = await cache.get(1, "json:0:100", make_request("gzip"))
+    await cache.invalidate(1)
+    assert not await cache.set(1, "json:0:100", ORJSONResponse(PAYLOAD), generation)
+    cached, generation = await cache.get(1, "json:0:100", make_request("gzip"))
+    assert cached is None
+    assert await cache.set(1, "json:0:100", ORJSONResponse(PAYLOAD), generation)
+
+
+@pytest.mark.asyncio
+async def test_response_cache_survives_redis_errors(broken_redis):
+    """
+    Перевіряє, що збій Redis лише вимикає кеш відповідей.
+    """
+    cache = ResponseCache("test")
+    assert await cache.get(1, "json:0:100", make_request("gzip")) == (None, None)
+    assert not await cache.set(1, "json:0:100", ORJSONResponse(PAYLOAD), 0)
+    await cache.invalidate(1)
@@ -1,14 +1,22 @@
-import pytest
-from unittest.mock import AsyncMock
-from src.services.email import send_email
+from src.services.email import reset_email, verification_email
 
 
-@pytest.mark.asyncio
-async def test_send_email():
+def test_verification_email():
     """
-    Тестує виклик send_email без помилок.
+    Тестує створення листа підтвердження з посиланням на токен.
     """
-    mock_email_service = AsyncMock()
-    mock_email_service.send_email = AsyncMock(return_value=True)
-    await send_email("test@example.com", "testuser", "http://localhost")
-    mock_email_service.send_email.assert_called_once()
+    message = verification_email("test@example.com", "testuser", "http://localhost/")
+    assert message["To"] == "test@example.com"
+    assert message["Subject"] == "Confirm your email"
+    body = message.get_content()
+    assert "testuser" in body
+    assert "http://localhost/api/auth/confirmed_email/" in body
+
+
+def test_reset_email():
+    """
+    Тестує створення листа для скидання пароля.
+    """
+    message = reset_email("test@example.com", "token123")
+    assert message["To"] == "test@example.com"
+    assert "reset-password?token=token123" in message.get_content()
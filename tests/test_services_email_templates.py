@@ -0,0 +1,68 @@
+import pytest
+from jinja2 import TemplateNotFound
+
+from src.services.email_templates import EmailTemplates
+
+
+@pytest.fixture
+def folder(tmp_path):
+    (tmp_path / "hello.html").write_text("<p>Hi {{ username }} from {{ host }}</p>")
+    (tmp_path / "footer.html").write_text("<p>The Our Team</p>")
+    (tmp_path / "page.html").write_text("{% include 'footer.html' %}")
+    return tmp_path
+
+
+def test_templates_are_compiled_once(folder):
+    """
+    Перевіряє, що всі шаблони компілюються під час завантаження, а зміни
+    файлів підхоплює лише повторне завантаження.
+    """
+    templates = EmailTemplates(folder)
+    assert templates.load() == 3
+
+    template = templates.get("hello.html")
+    (folder / "hello.html").write_text("<p>Bye {{ username }}</p>")
+    assert templates.get("hello.html") is template
+    assert (
+        templates.render("hello.html", username="a", host="h") == "<p>Hi a from h</p>"
+    )
+
+    templates.load()
+    assert templates.render("hello.html", username="a") == "<p>Bye a</p>"
+
+
+def test_static_templates_are_rendered_once(folder):
+    """
+    Перевіряє, що шаблон без змінних рендериться під час завантаження, а
+    шаблон з ``include`` — під час кожного виклику.
+    """
+    templates = EmailTemplates(folder)
+    templates.load()
+
+    assert templates._static == {"footer.html": "<p>The Our Team</p>"}
+    assert templates.render("footer.html") == "<p>The Our Team</p>"
+    assert templates.render("page.html") == "<p>The Our Team</p>"
+
+
+def test_render_many_merges_common_variables(folder):
+    """
+    Перевіряє пакетний рендеринг зі спільними змінними та екрануванням HTML.
+    """
+    templates = EmailTemplates(folder)
+    bodies = templates.render_many(
+        "hello.html",
+        [{"username": "ann"}, {"username": "<b>bob</b>", "host": "other"}],
+        host="app",
+    )
+    assert list(bodies) == [
+        "<p>Hi ann from app</p>",
+        "<p>Hi &lt;b&gt;bob&lt;/b&gt; from other</p>",
+    ]
+
+
+def test_missing_template(folder):
+    """
+    Перевіряє помилку для відсутнього шаблону.
+    """
+    with pytest.raises(TemplateNotFound):
+        EmailTemplates(folder).render("missing.html")
@@ -0,0 +1,109 @@
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.conf.config import settings
+from src.services.instrumentation import (
+    InstrumentedRoute,
+    QueryBudgetExceeded,
+    ServerTimingMiddleware,
+    current_metrics,
+    install_query_listeners,
+    query_budget,
+    timed,
+    track_queries,
+)
+
+
+def make_app():
+    router = APIRouter(route_class=InstrumentedRoute)
+
+    @router.get("/cached")
+    async def cached():
+        with timed("cache"):
+            pass
+        return {"ok": True}
+
+    @router.get("/heavy")
+    @query_budget(1)
+    async def heavy():
+        metrics = current_metrics()
+        metrics.record_query("SELECT 1", 0.001)
+        metrics.record_query("SELECT 1", 0.001)
+        return {"ok": True}
+
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+    app.include_router(router)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_track_queries_counts_repeated_statements():
+    """
+    Перевіряє підрахунок SQL-запитів та виявлення повторів (N+1).
+    """
+    engine = create_async_engine("sqlite+aiosqlite://")
+    install_query_listeners(engine)
+
+    with track_queries() as metrics:
+        async with engine.connect() as conn:
+            for _ in range(3):
+                await conn.execute(text("SELECT 1"))
+    await engine.dispose()
+
+    assert metrics.queries == 3
+    assert metrics.db_time > 0
+    assert metrics.repeated_statements(threshold=3) == {"SELECT 1": 3}
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_leave_no_state():
+    """
+    Перевіряє, що запити з помилкою не залишають стан у з'єднанні.
+    """
+    engine = create_async_engine("sqlite+aiosqlite://")
+    install_query_listeners(engine)
+
+    with track_queries() as metrics:
+        async with engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(Exception):
+                    await conn.execute(text("SELECT * FROM missing"))
+            await conn.execute(text("SELECT 1"))
+            info = dict((await conn.get_raw_connection()).info)
+    await engine.dispose()
+
+    assert metrics.queries == 1
+    assert "query_start_time" not in info
+
+
+def test_server_timing_header():
+    """
+    Перевіряє, що відповідь містить заголовок Server-Timing з етапами обробки.
+    """
+    client = TestClient(make_app())
+
+    response = client.get("/cached")
+
+    assert response.status_code == 200
+    server_timing = response.headers["server-timing"]
+    assert server_timing.startswith('db;dur=0.00;desc="0 queries"')
+    assert "cache;dur=" in server_timing
+    assert "serialize;dur=" in server_timing
+
+
+def test_strict_query_budget(monkeypatch):
+    """
+    Перевіряє, що у строгому режимі перевищення бюджету запитів валить запит.
+    """
+    client = TestClient(make_app())
+
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", False)
+    assert client.get("/heavy").status_code == 200
+
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", True)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/heavy")
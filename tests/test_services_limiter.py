@@ -0,0 +1,92 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from src.conf.config import settings
+from src.services.limiter import (
+    RateLimiter,
+    RateLimitExceeded,
+    parse_rate,
+    rate_limit_handler,
+)
+from src.services.redis_cache import redis_cache
+
+
+def make_client(*dependencies):
+    app = FastAPI()
+    app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
+
+    @app.get("/limited", dependencies=[Depends(d) for d in dependencies])
+    async def limited():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def bearer(username):
+    token = jwt.encode(
+        {"sub": username}, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_parse_rate():
+    """
+    Перевіряє розбір лімітів.
+    """
+    assert parse_rate("10/minute") == (10, 60)
+    assert parse_rate("100/5 minutes") == (100, 300)
+    with pytest.raises(ValueError):
+        parse_rate("10/fortnight")
+
+
+def test_bucket_is_shared_and_sets_headers(fake_redis):
+    """
+    Перевіряє, що два обмежувачі (два воркери) ділять одне відро і що
+    відповіді мають заголовки ``RateLimit-*``.
+    """
+    first = make_client(RateLimiter().limit("2/minute"))
+    second = make_client(RateLimiter().limit("2/minute"))
+
+    response = first.get("/limited")
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Limit"] == "2"
+    assert response.headers["RateLimit-Remaining"] == "1"
+    assert response.headers["RateLimit-Policy"] == "2;w=60"
+    assert second.get("/limited").headers["RateLimit-Remaining"] == "0"
+
+    response = first.get("/limited")
+    assert response.status_code == 429
+    assert response.headers["RateLimit-Remaining"] == "0"
+    assert 1 <= int(response.headers["Retry-After"]) <= 30
+
+
+def test_per_user_buckets_and_overrides(fake_redis):
+    """
+    Перевіряє окремі відра користувачів і заміну ліміту через налаштування.
+    """
+    limiter = RateLimiter(overrides={"/limited": "1/minute"})
+    client = make_client(limiter.limit("100/minute", per="user"))
+
+    assert client.get("/limited", headers=bearer("alice")).status_code == 200
+    assert client.get("/limited", headers=bearer("alice")).status_code == 429
+    assert client.get("/limited", headers=bearer("bob")).status_code == 200
+    # Без токена ліміт рахується за IP-адресою.
+    assert client.get("/limited").status_code == 200
+
+
+def test_most_restrictive_headers_and_no_redis(fake_redis, monkeypatch):
+    """
+    Перевіряє заголовки для кількох лімітів і пропуск запитів без Redis.
+    """
+    limiter = RateLimiter()
+    client = make_client(
+        limiter.limit("100/minute"), limiter.limit("5/minute", name="tight")
+    )
+    assert client.get("/limited").headers["RateLimit-Limit"] == "5"
+
+    monkeypatch.setattr(redis_cache, "redis", None)
+    response = client.get("/limited")
+    assert response.status_code == 200
+    assert "RateLimit-Limit" not in response.headers
@@ -0,0 +1,46 @@
+import time
+
+from src.services.local_cache import LocalCache
+
+
+def test_lru_eviction():
+    """
+    Перевіряє витіснення найдавніше використаних записів.
+    """
+    cache = LocalCache(max_entries=2, ttl=60)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    assert cache.get("a") == b"1"
+    cache.set("c", b"3")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+    assert len(cache) == 2
+
+
+def test_ttl_expiry(monkeypatch):
+    """
+    Перевіряє, що записи застарівають не пізніше TTL локального рівня.
+    """
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache = LocalCache(max_entries=10, ttl=30)
+    cache.set("short", b"1", ttl=5)
+    cache.set("long", b"2", ttl=3600)
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+    assert cache.get("short") is None
+    assert cache.get("long") == b"2"
+    monkeypatch.setattr(time, "monotonic", lambda: now + 31)
+    assert cache.get("long") is None
+    assert len(cache) == 0
+
+
+def test_delete_and_clear():
+    cache = LocalCache(max_entries=10, ttl=60)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.delete(["a", "missing"])
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
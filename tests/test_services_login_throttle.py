@@ -0,0 +1,69 @@
+import pytest
+from fastapi import HTTPException
+
+from src.conf.config import settings
+from src.services.login_throttle import LoginThrottle
+
+
+@pytest.mark.asyncio
+async def test_progressive_delay_and_lockout(fake_redis, monkeypatch):
+    """
+    Перевіряє затримку після кількох невдач, блокування після порогу та
+    скидання лічильника після успішного входу.
+    """
+    monkeypatch.setattr(settings, "LOGIN_DELAY_AFTER", 2)
+    monkeypatch.setattr(settings, "LOGIN_DELAY_BASE", 1)
+    monkeypatch.setattr(settings, "LOGIN_LOCKOUT_THRESHOLD", 4)
+    monkeypatch.setattr(settings, "LOGIN_LOCKOUT_SECONDS", 600)
+    throttle = LoginThrottle()
+
+    await throttle.check("Alice", "10.0.0.1")
+    assert await throttle.failure("Alice") == 1
+    await throttle.check("alice", "10.0.0.1")
+
+    assert await throttle.failure("alice") == 2
+    with pytest.raises(HTTPException) as e:
+        await throttle.check("alice", "10.0.0.2")
+    assert e.value.status_code == 429
+    assert e.value.headers["Retry-After"] == "1"
+    await throttle.check("bob", "10.0.0.1")
+
+    await throttle.failure("alice")
+    assert 1500 < await fake_redis.pttl("login:blocked:alice") <= 2000
+    await throttle.failure("alice")
+    assert await fake_redis.ttl("login:blocked:alice") > 590
+
+    await throttle.success("alice")
+    await throttle.check("alice", "10.0.0.1")
+    assert await throttle.failure("alice") == 1
+
+
+@pytest.mark.asyncio
+async def test_ip_rate_and_disabled(fake_redis, monkeypatch):
+    """
+    Перевіряє ліміт спроб з однієї IP-адреси та вимкнений обмежувач.
+    """
+    monkeypatch.setattr(settings, "LOGIN_RATE_PER_IP", "2/minute")
+    throttle = LoginThrottle()
+    await throttle.check("a", "10.0.0.1")
+    await throttle.check("b", "10.0.0.1")
+    with pytest.raises(HTTPException) as e:
+        await throttle.check("c", "10.0.0.1")
+    assert e.value.status_code == 429
+    await throttle.check("c", "10.0.0.2")
+
+    throttle.enabled = False
+    await throttle.check("c", "10.0.0.1")
+    assert await throttle.failure("c") == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_allow_login(broken_redis):
+    """
+    Перевіряє, що збій Redis не блокує вхід.
+    """
+    throttle = LoginThrottle()
+    throttle.enabled = True
+    await throttle.check("alice", "1.2.3.4")
+    assert await throttle.failure("alice") == 0
+    await throttle.success("alice")
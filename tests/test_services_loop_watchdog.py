@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+
+from src.services.auth import Hash
+from src.services.loop_watchdog import LoopWatchdog, assert_no_blocking
+
+
+def blocking_handler():
+    time.sleep(0.15)
+
+
+@pytest.mark.asyncio
+async def test_watchdog_captures_stack_of_blocking_code():
+    """
+    Перевіряє, що сторож знімає стек коду, який заблокував цикл подій.
+    """
+    before = REGISTRY.get_sample_value("event_loop_blocks_total") or 0
+    watchdog = LoopWatchdog(threshold_ms=50, interval_ms=10)
+    watchdog.start()
+    await asyncio.sleep(0.03)
+    blocking_handler()
+    await asyncio.sleep(0.03)
+    await watchdog.stop()
+
+    [block] = watchdog.blocks
+    assert block["blocked_ms"] >= 50
+    assert "blocking_handler" in block["stack"]
+    assert REGISTRY.get_sample_value("event_loop_blocks_total") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_assert_no_blocking():
+    """
+    Перевіряє допоміжну перевірку для тестів ендпоінтів.
+    """
+    app = FastAPI()
+    hashed = Hash.hash_password("secret")
+
+    @app.get("/sync-bcrypt")
+    async def sync_bcrypt():
+        return Hash.verify_password("secret", hashed)
+
+    @app.get("/threadpool-bcrypt")
+    async def threadpool_bcrypt():
+        return await Hash.verify_password_async("secret", hashed)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        async with assert_no_blocking(threshold_ms=50):
+            await asyncio.sleep(0.1)
+            assert (await c.get("/threadpool-bcrypt")).json() is True
+
+        with pytest.raises(AssertionError, match="sync_bcrypt"):
+            async with assert_no_blocking(threshold_ms=50):
+                for _ in range(5):
+                    await c.get("/sync-bcrypt")
@@ -0,0 +1,159 @@
+import asyncio
+import socket
+
+import aiosmtplib
+import pytest
+from aiosmtpd.controller import Controller
+
+from src.services.email import build_message
+from src.services.mailer import MailDelivery
+
+
+class RecordingHandler:
+    """
+    Обробник aiosmtpd, що запам'ятовує з'єднання й листи.
+
+    Адресати з ``fail_once`` спершу отримують тимчасову відмову ``451``,
+    адресати з ``reject`` — постійну ``550``.
+    """
+
+    def __init__(self):
+        self.sessions = 0
+        self.messages = []
+        self.fail_once = set()
+        self.reject = set()
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.reject:
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        recipient = envelope.rcpt_tos[0]
+        if recipient in self.fail_once:
+            self.fail_once.discard(recipient)
+            return "451 Try again later"
+        self.messages.append(recipient)
+        return "250 Message accepted"
+
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield handler, port
+    controller.stop()
+
+
+def make_mailer(port, **kwargs):
+    options = {"pool_size": 2, "batch_size": 10, "retry_backoff": 0.01}
+    options.update(kwargs)
+    return MailDelivery(
+        lambda: aiosmtplib.SMTP(hostname="127.0.0.1", port=port, start_tls=False),
+        **options,
+    )
+
+
+def message(recipient):
+    return build_message(recipient, "Test", "<p>Hello</p>")
+
+
+@pytest.mark.asyncio
+async def test_messages_reuse_pooled_connections(smtp_server):
+    """
+    Перевіряє, що листи відправляються через постійні з'єднання пулу.
+    """
+    handler, port = smtp_server
+    mailer = make_mailer(port)
+
+    await asyncio.gather(
+        *(mailer.send(message(f"user{i}@example.com")) for i in range(30))
+    )
+    await mailer.stop()
+
+    assert len(handler.messages) == 30
+    assert handler.sessions <= 2
+    stats = mailer.stats()
+    assert stats["sent"] == 30
+    assert stats["connections_opened"] <= 2
+    assert stats["messages_per_second"] > 0
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_is_retried(smtp_server):
+    """
+    Перевіряє повторну спробу після тимчасової відмови сервера.
+    """
+    handler, port = smtp_server
+    handler.fail_once.add("retry@example.com")
+    mailer = make_mailer(port)
+
+    await mailer.send(message("retry@example.com"))
+    await mailer.stop()
+
+    assert handler.messages == ["retry@example.com"]
+    assert mailer.stats()["retried"] == 1
+
+
+@pytest.mark.asyncio
+async def test_permanent_failure_is_not_retried(smtp_server):
+    """
+    Перевіряє, що постійна відмова одразу повертається викликачу, а інші
+    листи відправляються.
+    """
+    handler, port = smtp_server
+    handler.reject.add("missing@example.com")
+    mailer = make_mailer(port, pool_size=1)
+
+    with pytest.raises(aiosmtplib.SMTPRecipientsRefused):
+        await mailer.send(message("missing@example.com"))
+    await mailer.send(message("ok@example.com"))
+    await mailer.stop()
+
+    assert handler.messages == ["ok@example.com"]
+    assert mailer.stats()["failed"] == 1
+    assert mailer.stats()["retried"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unreachable_server_fails_after_retries():
+    """
+    Перевіряє, що недоступний сервер дає помилку після всіх спроб.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    mailer = make_mailer(port, retry_attempts=3)
+
+    with pytest.raises(OSError):
+        await mailer.send(message("user@example.com"))
+    await mailer.stop()
+
+    assert mailer.stats()["retried"] == 2
+    assert mailer.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queue(smtp_server):
+    """
+    Перевіряє, що зупинка дочікується відправлення листів із черги.
+    """
+    handler, port = smtp_server
+    mailer = make_mailer(port)
+
+    futures = [mailer.enqueue(message(f"user{i}@example.com")) for i in range(15)]
+    await mailer.stop()
+
+    assert all(future.done() and future.exception() is None for future in futures)
+    assert len(handler.messages) == 15
+    assert mailer.stats()["connected"] == 0
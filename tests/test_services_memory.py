@@ -0,0 +1,69 @@
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.services.memory import MemoryProfiler, MemorySamplingMiddleware, module_group
+
+
+@pytest.fixture
+def profiler():
+    profiler = MemoryProfiler(frames=1, max_snapshots=3)
+    profiler.start()
+    yield profiler
+    profiler.stop()
+
+
+def test_module_group():
+    """
+    Перевіряє групування файлів за модулями.
+    """
+    root = os.sep + os.path.join("app", "src")
+    assert module_group(os.path.join(root, "repository", "contacts.py")) == (
+        "src.repository"
+    )
+    assert module_group(os.path.join(root, "conf", "config.py")) == "src"
+    assert module_group(os.path.join(os.sep, "venv", "sqlalchemy", "orm.py")) == (
+        "sqlalchemy"
+    )
+    assert module_group(os.path.join(os.sep, "venv", "other.py")) == "other"
+
+
+def test_snapshot_diff_shows_new_allocations(profiler):
+    """
+    Перевіряє, що різниця знімків показує місце нового виділення.
+    """
+    first = profiler.take_snapshot()
+    retained = [bytes(1024) for _ in range(2048)]
+    second = profiler.take_snapshot()
+
+    diff = profiler.diff(second["id"])
+    assert diff["base"] == first["id"]
+    assert diff["size_diff"] >= 2 * 1024 * 1024
+    assert diff["sites"][0]["file"] == __file__
+    assert diff["sites"][0]["size_diff"] >= 2 * 1024 * 1024
+    assert profiler.diff(second["id"], base_id=999) is None
+    del retained
+
+
+def test_middleware_records_route_peak(profiler):
+    """
+    Перевіряє вимір пікового виділення пам'яті для маршруту.
+    """
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        payload = [bytes(1024) for _ in range(1024)]
+        return {"id": item_id, "size": len(payload)}
+
+    app.add_middleware(MemorySamplingMiddleware, profiler=profiler)
+    client = TestClient(app)
+    client.get("/items/1")
+    client.get("/items/2")
+
+    [stats] = profiler.route_stats()
+    assert stats["route"] == "/items/{item_id}"
+    assert stats["samples"] == 2
+    assert stats["max_bytes"] >= 1024 * 1024
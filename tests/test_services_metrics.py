@@ -0,0 +1,67 @@
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.api import metrics
+from src.services.cache_codec import codec
+from src.services.metrics import MetricsMiddleware
+from src.services.redis_cache import RedisCache
+
+
+def sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    return app
+
+
+def test_request_metrics_use_route_template():
+    """
+    Перевіряє, що метрики запитів групуються за шаблоном маршруту.
+    """
+    client = TestClient(make_app())
+    labels = {"method": "GET", "route": "/items/{item_id}", "status": "200"}
+    before = sample("http_requests_total", labels)
+
+    client.get("/items/1")
+    client.get("/items/2")
+
+    assert sample("http_requests_total", labels) == before + 2
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert 'route="/items/{item_id}"' in response.text
+    assert "/items/1" not in response.text
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_and_miss_counters():
+    """
+    Перевіряє облік влучань і промахів RedisCache.
+    """
+    cache = RedisCache()
+    cache.redis = AsyncMock()
+    hits = sample("cache_requests_total", {"result": "hit"})
+    misses = sample("cache_requests_total", {"result": "miss"})
+    stale = sample("cache_requests_total", {"result": "stale"})
+
+    cache.redis.get.return_value = None
+    assert await cache.get("user:1") is None
+    cache.redis.get.return_value = codec.dumps({"id": 1})
+    assert await cache.get("user:1") == {"id": 1}
+    cache.redis.get.return_value = b'{"id": 1}'
+    assert await cache.get("user:1") is None
+
+    assert sample("cache_requests_total", {"result": "hit"}) == hits + 1
+    assert sample("cache_requests_total", {"result": "miss"}) == misses + 1
+    assert sample("cache_requests_total", {"result": "stale"}) == stale + 1
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.api import contacts
+from src.database.db import get_db
+from src.database.models import User
+from src.services.auth import get_current_user
+from src.services.negative_cache import NegativeCache
+
+
+def hits(entity):
+    return (
+        REGISTRY.get_sample_value("negative_cache_hits_total", {"entity": entity}) or 0
+    )
+
+
+@pytest.mark.asyncio
+async def test_add_contains_discard(fake_redis):
+    """
+    Перевіряє запис, перевірку та видалення відсутнього ідентифікатора.
+    """
+    cache = NegativeCache("things", ttl=30)
+    before = hits("things")
+    assert not await cache.contains(1)
+    await cache.add(1)
+    assert await cache.contains(1)
+    assert hits("things") == before + 1
+    await cache.discard(1)
+    assert not await cache.contains(1)
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_are_cache_misses(broken_redis):
+    """
+    Перевіряє, що збій Redis вважається відсутністю запису в кеші.
+    """
+    cache = NegativeCache("things", ttl=30)
+    await cache.add(1)
+    assert not await cache.contains(1)
+    await cache.discard(1)
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_and_are_bounded(fake_redis, monkeypatch):
+    """
+    Перевіряє, що записи застарівають і множина не росте понад ліміт.
+    """
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    cache = NegativeCache("things", ttl=30, max_entries=3)
+    for member in range(5):
+        await cache.add(member)
+    assert await fake_redis.zcard(cache.key) == 3
+    assert not await cache.contains(0)
+    assert await cache.contains(4)
+
+    monkeypatch.setattr(time, "time", lambda: now + 31)
+    assert not await cache.contains(4)
+    await cache.add(100)
+    assert await fake_redis.zcard(cache.key) == 1
+
+
+class StubContactService:
+    calls = 0
+
+    def __init__(self, db):
+        pass
+
+    async def get_contact(self, contact_id, user):
+        StubContactService.calls += 1
+        return None
+
+
+def test_missing_contact_is_not_queried_twice(fake_redis, monkeypatch):
+    """
+    Перевіряє, що повторний запит неіснуючого контакту не йде в базу даних.
+    """
+    monkeypatch.setattr(contacts, "ContactService", StubContactService)
+    app = FastAPI()
+    app.include_router(contacts.router, prefix="/api")
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_current_user] = lambda: User(id=1)
+    client = TestClient(app)
+
+    assert client.get("/api/contacts/999").status_code == 404
+    assert client.get("/api/contacts/999").status_code == 404
+    assert StubContactService.calls == 1
@@ -0,0 +1,210 @@
+from datetime import timedelta
+
+import aiosmtplib
+import pytest
+import pytest_asyncio
+from fastapi import Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.api.auth import register_user
+from src.database.models import Base, EmailOutbox, OutboxStatus, User
+from src.schemas.users import UserCreate
+from src.services.email import build_message
+from src.services.outbox import (
+    OutboxWorker,
+    dead_letters,
+    retry_dead_letter,
+    stage_email,
+    utcnow,
+)
+from src.services.redis_cache import redis_cache
+
+
+class FakeDelivery:
+    """
+    Замінник пулу відправлення: адресати з ``errors`` отримують відповідний
+    виняток.
+    """
+
+    def __init__(self):
+        self.sent = []
+        self.errors = {}
+
+    async def send(self, message, kind="email"):
+        recipient = message["To"]
+        if recipient in self.errors:
+            raise self.errors[recipient]
+        self.sent.append((kind, recipient, message["Subject"]))
+
+    def stats(self):
+        return {"messages_per_second": 0.0}
+
+
+@pytest_asyncio.fixture
+async def sessions():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def delivery():
+    return FakeDelivery()
+
+
+@pytest.fixture
+def worker(sessions, delivery):
+    return OutboxWorker(
+        sessions, delivery, batch_size=10, max_attempts=3, retry_backoff=60
+    )
+
+
+async def stage(sessions, *recipients):
+    async with sessions() as session:
+        for recipient in recipients:
+            stage_email(session, build_message(recipient, "Hi", "<p>Hi</p>"), "test")
+        await session.commit()
+
+
+async def entries(sessions):
+    async with sessions() as session:
+        rows = await session.execute(select(EmailOutbox).order_by(EmailOutbox.id))
+        return {entry.recipient: entry for entry in rows.scalars()}
+
+
+@pytest.mark.asyncio
+async def test_email_is_committed_with_the_user_change(sessions):
+    """
+    Перевіряє, що лист потрапляє в чергу лише разом зі зміною, що його
+    спричинила.
+    """
+    async with sessions() as session:
+        session.add(User(username="a", email="a@example.com", hashed_password="x"))
+        stage_email(session, build_message("a@example.com", "Hi", "<p/>"), "verify")
+        await session.rollback()
+    assert await entries(sessions) == {}
+
+    async with sessions() as session:
+        session.add(User(username="a", email="a@example.com", hashed_password="x"))
+        stage_email(session, build_message("a@example.com", "Hi", "<p/>"), "verify")
+        await session.commit()
+    assert list(await entries(sessions)) == ["a@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_batch_is_sent_and_marked(sessions, worker, delivery):
+    """
+    Перевіряє відправлення пакета і позначення листів відправленими.
+    """
+    await stage(sessions, "a@example.com", "b@example.com")
+
+    assert await worker.process_batch() == 2
+    assert await worker.process_batch() == 0
+
+    assert delivery.sent == [
+        ("test", "a@example.com", "Hi"),
+        ("test", "b@example.com", "Hi"),
+    ]
+    for entry in (await entries(sessions)).values():
+        assert entry.status == OutboxStatus.SENT
+        assert entry.attempts == 1
+        assert entry.sent_at is not None
+
+
+@pytest.mark.asyncio
+async def test_claimed_emails_are_leased(sessions, worker):
+    """
+    Перевіряє, що забрані листи не видаються іншому воркеру.
+    """
+    await stage(sessions, "a@example.com")
+
+    assert len(await worker.claim()) == 1
+    assert await worker.claim() == []
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_is_retried_then_dead(sessions, worker, delivery):
+    """
+    Перевіряє відкладення листа після тимчасової помилки та перехід у
+    ``dead`` після вичерпання спроб.
+    """
+    delivery.errors["a@example.com"] = ConnectionRefusedError("refused")
+    await stage(sessions, "a@example.com", "b@example.com")
+
+    before = utcnow()
+    await worker.process_batch()
+    entry = (await entries(sessions))["a@example.com"]
+    assert entry.status == OutboxStatus.PENDING
+    assert entry.last_error == "refused"
+    assert entry.next_attempt_at >= before + timedelta(seconds=59)
+    assert (await entries(sessions))["b@example.com"].status == OutboxStatus.SENT
+
+    for _ in range(2):
+        async with sessions() as session:
+            entry = await session.get(EmailOutbox, entry.id)
+            entry.next_attempt_at = utcnow()
+            await session.commit()
+        await worker.process_batch()
+
+    entry = (await entries(sessions))["a@example.com"]
+    assert entry.status == OutboxStatus.DEAD
+    assert entry.attempts == 3
+
+
+@pytest.mark.asyncio
+async def test_permanent_failure_goes_to_dead_letters(sessions, worker, delivery):
+    """
+    Перевіряє, що постійна відмова одразу позначає лист недоставленим і що
+    його можна повернути в чергу.
+    """
+    delivery.errors["gone@example.com"] = aiosmtplib.SMTPRecipientsRefused(
+        [aiosmtplib.SMTPRecipientRefused(550, "No such user", "gone@example.com")]
+    )
+    await stage(sessions, "gone@example.com")
+
+    await worker.process_batch()
+
+    async with sessions() as session:
+        dead = await dead_letters(session)
+    assert [entry["recipient"] for entry in dead] == ["gone@example.com"]
+    assert dead[0]["attempts"] == 1
+
+    del delivery.errors["gone@example.com"]
+    async with sessions() as session:
+        assert await retry_dead_letter(session, dead[0]["id"])
+        assert not await retry_dead_letter(session, dead[0]["id"])
+    await worker.process_batch()
+    assert (await entries(sessions))["gone@example.com"].status == OutboxStatus.SENT
+
+
+@pytest.mark.asyncio
+async def test_signup_stages_verification_email(sessions, monkeypatch):
+    """
+    Перевіряє, що реєстрація записує лист підтвердження в чергу разом із
+    користувачем.
+    """
+    monkeypatch.setattr(redis_cache, "redis", None)
+    request = Request(
+        {
+            "type": "http",
+            "scheme": "http",
+            "server": ("testserver", 80),
+            "path": "/api/auth/register",
+            "headers": [],
+        }
+    )
+    body = UserCreate(username="agent007", email="agent007@gmail.com", password="x")
+    async with sessions() as session:
+        user = await register_user(body, request, session)
+
+    async with sessions() as session:
+        result = await session.execute(select(EmailOutbox))
+        entry = result.scalars().one()
+    assert user.email == entry.recipient == "agent007@gmail.com"
+    assert entry.kind == "verify"
+    assert entry.status == OutboxStatus.PENDING
+    assert "http://testserver/api/auth/confirmed_email/" in entry.message
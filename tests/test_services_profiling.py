@@ -0,0 +1,80 @@
+import time
+from collections import Counter
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.services.profiling import (
+    ProfileStore,
+    ProfilingMiddleware,
+    StackSampler,
+    create_profile_token,
+)
+
+
+def spin(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_stack_sampler_collects_collapsed_stacks():
+    """
+    Перевіряє, що семплер знімає стеки поточного потоку.
+    """
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    spin(0.05)
+    stacks = sampler.stop()
+
+    assert sum(stacks.values()) > 0
+    assert any(stack.split(";")[-1].startswith("spin ") for stack in stacks)
+
+
+def test_profile_store_is_a_ring_buffer(tmp_path):
+    """
+    Перевіряє, що зберігаються лише останні ``max_files`` профілів.
+    """
+    store = ProfileStore(tmp_path, max_files=2)
+    names = []
+    for i in range(3):
+        name = store.new_name()
+        store.save(name, Counter({"main;handler": i + 1}), {"path": f"/{i}"})
+        names.append(name)
+
+    assert [entry["name"] for entry in store.list()] == names[:0:-1]
+    assert store.path(names[0]) is None
+    assert store.path(names[2]).read_text() == "main;handler 3\n"
+    assert store.path("../config.collapsed") is None
+
+
+@pytest.mark.asyncio
+async def test_middleware_profiles_only_triggered_requests(tmp_path):
+    """
+    Перевіряє, що профілюються лише запити з дійсним токеном.
+    """
+    store = ProfileStore(tmp_path, max_files=10)
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        spin(0.02)
+        return {}
+
+    app.add_middleware(ProfilingMiddleware, store=store, interval_ms=1)
+    token, _ = create_profile_token("admin@example.com")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        plain = await c.get("/slow")
+        forged = await c.get("/slow", headers={"X-Profile": "forged"})
+        profiled = await c.get("/slow", headers={"X-Profile": token})
+
+    assert "x-profile-id" not in plain.headers
+    assert "x-profile-id" not in forged.headers
+    [entry] = store.list()
+    assert entry["name"] == profiled.headers["x-profile-id"]
+    assert entry["trigger"] == "header"
+    assert entry["route"] == "/slow"
+    assert entry["samples"] > 0
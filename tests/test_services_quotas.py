@@ -0,0 +1,110 @@
+import msgpack
+import pytest
+from fastapi import Depends, FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from src.database.models import User
+from src.services.auth import get_current_user
+from src.services.quotas import QuotaManager, QuotaUsage
+from src.services.redis_cache import redis_cache
+from src.services.serialization import MSGPACK_MEDIA_TYPE, negotiate
+
+
+@pytest.fixture
+def client(fake_redis):
+    quotas = QuotaManager(budget=100, window=60, buckets=6)
+    app = FastAPI()
+    current = {"user": User(id=1)}
+    app.dependency_overrides[get_current_user] = lambda: current["user"]
+    rows = TypeAdapter(list[int])
+
+    @app.get("/search")
+    async def search(
+        request: Request,
+        response: Response,
+        found: int = 0,
+        quota: QuotaUsage = Depends(quotas.charge(30)),
+    ):
+        await quota.add(found // 10)
+        return negotiate(request, response, rows, list(range(found)))
+
+    client = TestClient(app)
+    client.current = current
+    return client
+
+
+def test_costs_are_charged_and_reported(client):
+    """
+    Перевіряє списання базової та динамічної вартості й заголовки квоти.
+    """
+    response = client.get("/search", params={"found": 100})
+    assert response.status_code == 200
+    assert response.headers["X-Quota-Limit"] == "100"
+    assert response.headers["X-Quota-Cost"] == "40"
+    assert response.headers["X-Quota-Remaining"] == "60"
+    assert 50 < int(response.headers["X-Quota-Reset"]) <= 60
+
+    response = client.get("/search", headers={"Accept": MSGPACK_MEDIA_TYPE})
+    assert msgpack.unpackb(response.content) == []
+    assert response.headers["X-Quota-Remaining"] == "30"
+
+
+def test_exhausted_budget_is_rejected_per_user(client):
+    """
+    Перевіряє відмову 429 після вичерпання бюджету та окремі бюджети
+    користувачів.
+    """
+    assert client.get("/search", params={"found": 400}).status_code == 200
+    assert client.get("/search").status_code == 200
+
+    response = client.get("/search")
+    assert response.status_code == 429
+    assert response.headers["X-Quota-Remaining"] == "0"
+    assert int(response.headers["Retry-After"]) >= 1
+
+    client.current["user"] = User(id=2)
+    assert client.get("/search").status_code == 200
+
+
+def test_disabled_without_redis(client, monkeypatch):
+    """
+    Перевіряє, що без Redis квоти не застосовуються.
+    """
+    monkeypatch.setattr(redis_cache, "redis", None)
+    for _ in range(5):
+        response = client.get("/search")
+        assert response.status_code == 200
+        assert "X-Quota-Limit" not in response.headers
+
+
+class StubSession:
+    async def execute(self, statement):
+        return self
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+def test_all_contacts_route_is_charged(fake_redis):
+    """
+    Перевіряє, що ``/contacts/all`` не перехоплюється маршрутом
+    ``/contacts/{contact_id}`` і списує свою вартість.
+    """
+    from src.api import contacts
+    from src.database.db import get_db
+    from src.services.permissions import is_admin
+
+    app = FastAPI()
+    app.include_router(contacts.router, prefix="/api")
+    app.dependency_overrides[get_db] = StubSession
+    app.dependency_overrides[get_current_user] = lambda: User(id=1)
+    app.dependency_overrides[is_admin] = lambda: User(id=1)
+
+    response = TestClient(app).get("/api/contacts/all")
+    assert response.status_code == 200
+    assert response.json() == []
+    assert response.headers["X-Quota-Cost"] == "50"
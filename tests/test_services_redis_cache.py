@@ -0,0 +1,234 @@
+import asyncio
+import time
+from datetime import datetime
+
+import fakeredis
+import msgpack
+import pytest
+from pydantic import BaseModel
+
+from src.conf.config import settings
+from src.database.models import User
+from src.schemas.users import UserRead
+from src.services.cache_codec import CacheCodec, StaleEntry, codec
+from src.services.local_cache import LocalCache
+from src.services.redis_cache import RedisCache
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+@pytest.fixture
+def cache():
+    cache = RedisCache()
+    cache.redis = fakeredis.FakeAsyncRedis()
+    return cache
+
+
+def test_codec_round_trips_models_and_plain_values():
+    """
+    Перевіряє, що з кешу повертається той самий тип, що й був записаний.
+    """
+    local = CacheCodec()
+    local.register(Item)
+    assert local.loads(local.dumps(Item(id=1, name="a"))) == Item(id=1, name="a")
+    assert local.loads(local.dumps({"a": [1, 2]})) == {"a": [1, 2]}
+
+
+def test_codec_rejects_stale_versions():
+    """
+    Перевіряє, що записи старої версії схеми вважаються промахом.
+    """
+    old, new = CacheCodec(), CacheCodec()
+    old.register(Item, version=1)
+    new.register(Item, version=2)
+    with pytest.raises(StaleEntry):
+        new.loads(old.dumps(Item(id=1, name="a")))
+    with pytest.raises(StaleEntry):
+        new.loads(b'{"id": 1}')
+    with pytest.raises(StaleEntry):
+        new.loads(msgpack.packb(["Unknown", 1, {}]))
+
+
+@pytest.mark.asyncio
+async def test_set_orm_object_with_schema(cache):
+    """
+    Перевіряє кешування ORM-об'єкта через зареєстровану схему.
+    """
+    codec.register(UserRead, version=1)
+    user = User(
+        id=7,
+        username="ada",
+        email="ada@example.com",
+        hashed_password="secret",
+        created_at=datetime(2025, 1, 1, 12, 0),
+    )
+    await cache.set("user:7", user, schema=UserRead)
+    cached = await cache.get("user:7")
+    assert isinstance(cached, UserRead)
+    assert cached.model_dump() == UserRead.model_validate(user).model_dump()
+    assert b"secret" not in await cache.redis.get("user:7")
+    assert codec.dumps(cached) == await cache.redis.get("user:7")
+
+
+@pytest.mark.asyncio
+async def test_get_many_and_set_many(cache):
+    """
+    Перевіряє пакетні операції та пропуск відсутніх ключів.
+    """
+    await cache.set_many({"a": 1, "b": {"x": "y"}}, expire=60)
+    assert await cache.get_many(["a", "b", "missing"]) == {"a": 1, "b": {"x": "y"}}
+    assert 0 < await cache.redis.ttl("a") <= 60
+
+    await cache.delete("a", "b")
+    assert await cache.get_many(["a", "b"]) == {}
+    assert await cache.get_many([]) == {}
+
+
+async def wait_for(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+async def workers():
+    server = fakeredis.FakeServer()
+    caches = []
+    for _ in range(2):
+        cache = RedisCache(local=LocalCache(max_entries=100, ttl=60))
+        cache.redis = fakeredis.FakeAsyncRedis(server=server)
+        cache.start_listener()
+        caches.append(cache)
+    # Кожен слухач очищає свій кеш після підписки.
+    await wait_for(lambda: all(c._invalidations for c in caches))
+    yield caches
+    for cache in caches:
+        await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_local_tier_serves_hot_keys(workers):
+    """
+    Перевіряє, що повторне читання обслуговує локальний рівень.
+    """
+    first, _ = workers
+    await first.set("user:1", {"id": 1})
+    assert await first.get("user:1") == {"id": 1}
+    await first.redis.delete("user:1")
+    assert await first.get("user:1") == {"id": 1}
+
+    stats = first.tier_stats()
+    assert stats["local"]["hits"] == 2
+    assert stats["local"]["hit_ratio"] == 1.0
+    assert stats["redis"]["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_other_workers(workers):
+    """
+    Перевіряє, що запис в одному воркері прибирає ключ із локального
+    кешу іншого.
+    """
+    first, second = workers
+    await first.set("user:1", {"v": 1})
+    assert await second.get("user:1") == {"v": 1}
+    assert second.local.get("user:1") is not None
+
+    await first.set("user:1", {"v": 2})
+    await wait_for(lambda: second.local.get("user:1") is None)
+    assert await second.get("user:1") == {"v": 2}
+
+    await first.delete("user:1")
+    await wait_for(lambda: second.local.get("user:1") is None)
+    assert await second.get("user:1") is None
+    assert await second.get_many(["user:1"]) == {}
+
+
+class SlowCompute:
+    def __init__(self, value, delay=0.05):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_single_flight(cache):
+    """
+    Перевіряє, що одночасні промахи в одному воркері обчислюють значення один раз.
+    """
+    compute = SlowCompute({"id": 1})
+    results = await asyncio.gather(
+        *(cache.get_or_compute("user:1", compute, expire=60) for _ in range(20))
+    )
+    assert results == [{"id": 1}] * 20
+    assert compute.calls == 1
+    assert await cache.redis.get("lock:user:1") is None
+    assert await cache.get("user:1") == {"id": 1}
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_locks_across_workers():
+    """
+    Перевіряє, що інший воркер чекає на значення замість повторного обчислення.
+    """
+    server = fakeredis.FakeServer()
+    workers = [RedisCache(), RedisCache()]
+    for worker in workers:
+        worker.redis = fakeredis.FakeAsyncRedis(server=server)
+    compute = SlowCompute({"id": 1})
+    results = await asyncio.gather(
+        *(worker.get_or_compute("user:1", compute, expire=60) for worker in workers)
+    )
+    assert results == [{"id": 1}] * 2
+    assert compute.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_refreshing(cache):
+    """
+    Перевіряє stale-while-revalidate: старе значення віддається одразу,
+    а нове обчислюється у фоні.
+    """
+    stale = codec.dumps({"v": 1}, fresh_until=time.time() - 1, delta=0.01)
+    await cache.redis.set("user:1", stale)
+    compute = SlowCompute({"v": 2})
+
+    assert await cache.get_or_compute("user:1", compute, expire=60) == {"v": 1}
+    assert await cache.get("user:1") is None
+    await cache._inflight["user:1"]
+    assert compute.calls == 1
+    assert await cache.get_or_compute("user:1", compute, expire=60) == {"v": 2}
+    assert 60 < await cache.redis.ttl("user:1") <= 60 + settings.CACHE_STALE_TTL
+
+
+@pytest.mark.asyncio
+async def test_early_expiry_depends_on_beta(cache):
+    """
+    Перевіряє ймовірнісне дострокове оновлення свіжого значення.
+    """
+    fresh = codec.dumps({"v": 1}, fresh_until=time.time() + 5, delta=1.0)
+    await cache.redis.set("user:1", fresh)
+    compute = SlowCompute({"v": 2}, delay=0)
+
+    assert await cache.get_or_compute("user:1", compute, beta=0) == {"v": 1}
+    assert "user:1" not in cache._inflight
+    assert await cache.get_or_compute("user:1", compute, beta=1000) == {"v": 1}
+    await cache._inflight["user:1"]
+    assert compute.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_does_not_cache_none(cache):
+    compute = SlowCompute(None, delay=0)
+    assert await cache.get_or_compute("user:404", compute) is None
+    assert await cache.get_or_compute("user:404", compute) is None
+    assert compute.calls == 2
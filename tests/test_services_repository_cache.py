@@ -0,0 +1,148 @@
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.database.models import Base, Contact, User, UserRole
+from src.repository.contacts import ContactRepository
+from src.repository.users import UserRepository
+from src.schemas.contacts import ContactBase
+from src.services.instrumentation import install_query_listeners, track_queries
+from src.services.redis_cache import redis_cache
+from src.services.repository_cache import uncached
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    install_query_listeners(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as session:
+        user = User(
+            username="owner",
+            email="owner@example.com",
+            hashed_password="hashed",
+            role=UserRole.ADMIN,
+        )
+        session.add(user)
+        await session.flush()
+        session.add(
+            Contact(
+                first_name="Ada",
+                last_name="Lovelace",
+                email="ada@example.com",
+                phone_number="1234567",
+                birthday=date(1815, 12, 10),
+                additional_data="",
+                user_id=user.id,
+            )
+        )
+        await session.commit()
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_cached_read_skips_database(fake_redis, engine):
+    """
+    Перевіряє, що повторне читання не виконує SQL і повертає ORM-об'єкт сесії.
+    """
+    async with AsyncSession(engine) as session:
+        first = await UserRepository(session).get_user_by_username("owner")
+    assert await fake_redis.exists("user:username:owner")
+    assert await fake_redis.sismember(f"tag:user:{first.id}", "user:username:owner")
+    assert b"hashed" not in await fake_redis.get("user:username:owner")
+
+    async with AsyncSession(engine) as session:
+        with track_queries() as metrics:
+            user = await UserRepository(session).get_user_by_username("owner")
+        assert metrics.queries == 0
+        assert user in session
+        assert (user.id, user.role) == (first.id, UserRole.ADMIN)
+        assert user.created_at == first.created_at
+        with uncached():
+            user = await UserRepository(session).get_user_by_username("owner")
+        assert user.hashed_password == "hashed"
+
+        contacts = ContactRepository(session)
+        listed = await contacts.get_contacts(0, 10, user)
+        with track_queries() as metrics:
+            again = await contacts.get_contacts(0, 10, user)
+        assert metrics.queries == 0
+        assert [c.birthday for c in again] == [c.birthday for c in listed]
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_tags(fake_redis, engine):
+    """
+    Перевіряє, що методи запису видаляють усі записи своїх тегів.
+    """
+    async with AsyncSession(engine) as session:
+        users = UserRepository(session)
+        user = await users.get_user_by_id(1)
+        await users.get_user_by_username("owner")
+        contacts = ContactRepository(session)
+        contact = (await contacts.get_contacts(0, 10, user))[0]
+        await contacts.get_contact_by_id(contact.id, user)
+
+        await contacts.update_contact(contact.id, {"first_name": "Augusta"}, user)
+        assert not await fake_redis.exists(
+            "contacts:1:list:0:10", f"contact:1:{contact.id}", "tag:contacts:1"
+        )
+        assert await fake_redis.exists("user:1")
+
+        await users.update_user(1, {"username": "renamed", "role": "user"})
+        assert not await fake_redis.exists("user:1", "user:username:owner")
+
+        await users.get_user_by_id(1)
+        await users.update_user_role("owner@example.com", UserRole.USER)
+        assert not await fake_redis.exists("user:1")
+        assert (await users.get_user_by_id(1)).role == UserRole.USER
+
+    async with AsyncSession(engine) as session:
+        user = await UserRepository(session).get_user_by_id(1)
+        assert (user.username, user.role) == ("renamed", UserRole.USER)
+        listed = await ContactRepository(session).get_contacts(0, 10, user)
+        assert listed[0].first_name == "Augusta"
+
+
+@pytest.mark.asyncio
+async def test_bypass(fake_redis, engine):
+    """
+    Перевіряє, що всередині ``uncached`` і без Redis кеш не використовується.
+    """
+    async with AsyncSession(engine) as session:
+        with uncached():
+            await UserRepository(session).get_user_by_id(1)
+        assert not await fake_redis.exists("user:1")
+
+        await ContactRepository(session).create_contact(
+            ContactBase(
+                first_name="Alan",
+                last_name="Turing",
+                email="alan@example.com",
+                phone_number="7654321",
+                birthday=date(1912, 6, 23),
+                additional_data="",
+            ),
+            await session.get(User, 1),
+            [],
+        )
+    redis_cache.redis = None
+    async with AsyncSession(engine) as session:
+        assert await UserRepository(session).get_user_by_id(1) is not None
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_database(broken_redis, engine):
+    """
+    Перевіряє, що збій Redis не ламає читання й запис репозиторіїв.
+    """
+    async with AsyncSession(engine) as session:
+        users = UserRepository(session)
+        assert (await users.get_user_by_username("owner")).id == 1
+        user = await users.update_user(1, {"username": "renamed"})
+        assert user.username == "renamed"
+        assert (await users.get_user_by_id(1)).username == "renamed"
@@ -0,0 +1,80 @@
+from datetime import date, datetime
+
+import msgpack
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+
+from src.api import contacts
+from src.database.db import get_db
+from src.database.models import Contact, User
+from src.services.auth import get_current_user
+from src.services.serialization import MSGPACK_MEDIA_TYPE, wants_msgpack
+
+
+class StubContactService:
+    def __init__(self, db):
+        pass
+
+    async def get_contacts(self, skip, limit, user):
+        return [
+            Contact(
+                id=1,
+                first_name="Ada",
+                last_name="Lovelace",
+                email="ada@example.com",
+                phone_number="+380501234567",
+                birthday=date(1990, 12, 10),
+                additional_data=None,
+                created_at=datetime(2025, 1, 1, 12, 0),
+                updated_at=None,
+                user_id=1,
+            )
+        ]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(contacts, "ContactService", StubContactService)
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.include_router(contacts.router, prefix="/api")
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_current_user] = lambda: User(id=1)
+    return TestClient(app)
+
+
+def test_json_is_default(client):
+    """
+    Перевіряє, що без заголовка ``Accept`` список повертається як JSON.
+    """
+    response = client.get("/api/contacts/")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["vary"] == "Accept"
+    assert response.json()[0]["birthday"] == "1990-12-10"
+
+
+def test_msgpack_is_negotiated(client):
+    """
+    Перевіряє, що MessagePack містить ті самі дані, що й JSON.
+    """
+    json_body = client.get("/api/contacts/").json()
+    response = client.get("/api/contacts/", headers={"Accept": MSGPACK_MEDIA_TYPE})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    assert response.headers["vary"] == "Accept"
+    assert msgpack.unpackb(response.content) == json_body
+
+
+def test_wants_msgpack():
+    """
+    Перевіряє розбір заголовка ``Accept``.
+    """
+
+    class Request:
+        def __init__(self, accept):
+            self.headers = {"accept": accept}
+
+    assert wants_msgpack(Request("application/x-msgpack, */*;q=0.1"))
+    assert not wants_msgpack(Request("application/json"))
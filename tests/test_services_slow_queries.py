@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.services.slow_queries import SlowQueryLog, redact_parameters, track_repository
+
+
+@track_repository
+class NotesRepository:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def find_by_title(self, title: str):
+        result = await self.conn.execute(
+            text("SELECT 1 WHERE :title IS NOT NULL"), {"title": title}
+        )
+        return result.scalar()
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    yield engine
+    await engine.dispose()
+
+
+def test_redact_parameters():
+    """
+    Перевіряє, що рядкові параметри маскуються, а числові залишаються.
+    """
+    assert redact_parameters(("secret@example.com", 5, None)) == ["<str>", 5, None]
+    assert redact_parameters({"email": "a@b.c", "limit": 10}) == {
+        "email": "<str>",
+        "limit": 10,
+    }
+
+
+@pytest.mark.asyncio
+async def test_slow_query_logged_with_repository_method_and_plan(engine):
+    """
+    Перевіряє запис повільного запиту з методом репозиторію та планом EXPLAIN.
+    """
+    log = SlowQueryLog(threshold_ms=0, sample_rate=1, max_per_second=100, size=10)
+    log.install(engine)
+    log.start(engine)
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 2"))
+        assert await NotesRepository(conn).find_by_title("private title") == 1
+    await log.join()
+    await log.stop()
+
+    [entry] = log.recent()
+    assert entry["repository_method"] == "NotesRepository.find_by_title"
+    assert entry["parameters"] == ["<str>"]
+    assert "private title" not in str(entry)
+    assert entry["plan"]
+
+
+@pytest.mark.asyncio
+async def test_slow_query_log_is_rate_limited(engine):
+    """
+    Перевіряє, що кількість записів журналу обмежена за частотою.
+    """
+    log = SlowQueryLog(threshold_ms=0, sample_rate=1, max_per_second=1, size=10)
+    log.install(engine)
+
+    async with engine.connect() as conn:
+        repository = NotesRepository(conn)
+        for _ in range(5):
+            await repository.find_by_title("title")
+
+    assert len(log.recent()) == 1
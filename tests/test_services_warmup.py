@@ -0,0 +1,84 @@
+import fakeredis
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.api import utils
+from src.database.models import Base
+from src.services.instrumentation import install_query_listeners, track_queries
+from src.services.warmup import Readiness, readiness
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'warmup.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_fills_pool_and_primes_statements(engine):
+    """
+    Перевіряє, що прогрів відкриває з'єднання, виконує основні запити
+    та перевіряє Redis.
+    """
+    install_query_listeners(engine)
+    redis = fakeredis.FakeAsyncRedis()
+    state = Readiness(db_connections=3, redis_connections=2)
+
+    with track_queries() as metrics:
+        assert await state.warm_up(engine, redis) is True
+
+    assert state.ready
+    assert state.details["db_connections"] == 3
+    assert engine.pool.checkedin() == 3
+    assert metrics.queries >= 3 * 6
+    await redis.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_retries_in_background(engine):
+    """
+    Перевіряє, що інстанс не готовий, поки Redis недоступний,
+    і стає готовим після успішної повторної спроби.
+    """
+    server = fakeredis.FakeServer()
+    server.connected = False
+    redis = fakeredis.FakeAsyncRedis(server=server)
+    state = Readiness(db_connections=1, redis_connections=1, retry_interval=0.01)
+
+    assert await state.warm_up(engine, redis) is False
+    assert not state.ready
+    assert "error" in state.details
+
+    server.connected = True
+    await state._retry
+    assert state.ready
+    await state.stop()
+    await redis.aclose()
+
+
+def test_readiness_endpoint():
+    """
+    Перевіряє, що ендпоінт готовності відповідає 503 до завершення прогріву.
+    """
+    app = FastAPI()
+    app.include_router(utils.router, prefix="/api")
+    client = TestClient(app)
+
+    readiness.ready = False
+    assert client.get("/api/readiness").status_code == 503
+    readiness.ready = True
+    try:
+        response = client.get("/api/readiness")
+    finally:
+        readiness.ready = False
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
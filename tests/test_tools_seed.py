@@ -0,0 +1,70 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.database.models import Base, Contact, User
+from src.schemas.contacts import ContactBase
+from src.tools.seed import DatasetFactory, parse_args, seed_database
+
+
+def test_dataset_factory_is_deterministic():
+    """
+    Перевіряє, що однакове зерно дає однаковий набір даних.
+    """
+    today = date(2025, 1, 15)
+    first = DatasetFactory(seed=7, today=today)
+    second = DatasetFactory(seed=7, today=today)
+
+    counts = first.contact_counts(20, 1000)
+    assert counts == second.contact_counts(20, 1000)
+    assert list(first.contacts(counts)) == list(second.contacts(counts))
+
+
+def test_contacts_require_users(capsys):
+    """
+    Перевіряє зрозумілу помилку, коли контакти нема кому призначити.
+    """
+    with pytest.raises(ValueError, match="користувача"):
+        DatasetFactory(seed=0).contact_counts(0, 10)
+    assert DatasetFactory(seed=0).contact_counts(0, 0) == []
+
+    with pytest.raises(SystemExit):
+        parse_args(["--users", "0", "--contacts", "10"])
+    assert "--users >= 1" in capsys.readouterr().err
+
+
+def test_generated_contacts_are_valid_and_skewed():
+    """
+    Перевіряє валідність контактів та довгий хвіст їх розподілу.
+    """
+    today = date(2025, 1, 15)
+    factory = DatasetFactory(seed=1, today=today)
+
+    counts = factory.contact_counts(100, 10_000)
+    assert sum(counts) == 10_000
+    assert max(counts) > 5 * (10_000 / 100)
+
+    for _ in range(200):
+        contact = ContactBase(**factory.contact_payload())
+        assert contact.birthday <= today
+
+
+@pytest.mark.asyncio
+async def test_seed_database_inserts_rows():
+    """
+    Перевіряє запис користувачів і контактів у базу даних.
+    """
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    users = await seed_database(engine, users=5, contacts=300, batch_size=64)
+
+    async with engine.connect() as conn:
+        assert await conn.scalar(select(func.count(User.id))) == 5
+        assert await conn.scalar(select(func.count(Contact.id))) == 300
+    assert sum(user["contacts"] for user in users) == 300
+    await engine.dispose()